@@ -0,0 +1,28 @@
+"""add expense import hash
+
+Revision ID: 0c6e2b8d4a17
+Revises: f3a9c1d27e85
+Create Date: 2026-10-18 19:12:07.502214
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0c6e2b8d4a17'
+down_revision: Union[str, None] = 'f3a9c1d27e85'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('expenses', sa.Column('import_hash', sa.String(length=32), nullable=True))
+    op.create_index('ix_expenses_import_hash', 'expenses', ['import_hash'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_expenses_import_hash', table_name='expenses')
+    op.drop_column('expenses', 'import_hash')
@@ -0,0 +1,56 @@
+"""add expense full-text search index
+
+Revision ID: 422676caabab
+Revises: 4d996dddb0bf
+Create Date: 2026-10-18 11:20:05.774310
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '422676caabab'
+down_revision: Union[str, None] = '4d996dddb0bf'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE VIRTUAL TABLE expenses_fts USING fts5(
+            description, notes,
+            content='expenses', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+        )
+    """)
+    op.execute("""
+        CREATE TRIGGER expenses_fts_ai AFTER INSERT ON expenses BEGIN
+            INSERT INTO expenses_fts(rowid, description, notes)
+            VALUES (new.id, new.description, new.notes);
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER expenses_fts_ad AFTER DELETE ON expenses BEGIN
+            INSERT INTO expenses_fts(expenses_fts, rowid, description, notes)
+            VALUES ('delete', old.id, old.description, old.notes);
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER expenses_fts_au AFTER UPDATE OF description, notes ON expenses BEGIN
+            INSERT INTO expenses_fts(expenses_fts, rowid, description, notes)
+            VALUES ('delete', old.id, old.description, old.notes);
+            INSERT INTO expenses_fts(rowid, description, notes)
+            VALUES (new.id, new.description, new.notes);
+        END
+    """)
+    # Index the rows that already exist
+    op.execute("INSERT INTO expenses_fts(expenses_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS expenses_fts_au")
+    op.execute("DROP TRIGGER IF EXISTS expenses_fts_ad")
+    op.execute("DROP TRIGGER IF EXISTS expenses_fts_ai")
+    op.execute("DROP TABLE IF EXISTS expenses_fts")
@@ -0,0 +1,27 @@
+"""add keyset pagination indexes
+
+Revision ID: 4d996dddb0bf
+Revises: 57f7211b2578
+Create Date: 2026-10-18 10:03:47.518664
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4d996dddb0bf'
+down_revision: Union[str, None] = '57f7211b2578'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_expenses_date_id', 'expenses', ['date', 'id'])
+    op.create_index('ix_incomes_created_at_id', 'incomes', ['created_at', 'id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_incomes_created_at_id', table_name='incomes')
+    op.drop_index('ix_expenses_date_id', table_name='expenses')
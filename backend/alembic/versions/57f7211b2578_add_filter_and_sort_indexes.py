@@ -0,0 +1,37 @@
+"""add filter and sort indexes
+
+Revision ID: 57f7211b2578
+Revises: d55400ace6d4
+Create Date: 2026-10-18 09:12:31.402117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '57f7211b2578'
+down_revision: Union[str, None] = 'd55400ace6d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_expenses_date_created_at', 'expenses', ['date', 'created_at'])
+    op.create_index('ix_expenses_category_id_date', 'expenses', ['category_id', 'date'])
+    op.create_index('ix_expenses_is_paid_date', 'expenses', ['is_paid', 'date'])
+    op.create_index('ix_expenses_is_recurring_date', 'expenses', ['is_recurring', 'date'])
+    op.create_index('ix_expenses_amount', 'expenses', ['amount'])
+    op.create_index('ix_assets_portfolio_id', 'assets', ['portfolio_id'])
+    op.create_index('ix_incomes_is_active', 'incomes', ['is_active'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_incomes_is_active', table_name='incomes')
+    op.drop_index('ix_assets_portfolio_id', table_name='assets')
+    op.drop_index('ix_expenses_amount', table_name='expenses')
+    op.drop_index('ix_expenses_is_recurring_date', table_name='expenses')
+    op.drop_index('ix_expenses_is_paid_date', table_name='expenses')
+    op.drop_index('ix_expenses_category_id_date', table_name='expenses')
+    op.drop_index('ix_expenses_date_created_at', table_name='expenses')
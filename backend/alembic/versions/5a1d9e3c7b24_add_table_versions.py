@@ -0,0 +1,30 @@
+"""add table versions
+
+Revision ID: 5a1d9e3c7b24
+Revises: 0c6e2b8d4a17
+Create Date: 2026-10-19 10:04:51.318262
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5a1d9e3c7b24'
+down_revision: Union[str, None] = '0c6e2b8d4a17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('table_versions',
+    sa.Column('table_name', sa.String(length=64), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('table_name')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('table_versions')
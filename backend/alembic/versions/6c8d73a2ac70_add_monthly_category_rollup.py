@@ -0,0 +1,46 @@
+"""add monthly category rollup
+
+Revision ID: 6c8d73a2ac70
+Revises: 422676caabab
+Create Date: 2026-10-18 12:41:19.086532
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6c8d73a2ac70'
+down_revision: Union[str, None] = '422676caabab'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('monthly_category_rollup',
+    sa.Column('year_month', sa.String(length=7), nullable=False),
+    sa.Column('category_id', sa.Integer(), nullable=False),
+    sa.Column('total', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.Column('paid_total', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('paid_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['category_id'], ['categories.id'], ),
+    sa.PrimaryKeyConstraint('year_month', 'category_id')
+    )
+    # Backfill from existing expenses
+    op.execute("""
+        INSERT INTO monthly_category_rollup
+            (year_month, category_id, total, count, paid_total, paid_count)
+        SELECT strftime('%Y-%m', date), category_id,
+               ROUND(SUM(amount), 2), COUNT(id),
+               ROUND(SUM(CASE WHEN is_paid THEN amount ELSE 0 END), 2),
+               SUM(CASE WHEN is_paid THEN 1 ELSE 0 END)
+        FROM expenses
+        GROUP BY strftime('%Y-%m', date), category_id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('monthly_category_rollup')
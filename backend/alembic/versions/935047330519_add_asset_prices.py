@@ -0,0 +1,43 @@
+"""add asset prices
+
+Revision ID: 935047330519
+Revises: 6c8d73a2ac70
+Create Date: 2026-10-18 15:02:47.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '935047330519'
+down_revision: Union[str, None] = '6c8d73a2ac70'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('asset_prices',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('symbol', sa.String(length=20), nullable=False),
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('price', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_asset_prices_symbol_date', 'asset_prices', ['symbol', 'date'], unique=True)
+    # Seed the history with the prices already on record
+    op.execute("""
+        INSERT INTO asset_prices (symbol, date, price, created_at)
+        SELECT symbol, date(MAX(updated_at)), current_price, CURRENT_TIMESTAMP
+        FROM assets
+        WHERE current_price IS NOT NULL
+        GROUP BY symbol
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_asset_prices_symbol_date', table_name='asset_prices')
+    op.drop_table('asset_prices')
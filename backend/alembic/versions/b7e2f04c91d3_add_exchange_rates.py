@@ -0,0 +1,32 @@
+"""add exchange rates
+
+Revision ID: b7e2f04c91d3
+Revises: 935047330519
+Create Date: 2026-10-18 16:20:11.540873
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e2f04c91d3'
+down_revision: Union[str, None] = '935047330519'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('exchange_rates',
+    sa.Column('base', sa.String(length=3), nullable=False),
+    sa.Column('currency', sa.String(length=3), nullable=False),
+    sa.Column('rate', sa.Numeric(precision=18, scale=8), nullable=False),
+    sa.Column('fetched_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('base', 'currency')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('exchange_rates')
@@ -0,0 +1,84 @@
+"""add expense recurrence fields
+
+Revision ID: f3a9c1d27e85
+Revises: b7e2f04c91d3
+Create Date: 2026-10-18 18:05:42.118305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a9c1d27e85'
+down_revision: Union[str, None] = 'b7e2f04c91d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Until now a recurring bill was entered again by hand for each period.
+# Entries with the same description, category and rule that fall on the
+# same day of the period (the "phase") are linked, as occurrences, to the
+# latest of them, which carries the series on. A group with two entries on
+# one date holds distinct bills rather than one series and is left alone.
+LINK_HAND_ENTERED_SERIES = """
+    WITH entries AS (
+        SELECT id, date, description, category_id, recurrence_rule,
+               CASE recurrence_rule
+                   WHEN 'daily' THEN ''
+                   WHEN 'weekly' THEN CAST(julianday(date) AS INTEGER) % 7
+                   WHEN 'biweekly' THEN CAST(julianday(date) AS INTEGER) % 14
+                   WHEN 'monthly' THEN strftime('%d', date)
+                   WHEN 'quarterly' THEN CAST(strftime('%m', date) AS INTEGER) % 3
+                                         || strftime('-%d', date)
+                   ELSE strftime('%m-%d', date)
+               END AS phase
+        FROM expenses
+        WHERE is_recurring AND recurrence_parent_id IS NULL
+          AND recurrence_rule IN ('daily', 'weekly', 'biweekly', 'monthly', 'quarterly', 'yearly')
+    ),
+    ranked AS (
+        SELECT id,
+               FIRST_VALUE(id) OVER (
+                   PARTITION BY description, category_id, recurrence_rule, phase
+                   ORDER BY date DESC, id DESC
+               ) AS root_id,
+               COUNT(*) OVER (
+                   PARTITION BY description, category_id, recurrence_rule, phase, date
+               ) AS same_date
+        FROM entries
+    ),
+    series AS (
+        SELECT id, root_id, MAX(same_date) OVER (PARTITION BY root_id) AS clash
+        FROM ranked
+    )
+    UPDATE expenses
+    SET recurrence_parent_id = (SELECT root_id FROM series WHERE series.id = expenses.id)
+    WHERE id IN (SELECT id FROM series WHERE id != root_id AND clash = 1)
+"""
+
+
+def upgrade() -> None:
+    # Plain ADD COLUMN without the foreign key: SQLite cannot add constraints
+    # in place, and a batch table rebuild would drop the FTS triggers
+    op.add_column('expenses', sa.Column('recurrence_parent_id', sa.Integer(), nullable=True))
+    op.add_column('expenses', sa.Column('materialized_until', sa.Date(), nullable=True))
+    op.create_index(
+        'ix_expenses_recurrence_parent_id_date', 'expenses', ['recurrence_parent_id', 'date'],
+        unique=True,
+    )
+    op.execute(LINK_HAND_ENTERED_SERIES)
+    # Their past periods are all there: generate only from today on, as for
+    # a series created now
+    op.execute(
+        "UPDATE expenses SET materialized_until = MAX(date, DATE('now', 'localtime')) "
+        "WHERE is_recurring AND recurrence_rule IS NOT NULL AND recurrence_parent_id IS NULL"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_expenses_recurrence_parent_id_date', table_name='expenses')
+    op.drop_column('expenses', 'materialized_until')
+    op.drop_column('expenses', 'recurrence_parent_id')
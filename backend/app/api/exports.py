@@ -0,0 +1,93 @@
+"""HTTP endpoints for downloading all expenses or incomes.
+
+The GraphQL lists are paginated for display; these stream a whole result
+set as a file download in CSV, NDJSON or Parquet (see ``ExportService``).
+"""
+
+from collections.abc import Iterator
+from datetime import date
+from decimal import Decimal
+from enum import Enum
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+
+from app.database import SessionLocal
+from app.services.export_service import ExportService, parquet_available
+
+router = APIRouter(prefix="/exports", tags=["exports"])
+
+
+class ExportFormat(str, Enum):
+    csv = "csv"
+    ndjson = "ndjson"
+    parquet = "parquet"
+
+
+_MEDIA_TYPES = {
+    ExportFormat.csv: "text/csv; charset=utf-8",
+    ExportFormat.ndjson: "application/x-ndjson",
+    ExportFormat.parquet: "application/vnd.apache.parquet",
+}
+
+
+@router.get("/expenses")
+def export_expenses(
+    format: ExportFormat = ExportFormat.csv,
+    category_id: int | None = None,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    min_amount: Decimal | None = None,
+    max_amount: Decimal | None = None,
+    is_recurring: bool | None = None,
+    is_paid: bool | None = None,
+    search: str | None = None,
+    include_upcoming: bool = False,
+) -> StreamingResponse:
+    """Download the expenses matching the same filters as the ``expenses`` query.
+
+    As there, occurrences of recurring expenses generated ahead of their
+    date are left out unless ``include_upcoming`` is set.
+    """
+    filters = {
+        "category_id": category_id,
+        "start_date": start_date,
+        "end_date": end_date,
+        "min_amount": min_amount,
+        "max_amount": max_amount,
+        "is_recurring": is_recurring,
+        "is_paid": is_paid,
+        "search": search,
+        "occurrences_until": None if include_upcoming else date.today(),
+    }
+    return _download(
+        "expenses", format, lambda service: service.export_expenses(format.value, **filters)
+    )
+
+
+@router.get("/incomes")
+def export_incomes(
+    format: ExportFormat = ExportFormat.csv, is_active: bool | None = None
+) -> StreamingResponse:
+    """Download the income streams, optionally only active or inactive ones."""
+    return _download(
+        "incomes",
+        format,
+        lambda service: service.export_incomes(format.value, is_active=is_active),
+    )
+
+
+def _download(name: str, format: ExportFormat, export) -> StreamingResponse:
+    if format is ExportFormat.parquet and not parquet_available():
+        raise HTTPException(status_code=400, detail="Parquet export needs pyarrow installed")
+    return StreamingResponse(
+        _stream(export),
+        media_type=_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{format.value}"'},
+    )
+
+
+def _stream(export) -> Iterator[str | bytes]:
+    # The session lives as long as the response body is being sent
+    with SessionLocal() as db:
+        yield from export(ExportService(db))
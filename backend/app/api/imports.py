@@ -0,0 +1,68 @@
+"""HTTP endpoint for importing expenses from bank exports.
+
+Uploading a file is a plain multipart POST rather than a GraphQL mutation.
+The response is a stream of newline-delimited JSON: one progress report
+per chunk written (see ``ImportService.import_expenses``), then a summary.
+"""
+
+import io
+import json
+from collections.abc import Iterator
+from enum import Enum
+from pathlib import PurePath
+
+from fastapi import APIRouter, HTTPException, UploadFile
+from fastapi.responses import StreamingResponse
+
+from app.database import SessionLocal
+from app.models.category import Category
+from app.services.import_service import ImportService, parse_csv, parse_ofx
+
+router = APIRouter(prefix="/imports", tags=["imports"])
+
+
+class ImportFormat(str, Enum):
+    csv = "csv"
+    ofx = "ofx"
+
+
+_PARSERS = {ImportFormat.csv: parse_csv, ImportFormat.ofx: parse_ofx}
+_EXTENSIONS = {".csv": ImportFormat.csv, ".ofx": ImportFormat.ofx, ".qfx": ImportFormat.ofx}
+
+
+@router.post("/expenses")
+def import_expenses(
+    file: UploadFile,
+    format: ImportFormat | None = None,
+    category_id: int | None = None,
+) -> StreamingResponse:
+    """Import the expenses of a CSV file or OFX statement.
+
+    ``format`` defaults to the one of the file name's extension.
+    ``category_id`` is the category of rows without a known category.
+    """
+    format = format or _EXTENSIONS.get(PurePath(file.filename or "").suffix.lower())
+    if format is None:
+        raise HTTPException(status_code=400, detail="Cannot tell the file format; pass format")
+    if category_id is not None:
+        with SessionLocal() as db:
+            if db.get(Category, category_id) is None:
+                raise HTTPException(status_code=400, detail=f"Category {category_id} not found")
+
+    # The upload is already spooled to disk by the multipart parser; it is
+    # decoded and parsed as the import reads it
+    text = io.TextIOWrapper(file.file, encoding="utf-8-sig", errors="replace", newline="")
+    try:
+        records = _PARSERS[format](text)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from None
+
+    return StreamingResponse(
+        _progress(records, category_id), media_type="application/x-ndjson"
+    )
+
+
+def _progress(records: Iterator[dict], category_id: int | None) -> Iterator[str]:
+    with SessionLocal() as db:
+        for report in ImportService(db).import_expenses(records, category_id):
+            yield json.dumps(report) + "\n"
@@ -1,4 +1,5 @@
 from pathlib import Path
+from typing import Literal
 
 from pydantic_settings import BaseSettings
 
@@ -8,6 +9,44 @@ class Settings(BaseSettings):
     debug: bool = False
     cors_origins: list[str] = ["http://localhost:5173"]
 
+    # Connection pool (MYMONEY_POOL_SIZE, MYMONEY_POOL_MAX_OVERFLOW, ...)
+    pool_size: int = 5
+    pool_max_overflow: int = 10
+    pool_timeout: float = 30.0
+    pool_pre_ping: bool = True
+    pool_recycle: int = 3600
+
+    # SQLite pragmas applied to every new connection (MYMONEY_SQLITE_*)
+    sqlite_journal_mode: Literal["DELETE", "TRUNCATE", "PERSIST", "WAL", "MEMORY", "OFF"] = "WAL"
+    sqlite_synchronous: Literal["OFF", "NORMAL", "FULL", "EXTRA"] = "NORMAL"
+    sqlite_cache_size: int = -64000  # negative = KiB, so 64 MB
+    sqlite_mmap_size: int = 256 * 1024 * 1024
+    sqlite_temp_store: Literal["DEFAULT", "FILE", "MEMORY"] = "MEMORY"
+    sqlite_busy_timeout: int = 5000  # milliseconds
+
+    # Compute dashboard sections concurrently, each on its own read session
+    dashboard_concurrent_sections: bool = True
+
+    # Exchange rates (MYMONEY_EXCHANGE_RATE_*): fetched once per TTL for the
+    # pivot currency; rates for other bases are derived as cross rates
+    exchange_rate_provider: Literal["file", "http"] = "file"
+    exchange_rate_file: str = str(Path(__file__).resolve().parent / "data" / "exchange_rates.json")
+    exchange_rate_url: str = "https://api.frankfurter.app/latest?from={base}"
+    exchange_rate_pivot: str = "USD"
+    exchange_rate_ttl: int = 3600  # seconds
+
+    # Recurring expenses (MYMONEY_RECURRENCE_*): occurrences are generated
+    # this many days ahead by a background task running every ``interval``
+    # seconds (0 disables it; ``python -m app.recurrence`` runs it once)
+    recurrence_horizon_days: int = 90
+    recurrence_interval: int = 3600
+
+    # Rows written per transaction by the expense import endpoint
+    import_chunk_size: int = 1000
+
+    # Rows fetched and encoded at a time by the export endpoints
+    export_batch_size: int = 1000
+
     model_config = {"env_prefix": "MYMONEY_"}
 
 
@@ -1,12 +1,87 @@
-from sqlalchemy import create_engine
+from collections.abc import AsyncIterator
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
-from app.config import settings
+from app.config import Settings, settings
+
+_pool_options = {
+    "pool_size": settings.pool_size,
+    "max_overflow": settings.pool_max_overflow,
+    "pool_timeout": settings.pool_timeout,
+    "pool_pre_ping": settings.pool_pre_ping,
+    "pool_recycle": settings.pool_recycle,
+}
 
+# Synchronous engine: startup, migrations, CLI commands and scripts.
 engine = create_engine(
     f"sqlite:///{settings.db_path}",
     connect_args={"check_same_thread": False},
     echo=settings.debug,
+    **_pool_options,
+)
+
+# Async engine: GraphQL requests.
+async_engine = create_async_engine(
+    f"sqlite+aiosqlite:///{settings.db_path}",
+    echo=settings.debug,
+    **_pool_options,
 )
 
+
+def apply_sqlite_pragmas(dbapi_connection, config: Settings = settings) -> None:
+    """Apply the configured journal, durability and cache pragmas.
+
+    WAL lets readers proceed while a writer is active; with WAL,
+    ``synchronous=NORMAL`` stays crash-safe and only syncs at checkpoints.
+    """
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(f"PRAGMA journal_mode={config.sqlite_journal_mode}")
+        cursor.execute(f"PRAGMA synchronous={config.sqlite_synchronous}")
+        cursor.execute(f"PRAGMA cache_size={int(config.sqlite_cache_size)}")
+        cursor.execute(f"PRAGMA mmap_size={int(config.sqlite_mmap_size)}")
+        cursor.execute(f"PRAGMA temp_store={config.sqlite_temp_store}")
+        cursor.execute(f"PRAGMA busy_timeout={int(config.sqlite_busy_timeout)}")
+    finally:
+        cursor.close()
+
+
+@event.listens_for(engine, "connect")
+@event.listens_for(async_engine.sync_engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    apply_sqlite_pragmas(dbapi_connection)
+
+
 SessionLocal = sessionmaker(bind=engine)
+
+# Objects stay usable after commit: resolvers convert them outside the
+# session, where an expired attribute could not be reloaded.
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """Yield a session for one request and release it afterwards.
+
+    Used by the GraphQL context. Uncommitted work is rolled back if the
+    request fails; closing the session returns its connection to the pool
+    and drops the identity map.
+    """
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+        except Exception:
+            await db.rollback()
+            raise
+
+
+def pool_status() -> dict:
+    """Counters for the request (async) engine's connection pool."""
+    pool = async_engine.sync_engine.pool
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+    }
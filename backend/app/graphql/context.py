@@ -1,8 +1,10 @@
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
 from starlette.requests import Request
 
-from app.database import SessionLocal
+from app.database import get_async_db
+from app.graphql.loaders import Loaders
 
 
-def get_context(request: Request) -> dict:
-    db = SessionLocal()
-    return {"db": db, "request": request}
+async def get_context(request: Request, db: AsyncSession = Depends(get_async_db)) -> dict:
+    return {"db": db, "request": request, "loaders": Loaders(db)}
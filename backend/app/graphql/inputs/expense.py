@@ -42,12 +42,15 @@ class ExpenseFilter:
     is_recurring: bool | None = None
     is_paid: bool | None = None
     search: str | None = None
+    # Occurrences of recurring expenses generated ahead of their date
+    include_upcoming: bool = False
 
 
 @strawberry.enum
 class ExpenseSortField(enum.Enum):
     DATE = "date"
     AMOUNT = "amount"
+    RELEVANCE = "relevance"  # Full-text rank when a search term is given, else date
 
 
 @strawberry.enum
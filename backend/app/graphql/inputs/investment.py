@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import enum
 from datetime import date
 from decimal import Decimal
 
@@ -45,3 +46,17 @@ class UpdateAssetInput:
     current_price: Decimal | None = None
     currency: str | None = None
     notes: str | None = None
+
+
+@strawberry.input
+class AssetPriceInput:
+    symbol: str
+    price: Decimal
+    as_of: date
+
+
+@strawberry.enum
+class SeriesInterval(enum.Enum):
+    DAILY = "day"
+    WEEKLY = "week"
+    MONTHLY = "month"
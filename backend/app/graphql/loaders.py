@@ -0,0 +1,80 @@
+"""Request-scoped DataLoaders.
+
+Nested fields (an expense's category, a portfolio's assets, a category's
+expenses) load through these instead of joins or lazy loads. All keys
+requested while resolving one level of the query are collected into a
+single ``IN (...)`` query, so the number of queries depends on the query
+shape, not on the number of rows. Loaders cache per request and are
+created fresh in ``get_context``.
+"""
+
+import asyncio
+from collections import defaultdict
+from datetime import date
+
+from strawberry.dataloader import DataLoader
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.graphql.resolvers.expense import _to_category_type, _to_expense_type
+from app.graphql.resolvers.investment import _to_asset_gql
+from app.graphql.types.category import CategoryType
+from app.graphql.types.expense import ExpenseType
+from app.graphql.types.investment import AssetGQL
+from app.services.async_services import (
+    AsyncCategoryService,
+    AsyncExpenseService,
+    AsyncInvestmentService,
+    load_converter,
+)
+from app.services.currency import CurrencyConverter
+
+
+class Loaders:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.category_by_id = DataLoader[int, CategoryType | None](load_fn=self._load_categories)
+        self.assets_by_portfolio_id = DataLoader[int, list[AssetGQL]](load_fn=self._load_assets)
+        # Keyed by (category id, limit)
+        self.expenses_by_category_id = DataLoader[
+            tuple[int, int, date | None], list[ExpenseType]
+        ](load_fn=self._load_expenses)
+        self.portfolio_totals_by_id = DataLoader[int, dict](load_fn=self._load_portfolio_totals)
+        self._converter: asyncio.Future[CurrencyConverter] | None = None
+
+    async def converter(self) -> CurrencyConverter:
+        """Converter into the main currency; settings and rates are read once per request."""
+        if self._converter is None:
+            self._converter = asyncio.ensure_future(load_converter(self.db))
+        return await self._converter
+
+    async def _load_categories(self, ids: list[int]) -> list[CategoryType | None]:
+        categories = await AsyncCategoryService(self.db).categories_by_ids(ids)
+        return [
+            _to_category_type(categories[id]) if id in categories else None for id in ids
+        ]
+
+    async def _load_assets(self, portfolio_ids: list[int]) -> list[list[AssetGQL]]:
+        assets = await AsyncInvestmentService(self.db).assets_by_portfolio_ids(portfolio_ids)
+        return [[_to_asset_gql(a) for a in assets[id]] for id in portfolio_ids]
+
+    async def _load_expenses(
+        self, keys: list[tuple[int, int, date | None]]
+    ) -> list[list[ExpenseType]]:
+        # Keys are (category id, limit, occurrences_until). One query per
+        # distinct (limit, occurrences_until); normally every key shares them.
+        ids_by_options: dict[tuple[int, date | None], list[int]] = defaultdict(list)
+        for category_id, *options in keys:
+            ids_by_options[tuple(options)].append(category_id)
+        service = AsyncExpenseService(self.db)
+        expenses = {}
+        for (limit, until), category_ids in ids_by_options.items():
+            grouped = await service.expenses_by_category_ids(category_ids, limit, until)
+            expenses.update({(id, limit, until): rows for id, rows in grouped.items()})
+        return [[_to_expense_type(e) for e in expenses[key]] for key in keys]
+
+    async def _load_portfolio_totals(self, portfolio_ids: list[int]) -> list[dict]:
+        # Summed in SQL; the assets themselves are only loaded if selected
+        totals = await AsyncInvestmentService(self.db).portfolio_valuations(
+            portfolio_ids, await self.converter()
+        )
+        return [totals[id] for id in portfolio_ids]
@@ -1,34 +1,53 @@
+from decimal import Decimal
+
 import strawberry
 from strawberry.types import Info
+from strawberry.utils.str_converters import to_snake_case
 
 from app.graphql.resolvers.expense import _to_category_type, _to_expense_type
+from app.graphql.selection import selected_field_names
 from app.graphql.types.dashboard import (
     AllocationSlice,
     CategorySummary,
     DashboardSummary,
+    IncomeSlice,
     MonthlyExpense,
 )
+from app.graphql.types.exchange_rate import CurrencyTotal
+from app.graphql.types.income import IncomeTypeEnum
 from app.graphql.types.investment import AssetType
-from app.services.dashboard_service import DashboardService
+from app.services.async_services import AsyncDashboardService
+from app.services.currency import PassthroughConverter
+from app.services.dashboard_service import converts_amounts
 
 
 @strawberry.type
 class DashboardQuery:
     @strawberry.field
-    def dashboard(self, info: Info, month: str | None = None) -> DashboardSummary:
-        db = info.context["db"]
-        service = DashboardService(db)
-        data = service.get_summary(month=month)
+    async def dashboard(self, info: Info, month: str | None = None) -> DashboardSummary:
+        service = AsyncDashboardService(info.context["db"])
+        # Only the sections behind the selected fields are computed
+        fields = {to_snake_case(name) for name in selected_field_names(info)}
+        # Settings and rates are only read when an amount is converted
+        if converts_amounts(fields) or "currency" in fields:
+            converter = await info.context["loaders"].converter()
+        else:
+            converter = PassthroughConverter()
+        data = await service.get_summary(month=month, fields=fields, converter=converter)
 
+        # Fields of skipped sections are never serialized; the placeholders
+        # only satisfy the constructor.
+        zero = Decimal("0")
         return DashboardSummary(
-            total_expenses_this_month=data["total_expenses_this_month"],
-            total_expenses_last_month=data["total_expenses_last_month"],
-            expense_change_percent=data["expense_change_percent"],
-            total_portfolio_value=data["total_portfolio_value"],
-            total_portfolio_cost=data["total_portfolio_cost"],
-            net_worth=data["net_worth"],
-            total_monthly_income=data["total_monthly_income"],
-            income_streams_count=data["income_streams_count"],
+            currency=converter.target,
+            total_expenses_this_month=data.get("total_expenses_this_month", zero),
+            total_expenses_last_month=data.get("total_expenses_last_month", zero),
+            expense_change_percent=data.get("expense_change_percent"),
+            total_portfolio_value=data.get("total_portfolio_value", zero),
+            total_portfolio_cost=data.get("total_portfolio_cost", zero),
+            net_worth=data.get("net_worth", zero),
+            total_monthly_income=data.get("total_monthly_income", zero),
+            income_streams_count=data.get("income_streams_count", 0),
             top_categories=[
                 CategorySummary(
                     category=_to_category_type(c["category"]),
@@ -36,19 +55,34 @@ class DashboardQuery:
                     percentage=c["percentage"],
                     transaction_count=c["transaction_count"],
                 )
-                for c in data["top_categories"]
+                for c in data.get("top_categories", [])
             ],
-            recent_expenses=[_to_expense_type(e) for e in data["recent_expenses"]],
+            recent_expenses=[_to_expense_type(e) for e in data.get("recent_expenses", [])],
             portfolio_allocation=[
                 AllocationSlice(
                     asset_type=AssetType(a["asset_type"]),
                     total_value=a["total_value"],
                     percentage=a["percentage"],
                 )
-                for a in data["portfolio_allocation"]
+                for a in data.get("portfolio_allocation", [])
             ],
             monthly_expense_trend=[
                 MonthlyExpense(month=m["month"], total_amount=m["total_amount"])
-                for m in data["monthly_expense_trend"]
+                for m in data.get("monthly_expense_trend", [])
+            ],
+            portfolio_value_by_currency=[
+                CurrencyTotal(**row) for row in data.get("portfolio_value_by_currency", [])
+            ],
+            monthly_income_by_currency=[
+                CurrencyTotal(**row) for row in data.get("monthly_income_by_currency", [])
+            ],
+            monthly_income_by_type=[
+                IncomeSlice(
+                    income_type=IncomeTypeEnum(i["income_type"]),
+                    total_amount=i["total_amount"],
+                    percentage=i["percentage"],
+                    count=i["count"],
+                )
+                for i in data.get("monthly_income_by_type", [])
             ],
         )
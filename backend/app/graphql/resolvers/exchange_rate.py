@@ -0,0 +1,20 @@
+import strawberry
+
+from app.graphql.types.exchange_rate import ExchangeRateType, ExchangeRatesResponse
+from app.services.exchange_rate_service import get_exchange_rates
+
+
+@strawberry.type
+class ExchangeRateQuery:
+    @strawberry.field
+    async def exchange_rates(self, base: str = "USD") -> ExchangeRatesResponse:
+        base = base.upper()
+        rates, fetched_at = await get_exchange_rates().rates_for(base)
+        return ExchangeRatesResponse(
+            base=base,
+            rates=[
+                ExchangeRateType(currency=currency, rate=rate)
+                for currency, rate in sorted(rates.items())
+            ],
+            fetched_at=fetched_at,
+        )
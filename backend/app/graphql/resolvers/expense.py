@@ -1,8 +1,17 @@
+from datetime import date
+
 import strawberry
 from strawberry.types import Info
 
+from app.graphql.selection import selected_field_names
 from app.graphql.types.category import CategoryType
-from app.graphql.types.expense import ExpenseType, ExpenseConnection, ExpenseSummaryType
+from app.graphql.types.expense import (
+    ExpenseCategoryBreakdown,
+    ExpenseConnection,
+    ExpenseSummaryType,
+    ExpenseType,
+)
+from app.graphql.types.pagination import PageInfo
 from app.graphql.inputs.expense import (
     CreateExpenseInput,
     UpdateExpenseInput,
@@ -10,7 +19,8 @@ from app.graphql.inputs.expense import (
     ExpenseSortField,
     SortDirection,
 )
-from app.services.expense_service import ExpenseService, CategoryService
+from app.services.async_services import AsyncCategoryService, AsyncExpenseService
+from app.services.expense_service import ExpenseService
 
 
 def _to_category_type(cat) -> CategoryType:
@@ -30,9 +40,14 @@ def _to_expense_type(expense) -> ExpenseType:
         description=expense.description,
         notes=expense.notes,
         date=expense.date,
-        category=_to_category_type(expense.category),
+        category_id=expense.category_id,
         is_recurring=expense.is_recurring,
         recurrence_rule=expense.recurrence_rule,
+        recurrence_parent_id=(
+            strawberry.ID(str(expense.recurrence_parent_id))
+            if expense.recurrence_parent_id
+            else None
+        ),
         is_paid=expense.is_paid,
         paid_at=expense.paid_at,
         created_at=expense.created_at,
@@ -43,7 +58,7 @@ def _to_expense_type(expense) -> ExpenseType:
 @strawberry.type
 class ExpenseQuery:
     @strawberry.field
-    def expenses(
+    async def expenses(
         self,
         info: Info,
         filter: ExpenseFilter | None = None,
@@ -51,9 +66,10 @@ class ExpenseQuery:
         sort_direction: SortDirection = SortDirection.DESC,
         limit: int = 20,
         offset: int = 0,
+        first: int | None = None,
+        after: str | None = None,
     ) -> ExpenseConnection:
-        db = info.context["db"]
-        service = ExpenseService(db)
+        service = AsyncExpenseService(info.context["db"])
 
         kwargs = {}
         if filter:
@@ -73,35 +89,55 @@ class ExpenseQuery:
                 kwargs["is_paid"] = filter.is_paid
             if filter.search is not None:
                 kwargs["search"] = filter.search
+        if not (filter and filter.include_upcoming):
+            kwargs["occurrences_until"] = date.today()
 
-        items, total_count, has_more = service.list_expenses(
+        items, total_count, has_more = await service.list_expenses(
             **kwargs,
             sort_by=sort_by.value,
             sort_direction=sort_direction.value,
-            limit=limit,
+            limit=first if first is not None else limit,
             offset=offset,
+            after=after,
+            include_total="totalCount" in selected_field_names(info),
         )
 
+        # Relevance-ranked search results only support offset pagination
+        ranked = sort_by == ExpenseSortField.RELEVANCE and bool(kwargs.get("search"))
+        end_cursor = None
+        if items and not ranked:
+            end_cursor = ExpenseService.cursor_for(items[-1], sort_by.value)
         return ExpenseConnection(
             items=[_to_expense_type(e) for e in items],
-            total_count=total_count,
+            # Only counted when selected; an unselected field is never serialized.
+            total_count=total_count or 0,
             has_more=has_more,
+            page_info=PageInfo(end_cursor=end_cursor, has_next_page=has_more),
         )
 
     @strawberry.field
-    def expense(self, info: Info, id: strawberry.ID) -> ExpenseType | None:
-        db = info.context["db"]
-        service = ExpenseService(db)
-        expense = service.get_expense(int(id))
+    async def expense(self, info: Info, id: strawberry.ID) -> ExpenseType | None:
+        service = AsyncExpenseService(info.context["db"])
+        expense = await service.get_expense(int(id))
         return _to_expense_type(expense) if expense else None
 
     @strawberry.field
-    def expense_summary(
-        self, info: Info, month: int | None = None, year: int | None = None
+    async def expense_summary(
+        self,
+        info: Info,
+        month: int | None = None,
+        year: int | None = None,
+        start_date: date | None = None,
+        end_date: date | None = None,
     ) -> ExpenseSummaryType:
-        db = info.context["db"]
-        service = ExpenseService(db)
-        summary = service.get_expense_summary(month=month, year=year)
+        service = AsyncExpenseService(info.context["db"])
+        summary = await service.get_expense_summary(
+            month=month,
+            year=year,
+            start_date=start_date,
+            end_date=end_date,
+            include_categories="byCategory" in selected_field_names(info),
+        )
         return ExpenseSummaryType(
             total_amount=summary["total_amount"],
             paid_amount=summary["paid_amount"],
@@ -109,16 +145,27 @@ class ExpenseQuery:
             total_count=summary["total_count"],
             paid_count=summary["paid_count"],
             unpaid_count=summary["unpaid_count"],
+            by_category=[
+                ExpenseCategoryBreakdown(
+                    category=_to_category_type(c["category"]),
+                    total_amount=c["total_amount"],
+                    paid_amount=c["paid_amount"],
+                    unpaid_amount=c["unpaid_amount"],
+                    total_count=c["total_count"],
+                    paid_count=c["paid_count"],
+                    unpaid_count=c["unpaid_count"],
+                )
+                for c in summary.get("categories", [])
+            ],
         )
 
 
 @strawberry.type
 class ExpenseMutation:
     @strawberry.mutation
-    def create_expense(self, info: Info, input: CreateExpenseInput) -> ExpenseType:
-        db = info.context["db"]
-        service = ExpenseService(db)
-        expense = service.create_expense(
+    async def create_expense(self, info: Info, input: CreateExpenseInput) -> ExpenseType:
+        service = AsyncExpenseService(info.context["db"])
+        expense = await service.create_expense(
             amount=input.amount,
             description=input.description,
             notes=input.notes,
@@ -130,11 +177,10 @@ class ExpenseMutation:
         return _to_expense_type(expense)
 
     @strawberry.mutation
-    def update_expense(
+    async def update_expense(
         self, info: Info, id: strawberry.ID, input: UpdateExpenseInput
     ) -> ExpenseType:
-        db = info.context["db"]
-        service = ExpenseService(db)
+        service = AsyncExpenseService(info.context["db"])
 
         kwargs = {}
         if input.amount is not None:
@@ -152,22 +198,20 @@ class ExpenseMutation:
         if input.recurrence_rule is not None:
             kwargs["recurrence_rule"] = input.recurrence_rule.value
 
-        expense = service.update_expense(int(id), **kwargs)
+        expense = await service.update_expense(int(id), **kwargs)
         if not expense:
             raise ValueError(f"Expense with id {id} not found")
         return _to_expense_type(expense)
 
     @strawberry.mutation
-    def delete_expense(self, info: Info, id: strawberry.ID) -> bool:
-        db = info.context["db"]
-        service = ExpenseService(db)
-        return service.delete_expense(int(id))
+    async def delete_expense(self, info: Info, id: strawberry.ID) -> bool:
+        service = AsyncExpenseService(info.context["db"])
+        return await service.delete_expense(int(id))
 
     @strawberry.mutation
-    def mark_expense_paid(self, info: Info, id: strawberry.ID, paid: bool) -> ExpenseType:
-        db = info.context["db"]
-        service = ExpenseService(db)
-        expense = service.mark_expense_paid(int(id), paid)
+    async def mark_expense_paid(self, info: Info, id: strawberry.ID, paid: bool) -> ExpenseType:
+        service = AsyncExpenseService(info.context["db"])
+        expense = await service.mark_expense_paid(int(id), paid)
         if not expense:
             raise ValueError(f"Expense with id {id} not found")
         return _to_expense_type(expense)
@@ -176,36 +220,33 @@ class ExpenseMutation:
 @strawberry.type
 class CategoryQuery:
     @strawberry.field
-    def categories(self, info: Info) -> list[CategoryType]:
-        db = info.context["db"]
-        service = CategoryService(db)
-        return [_to_category_type(c) for c in service.list_categories()]
+    async def categories(self, info: Info) -> list[CategoryType]:
+        service = AsyncCategoryService(info.context["db"])
+        return [_to_category_type(c) for c in await service.list_categories()]
 
     @strawberry.field
-    def category(self, info: Info, id: strawberry.ID) -> CategoryType | None:
-        db = info.context["db"]
-        service = CategoryService(db)
-        cat = service.get_category(int(id))
+    async def category(self, info: Info, id: strawberry.ID) -> CategoryType | None:
+        service = AsyncCategoryService(info.context["db"])
+        cat = await service.get_category(int(id))
         return _to_category_type(cat) if cat else None
 
 
 @strawberry.type
 class CategoryMutation:
     @strawberry.mutation
-    def create_category(
+    async def create_category(
         self, info: Info, name: str, color: str | None = None, icon: str | None = None
     ) -> CategoryType:
-        db = info.context["db"]
-        service = CategoryService(db)
+        service = AsyncCategoryService(info.context["db"])
         kwargs = {"name": name}
         if color is not None:
             kwargs["color"] = color
         if icon is not None:
             kwargs["icon"] = icon
-        return _to_category_type(service.create_category(**kwargs))
+        return _to_category_type(await service.create_category(**kwargs))
 
     @strawberry.mutation
-    def update_category(
+    async def update_category(
         self,
         info: Info,
         id: strawberry.ID,
@@ -213,8 +254,7 @@ class CategoryMutation:
         color: str | None = None,
         icon: str | None = None,
     ) -> CategoryType:
-        db = info.context["db"]
-        service = CategoryService(db)
+        service = AsyncCategoryService(info.context["db"])
         kwargs = {}
         if name is not None:
             kwargs["name"] = name
@@ -222,13 +262,12 @@ class CategoryMutation:
             kwargs["color"] = color
         if icon is not None:
             kwargs["icon"] = icon
-        cat = service.update_category(int(id), **kwargs)
+        cat = await service.update_category(int(id), **kwargs)
         if not cat:
             raise ValueError(f"Category with id {id} not found")
         return _to_category_type(cat)
 
     @strawberry.mutation
-    def delete_category(self, info: Info, id: strawberry.ID) -> bool:
-        db = info.context["db"]
-        service = CategoryService(db)
-        return service.delete_category(int(id))
+    async def delete_category(self, info: Info, id: strawberry.ID) -> bool:
+        service = AsyncCategoryService(info.context["db"])
+        return await service.delete_category(int(id))
@@ -0,0 +1,19 @@
+import strawberry
+from strawberry.types import Info
+
+from app.graphql.types.forecast import CashFlowMonth
+from app.services.async_services import AsyncForecastService
+
+MAX_FORECAST_MONTHS = 120
+
+
+@strawberry.type
+class ForecastQuery:
+    @strawberry.field
+    async def cash_flow_forecast(self, info: Info, months: int = 12) -> list[CashFlowMonth]:
+        if not 1 <= months <= MAX_FORECAST_MONTHS:
+            raise ValueError(f"months must be between 1 and {MAX_FORECAST_MONTHS}")
+        converter = await info.context["loaders"].converter()
+        service = AsyncForecastService(info.context["db"])
+        forecast = await service.cash_flow_forecast(months, converter=converter)
+        return [CashFlowMonth(**month) for month in forecast]
@@ -2,9 +2,10 @@ import strawberry
 from strawberry.types import Info
 
 from app.graphql.types.income import IncomeType, IncomeConnection
+from app.graphql.types.pagination import PageInfo
 from app.graphql.inputs.income import CreateIncomeInput, UpdateIncomeInput
+from app.services.async_services import AsyncIncomeService, AsyncSettingsService
 from app.services.income_service import IncomeService
-from app.services.settings_service import SettingsService
 
 
 def _to_income_type(income) -> IncomeType:
@@ -29,50 +30,52 @@ def _to_income_type(income) -> IncomeType:
 @strawberry.type
 class IncomeQuery:
     @strawberry.field
-    def incomes(
+    async def incomes(
         self,
         info: Info,
         is_active: bool | None = None,
         limit: int = 50,
         offset: int = 0,
+        first: int | None = None,
+        after: str | None = None,
     ) -> IncomeConnection:
-        db = info.context["db"]
-        service = IncomeService(db)
+        service = AsyncIncomeService(info.context["db"])
 
-        items, total_count, has_more = service.list_incomes(
+        items, total_count, has_more = await service.list_incomes(
             is_active=is_active,
-            limit=limit,
+            limit=first if first is not None else limit,
             offset=offset,
+            after=after,
         )
 
+        end_cursor = IncomeService.cursor_for(items[-1]) if items else None
         return IncomeConnection(
             items=[_to_income_type(i) for i in items],
             total_count=total_count,
             has_more=has_more,
+            page_info=PageInfo(end_cursor=end_cursor, has_next_page=has_more),
         )
 
     @strawberry.field
-    def income(self, info: Info, id: strawberry.ID) -> IncomeType | None:
-        db = info.context["db"]
-        service = IncomeService(db)
-        income = service.get_income(int(id))
+    async def income(self, info: Info, id: strawberry.ID) -> IncomeType | None:
+        service = AsyncIncomeService(info.context["db"])
+        income = await service.get_income(int(id))
         return _to_income_type(income) if income else None
 
 
 @strawberry.type
 class IncomeMutation:
     @strawberry.mutation
-    def create_income(self, info: Info, input: CreateIncomeInput) -> IncomeType:
-        db = info.context["db"]
-        service = IncomeService(db)
+    async def create_income(self, info: Info, input: CreateIncomeInput) -> IncomeType:
+        service = AsyncIncomeService(info.context["db"])
 
         # Get default currency from settings if not provided
         currency = input.currency
         if currency is None:
-            settings_service = SettingsService(db)
-            currency = settings_service.get_default_currency()
+            settings_service = AsyncSettingsService(info.context["db"])
+            currency = await settings_service.get_default_currency()
 
-        income = service.create_income(
+        income = await service.create_income(
             name=input.name,
             amount=input.amount,
             income_type=input.income_type.value,
@@ -87,11 +90,10 @@ class IncomeMutation:
         return _to_income_type(income)
 
     @strawberry.mutation
-    def update_income(
+    async def update_income(
         self, info: Info, id: strawberry.ID, input: UpdateIncomeInput
     ) -> IncomeType:
-        db = info.context["db"]
-        service = IncomeService(db)
+        service = AsyncIncomeService(info.context["db"])
 
         kwargs = {}
         if input.name is not None:
@@ -115,13 +117,12 @@ class IncomeMutation:
         if input.other_fees is not None:
             kwargs["other_fees"] = input.other_fees
 
-        income = service.update_income(int(id), **kwargs)
+        income = await service.update_income(int(id), **kwargs)
         if not income:
             raise ValueError(f"Income with id {id} not found")
         return _to_income_type(income)
 
     @strawberry.mutation
-    def delete_income(self, info: Info, id: strawberry.ID) -> bool:
-        db = info.context["db"]
-        service = IncomeService(db)
-        return service.delete_income(int(id))
+    async def delete_income(self, info: Info, id: strawberry.ID) -> bool:
+        service = AsyncIncomeService(info.context["db"])
+        return await service.delete_income(int(id))
@@ -1,14 +1,19 @@
+from datetime import date
+
 import strawberry
 from strawberry.types import Info
 
-from app.graphql.types.investment import AssetGQL, AssetType
-from app.graphql.types.portfolio import PortfolioType
+from app.graphql.types.investment import AssetGQL, AssetType, BulkPriceUpdateResult
+from app.graphql.types.portfolio import PortfolioType, PortfolioValuePoint
 from app.graphql.inputs.investment import (
+    AssetPriceInput,
     CreateAssetInput,
     CreatePortfolioInput,
+    SeriesInterval,
     UpdateAssetInput,
     UpdatePortfolioInput,
 )
+from app.services.async_services import AsyncInvestmentService
 from app.services.investment_service import InvestmentService
 
 
@@ -35,16 +40,11 @@ def _to_asset_gql(asset) -> AssetGQL:
 
 
 def _to_portfolio_type(portfolio) -> PortfolioType:
-    totals = InvestmentService.compute_portfolio_totals(portfolio)
+    # Assets and totals resolve through the request's loaders
     return PortfolioType(
         id=strawberry.ID(str(portfolio.id)),
         name=portfolio.name,
         description=portfolio.description,
-        assets=[_to_asset_gql(a) for a in portfolio.assets],
-        total_value=totals["total_value"],
-        total_cost=totals["total_cost"],
-        total_gain_loss=totals["total_gain_loss"],
-        total_gain_loss_percent=totals["total_gain_loss_percent"],
         created_at=portfolio.created_at,
         updated_at=portfolio.updated_at,
     )
@@ -53,65 +53,78 @@ def _to_portfolio_type(portfolio) -> PortfolioType:
 @strawberry.type
 class InvestmentQuery:
     @strawberry.field
-    def portfolios(self, info: Info) -> list[PortfolioType]:
-        db = info.context["db"]
-        service = InvestmentService(db)
-        return [_to_portfolio_type(p) for p in service.list_portfolios()]
+    async def portfolios(self, info: Info) -> list[PortfolioType]:
+        service = AsyncInvestmentService(info.context["db"])
+        return [_to_portfolio_type(p) for p in await service.list_portfolios()]
 
     @strawberry.field
-    def portfolio(self, info: Info, id: strawberry.ID) -> PortfolioType | None:
-        db = info.context["db"]
-        service = InvestmentService(db)
-        p = service.get_portfolio(int(id))
+    async def portfolio(self, info: Info, id: strawberry.ID) -> PortfolioType | None:
+        service = AsyncInvestmentService(info.context["db"])
+        p = await service.get_portfolio(int(id))
         return _to_portfolio_type(p) if p else None
 
     @strawberry.field
-    def asset(self, info: Info, id: strawberry.ID) -> AssetGQL | None:
-        db = info.context["db"]
-        service = InvestmentService(db)
-        a = service.get_asset(int(id))
+    async def asset(self, info: Info, id: strawberry.ID) -> AssetGQL | None:
+        service = AsyncInvestmentService(info.context["db"])
+        a = await service.get_asset(int(id))
         return _to_asset_gql(a) if a else None
 
+    @strawberry.field
+    async def portfolio_value_series(
+        self,
+        info: Info,
+        portfolio_id: strawberry.ID,
+        start: date,
+        end: date,
+        interval: SeriesInterval = SeriesInterval.DAILY,
+    ) -> list[PortfolioValuePoint]:
+        if start > end:
+            raise ValueError("start must not be after end")
+        service = AsyncInvestmentService(info.context["db"])
+        series = await service.portfolio_value_series(
+            int(portfolio_id),
+            start,
+            end,
+            interval.value,
+            converter=await info.context["loaders"].converter(),
+        )
+        if series is None:
+            raise ValueError(f"Portfolio with id {portfolio_id} not found")
+        return [PortfolioValuePoint(**point) for point in series]
+
 
 @strawberry.type
 class InvestmentMutation:
     @strawberry.mutation
-    def create_portfolio(self, info: Info, input: CreatePortfolioInput) -> PortfolioType:
-        db = info.context["db"]
-        service = InvestmentService(db)
-        portfolio = service.create_portfolio(name=input.name, description=input.description)
-        # Reload with assets
-        portfolio = service.get_portfolio(portfolio.id)
+    async def create_portfolio(self, info: Info, input: CreatePortfolioInput) -> PortfolioType:
+        service = AsyncInvestmentService(info.context["db"])
+        portfolio = await service.create_portfolio(name=input.name, description=input.description)
         return _to_portfolio_type(portfolio)
 
     @strawberry.mutation
-    def update_portfolio(
+    async def update_portfolio(
         self, info: Info, id: strawberry.ID, input: UpdatePortfolioInput
     ) -> PortfolioType:
-        db = info.context["db"]
-        service = InvestmentService(db)
+        service = AsyncInvestmentService(info.context["db"])
         kwargs = {}
         if input.name is not None:
             kwargs["name"] = input.name
         if input.description is not None:
             kwargs["description"] = input.description
-        portfolio = service.update_portfolio(int(id), **kwargs)
+        portfolio = await service.update_portfolio(int(id), **kwargs)
         if not portfolio:
             raise ValueError(f"Portfolio with id {id} not found")
-        portfolio = service.get_portfolio(portfolio.id)
         return _to_portfolio_type(portfolio)
 
     @strawberry.mutation
-    def delete_portfolio(self, info: Info, id: strawberry.ID) -> bool:
-        db = info.context["db"]
-        service = InvestmentService(db)
-        return service.delete_portfolio(int(id))
+    async def delete_portfolio(self, info: Info, id: strawberry.ID) -> bool:
+        service = AsyncInvestmentService(info.context["db"])
+        return await service.delete_portfolio(int(id))
 
     @strawberry.mutation
-    def create_asset(self, info: Info, input: CreateAssetInput) -> AssetGQL:
-        db = info.context["db"]
-        service = InvestmentService(db)
-        asset = service.create_asset(
+    async def create_asset(self, info: Info, input: CreateAssetInput) -> AssetGQL:
+        service = AsyncInvestmentService(info.context["db"])
+        asset = await service.create_asset(
             portfolio_id=int(input.portfolio_id),
             symbol=input.symbol,
             name=input.name,
@@ -126,9 +139,10 @@ class InvestmentMutation:
         return _to_asset_gql(asset)
 
     @strawberry.mutation
-    def update_asset(self, info: Info, id: strawberry.ID, input: UpdateAssetInput) -> AssetGQL:
-        db = info.context["db"]
-        service = InvestmentService(db)
+    async def update_asset(
+        self, info: Info, id: strawberry.ID, input: UpdateAssetInput
+    ) -> AssetGQL:
+        service = AsyncInvestmentService(info.context["db"])
         kwargs = {}
         if input.symbol is not None:
             kwargs["symbol"] = input.symbol
@@ -148,27 +162,35 @@ class InvestmentMutation:
             kwargs["currency"] = input.currency
         if input.notes is not None:
             kwargs["notes"] = input.notes
-        asset = service.update_asset(int(id), **kwargs)
+        asset = await service.update_asset(int(id), **kwargs)
         if not asset:
             raise ValueError(f"Asset with id {id} not found")
         return _to_asset_gql(asset)
 
     @strawberry.mutation
-    def delete_asset(self, info: Info, id: strawberry.ID) -> bool:
-        db = info.context["db"]
-        service = InvestmentService(db)
-        return service.delete_asset(int(id))
+    async def delete_asset(self, info: Info, id: strawberry.ID) -> bool:
+        service = AsyncInvestmentService(info.context["db"])
+        return await service.delete_asset(int(id))
 
     @strawberry.mutation
-    def update_asset_price(
+    async def update_asset_price(
         self, info: Info, id: strawberry.ID, current_price: "Decimal"
     ) -> AssetGQL:
-        db = info.context["db"]
-        service = InvestmentService(db)
-        asset = service.update_asset(int(id), current_price=current_price)
+        service = AsyncInvestmentService(info.context["db"])
+        asset = await service.update_asset_price(int(id), current_price)
         if not asset:
             raise ValueError(f"Asset with id {id} not found")
         return _to_asset_gql(asset)
 
+    @strawberry.mutation
+    async def bulk_update_asset_prices(
+        self, info: Info, prices: list[AssetPriceInput]
+    ) -> BulkPriceUpdateResult:
+        service = AsyncInvestmentService(info.context["db"])
+        result = await service.bulk_update_prices(
+            [{"symbol": p.symbol, "price": p.price, "as_of": p.as_of} for p in prices]
+        )
+        return BulkPriceUpdateResult(**result)
+
 
 from decimal import Decimal  # noqa: E402
@@ -7,8 +7,8 @@ from app.graphql.types.settings import (
     LanguageType,
     UpdateSettingsInput,
 )
+from app.services.async_services import AsyncSettingsService
 from app.services.settings_service import (
-    SettingsService,
     SUPPORTED_CURRENCIES,
     SUPPORTED_LANGUAGES,
 )
@@ -27,10 +27,9 @@ def _to_settings_type(settings) -> UserSettingsType:
 @strawberry.type
 class SettingsQuery:
     @strawberry.field
-    def settings(self, info: Info) -> UserSettingsType:
-        db = info.context["db"]
-        service = SettingsService(db)
-        return _to_settings_type(service.get_settings())
+    async def settings(self, info: Info) -> UserSettingsType:
+        service = AsyncSettingsService(info.context["db"])
+        return _to_settings_type(await service.get_settings())
 
     @strawberry.field
     def supported_currencies(self) -> list[CurrencyType]:
@@ -52,10 +51,9 @@ class SettingsQuery:
 @strawberry.type
 class SettingsMutation:
     @strawberry.mutation
-    def update_settings(self, info: Info, input: UpdateSettingsInput) -> UserSettingsType:
-        db = info.context["db"]
-        service = SettingsService(db)
-        settings = service.update_settings(
+    async def update_settings(self, info: Info, input: UpdateSettingsInput) -> UserSettingsType:
+        service = AsyncSettingsService(info.context["db"])
+        settings = await service.update_settings(
             main_currency=input.main_currency, language=input.language
         )
         return _to_settings_type(settings)
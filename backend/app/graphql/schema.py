@@ -1,3 +1,4 @@
+from datetime import date
 from decimal import Decimal
 
 import strawberry
@@ -25,11 +26,13 @@ from app.graphql.resolvers.settings import (
 )
 from app.graphql.resolvers.exchange_rate import ExchangeRateQuery
 from app.graphql.resolvers.dashboard import DashboardQuery
+from app.graphql.resolvers.forecast import ForecastQuery
 from app.graphql.types.dashboard import DashboardSummary
+from app.graphql.types.forecast import CashFlowMonth
 from app.graphql.types.category import CategoryType
 from app.graphql.types.expense import ExpenseType, ExpenseSummaryType
-from app.graphql.types.investment import AssetGQL
-from app.graphql.types.portfolio import PortfolioType
+from app.graphql.types.investment import AssetGQL, BulkPriceUpdateResult
+from app.graphql.types.portfolio import PortfolioType, PortfolioValuePoint
 from app.graphql.inputs.expense import (
     CreateExpenseInput,
     UpdateExpenseInput,
@@ -38,8 +41,10 @@ from app.graphql.inputs.expense import (
     SortDirection,
 )
 from app.graphql.inputs.investment import (
+    AssetPriceInput,
     CreateAssetInput,
     CreatePortfolioInput,
+    SeriesInterval,
     UpdateAssetInput,
     UpdatePortfolioInput,
 )
@@ -58,17 +63,17 @@ class Query:
     # ── Categories ──
 
     @strawberry.field
-    def categories(self, info: Info) -> list[CategoryType]:
-        return CategoryQuery().categories(info)
+    async def categories(self, info: Info) -> list[CategoryType]:
+        return await CategoryQuery().categories(info)
 
     @strawberry.field
-    def category(self, info: Info, id: strawberry.ID) -> CategoryType | None:
-        return CategoryQuery().category(info, id)
+    async def category(self, info: Info, id: strawberry.ID) -> CategoryType | None:
+        return await CategoryQuery().category(info, id)
 
     # ── Expenses ──
 
     @strawberry.field
-    def expenses(
+    async def expenses(
         self,
         info: Info,
         filter: ExpenseFilter | None = None,
@@ -76,54 +81,78 @@ class Query:
         sort_direction: SortDirection = SortDirection.DESC,
         limit: int = 20,
         offset: int = 0,
+        first: int | None = None,
+        after: str | None = None,
     ) -> ExpenseConnection:
-        return ExpenseQuery().expenses(info, filter, sort_by, sort_direction, limit, offset)
+        return await ExpenseQuery().expenses(
+            info, filter, sort_by, sort_direction, limit, offset, first, after
+        )
 
     @strawberry.field
-    def expense(self, info: Info, id: strawberry.ID) -> ExpenseType | None:
-        return ExpenseQuery().expense(info, id)
+    async def expense(self, info: Info, id: strawberry.ID) -> ExpenseType | None:
+        return await ExpenseQuery().expense(info, id)
 
     @strawberry.field
-    def expense_summary(
-        self, info: Info, month: int | None = None, year: int | None = None
+    async def expense_summary(
+        self,
+        info: Info,
+        month: int | None = None,
+        year: int | None = None,
+        start_date: date | None = None,
+        end_date: date | None = None,
     ) -> ExpenseSummaryType:
-        return ExpenseQuery().expense_summary(info, month, year)
+        return await ExpenseQuery().expense_summary(info, month, year, start_date, end_date)
 
     # ── Investments ──
 
     @strawberry.field
-    def portfolios(self, info: Info) -> list[PortfolioType]:
-        return InvestmentQuery().portfolios(info)
+    async def portfolios(self, info: Info) -> list[PortfolioType]:
+        return await InvestmentQuery().portfolios(info)
+
+    @strawberry.field
+    async def portfolio(self, info: Info, id: strawberry.ID) -> PortfolioType | None:
+        return await InvestmentQuery().portfolio(info, id)
 
     @strawberry.field
-    def portfolio(self, info: Info, id: strawberry.ID) -> PortfolioType | None:
-        return InvestmentQuery().portfolio(info, id)
+    async def asset(self, info: Info, id: strawberry.ID) -> AssetGQL | None:
+        return await InvestmentQuery().asset(info, id)
 
     @strawberry.field
-    def asset(self, info: Info, id: strawberry.ID) -> AssetGQL | None:
-        return InvestmentQuery().asset(info, id)
+    async def portfolio_value_series(
+        self,
+        info: Info,
+        portfolio_id: strawberry.ID,
+        start: date,
+        end: date,
+        interval: SeriesInterval = SeriesInterval.DAILY,
+    ) -> list[PortfolioValuePoint]:
+        return await InvestmentQuery().portfolio_value_series(
+            info, portfolio_id, start, end, interval
+        )
 
     # ── Income ──
 
     @strawberry.field
-    def incomes(
+    async def incomes(
         self,
         info: Info,
         is_active: bool | None = None,
         limit: int = 50,
         offset: int = 0,
+        first: int | None = None,
+        after: str | None = None,
     ) -> IncomeConnection:
-        return IncomeQuery().incomes(info, is_active, limit, offset)
+        return await IncomeQuery().incomes(info, is_active, limit, offset, first, after)
 
     @strawberry.field
-    def income(self, info: Info, id: strawberry.ID) -> IncomeType | None:
-        return IncomeQuery().income(info, id)
+    async def income(self, info: Info, id: strawberry.ID) -> IncomeType | None:
+        return await IncomeQuery().income(info, id)
 
     # ── Settings ──
 
     @strawberry.field
-    def settings(self, info: Info) -> UserSettingsType:
-        return SettingsQuery().settings(info)
+    async def settings(self, info: Info) -> UserSettingsType:
+        return await SettingsQuery().settings(info)
 
     @strawberry.field
     def supported_currencies(self) -> list[CurrencyType]:
@@ -142,8 +171,14 @@ class Query:
     # ── Dashboard ──
 
     @strawberry.field
-    def dashboard(self, info: Info, month: str | None = None) -> DashboardSummary:
-        return DashboardQuery().dashboard(info, month)
+    async def dashboard(self, info: Info, month: str | None = None) -> DashboardSummary:
+        return await DashboardQuery().dashboard(info, month)
+
+    # ── Forecast ──
+
+    @strawberry.field
+    async def cash_flow_forecast(self, info: Info, months: int = 12) -> list[CashFlowMonth]:
+        return await ForecastQuery().cash_flow_forecast(info, months)
 
 
 @strawberry.type
@@ -151,13 +186,13 @@ class Mutation:
     # ── Categories ──
 
     @strawberry.mutation
-    def create_category(
+    async def create_category(
         self, info: Info, name: str, color: str | None = None, icon: str | None = None
     ) -> CategoryType:
-        return CategoryMutation().create_category(info, name, color, icon)
+        return await CategoryMutation().create_category(info, name, color, icon)
 
     @strawberry.mutation
-    def update_category(
+    async def update_category(
         self,
         info: Info,
         id: strawberry.ID,
@@ -165,87 +200,97 @@ class Mutation:
         color: str | None = None,
         icon: str | None = None,
     ) -> CategoryType:
-        return CategoryMutation().update_category(info, id, name, color, icon)
+        return await CategoryMutation().update_category(info, id, name, color, icon)
 
     @strawberry.mutation
-    def delete_category(self, info: Info, id: strawberry.ID) -> bool:
-        return CategoryMutation().delete_category(info, id)
+    async def delete_category(self, info: Info, id: strawberry.ID) -> bool:
+        return await CategoryMutation().delete_category(info, id)
 
     # ── Expenses ──
 
     @strawberry.mutation
-    def create_expense(self, info: Info, input: CreateExpenseInput) -> ExpenseType:
-        return ExpenseMutation().create_expense(info, input)
+    async def create_expense(self, info: Info, input: CreateExpenseInput) -> ExpenseType:
+        return await ExpenseMutation().create_expense(info, input)
 
     @strawberry.mutation
-    def update_expense(
+    async def update_expense(
         self, info: Info, id: strawberry.ID, input: UpdateExpenseInput
     ) -> ExpenseType:
-        return ExpenseMutation().update_expense(info, id, input)
+        return await ExpenseMutation().update_expense(info, id, input)
 
     @strawberry.mutation
-    def delete_expense(self, info: Info, id: strawberry.ID) -> bool:
-        return ExpenseMutation().delete_expense(info, id)
+    async def delete_expense(self, info: Info, id: strawberry.ID) -> bool:
+        return await ExpenseMutation().delete_expense(info, id)
 
     @strawberry.mutation
-    def mark_expense_paid(self, info: Info, id: strawberry.ID, paid: bool) -> ExpenseType:
-        return ExpenseMutation().mark_expense_paid(info, id, paid)
+    async def mark_expense_paid(self, info: Info, id: strawberry.ID, paid: bool) -> ExpenseType:
+        return await ExpenseMutation().mark_expense_paid(info, id, paid)
 
     # ── Portfolios ──
 
     @strawberry.mutation
-    def create_portfolio(self, info: Info, input: CreatePortfolioInput) -> PortfolioType:
-        return InvestmentMutation().create_portfolio(info, input)
+    async def create_portfolio(self, info: Info, input: CreatePortfolioInput) -> PortfolioType:
+        return await InvestmentMutation().create_portfolio(info, input)
 
     @strawberry.mutation
-    def update_portfolio(
+    async def update_portfolio(
         self, info: Info, id: strawberry.ID, input: UpdatePortfolioInput
     ) -> PortfolioType:
-        return InvestmentMutation().update_portfolio(info, id, input)
+        return await InvestmentMutation().update_portfolio(info, id, input)
 
     @strawberry.mutation
-    def delete_portfolio(self, info: Info, id: strawberry.ID) -> bool:
-        return InvestmentMutation().delete_portfolio(info, id)
+    async def delete_portfolio(self, info: Info, id: strawberry.ID) -> bool:
+        return await InvestmentMutation().delete_portfolio(info, id)
 
     # ── Assets ──
 
     @strawberry.mutation
-    def create_asset(self, info: Info, input: CreateAssetInput) -> AssetGQL:
-        return InvestmentMutation().create_asset(info, input)
+    async def create_asset(self, info: Info, input: CreateAssetInput) -> AssetGQL:
+        return await InvestmentMutation().create_asset(info, input)
+
+    @strawberry.mutation
+    async def update_asset(
+        self, info: Info, id: strawberry.ID, input: UpdateAssetInput
+    ) -> AssetGQL:
+        return await InvestmentMutation().update_asset(info, id, input)
 
     @strawberry.mutation
-    def update_asset(self, info: Info, id: strawberry.ID, input: UpdateAssetInput) -> AssetGQL:
-        return InvestmentMutation().update_asset(info, id, input)
+    async def delete_asset(self, info: Info, id: strawberry.ID) -> bool:
+        return await InvestmentMutation().delete_asset(info, id)
 
     @strawberry.mutation
-    def delete_asset(self, info: Info, id: strawberry.ID) -> bool:
-        return InvestmentMutation().delete_asset(info, id)
+    async def update_asset_price(
+        self, info: Info, id: strawberry.ID, current_price: Decimal
+    ) -> AssetGQL:
+        return await InvestmentMutation().update_asset_price(info, id, current_price)
 
     @strawberry.mutation
-    def update_asset_price(self, info: Info, id: strawberry.ID, current_price: Decimal) -> AssetGQL:
-        return InvestmentMutation().update_asset_price(info, id, current_price)
+    async def bulk_update_asset_prices(
+        self, info: Info, prices: list[AssetPriceInput]
+    ) -> BulkPriceUpdateResult:
+        return await InvestmentMutation().bulk_update_asset_prices(info, prices)
 
     # ── Income ──
 
     @strawberry.mutation
-    def create_income(self, info: Info, input: CreateIncomeInput) -> IncomeType:
-        return IncomeMutation().create_income(info, input)
+    async def create_income(self, info: Info, input: CreateIncomeInput) -> IncomeType:
+        return await IncomeMutation().create_income(info, input)
 
     @strawberry.mutation
-    def update_income(
+    async def update_income(
         self, info: Info, id: strawberry.ID, input: UpdateIncomeInput
     ) -> IncomeType:
-        return IncomeMutation().update_income(info, id, input)
+        return await IncomeMutation().update_income(info, id, input)
 
     @strawberry.mutation
-    def delete_income(self, info: Info, id: strawberry.ID) -> bool:
-        return IncomeMutation().delete_income(info, id)
+    async def delete_income(self, info: Info, id: strawberry.ID) -> bool:
+        return await IncomeMutation().delete_income(info, id)
 
     # ── Settings ──
 
     @strawberry.mutation
-    def update_settings(self, info: Info, input: UpdateSettingsInput) -> UserSettingsType:
-        return SettingsMutation().update_settings(info, input)
+    async def update_settings(self, info: Info, input: UpdateSettingsInput) -> UserSettingsType:
+        return await SettingsMutation().update_settings(info, input)
 
 
 schema = strawberry.Schema(query=Query, mutation=Mutation)
@@ -0,0 +1,21 @@
+from strawberry.types import Info
+from strawberry.types.nodes import FragmentSpread, InlineFragment, Selection
+
+
+def selected_field_names(info: Info) -> set[str]:
+    """Names of the sub-fields the client selected on the current field.
+
+    Names are as written in the query (camelCase), with fragments flattened.
+    """
+    names: set[str] = set()
+    for field in info.selected_fields:
+        _collect(field.selections, names)
+    return names
+
+
+def _collect(selections: list[Selection], names: set[str]) -> None:
+    for selection in selections:
+        if isinstance(selection, (FragmentSpread, InlineFragment)):
+            _collect(selection.selections, names)
+        else:
+            names.add(selection.name)
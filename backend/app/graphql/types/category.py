@@ -1,5 +1,15 @@
+from __future__ import annotations
+
+from datetime import date, datetime
+from typing import TYPE_CHECKING, Annotated
+
 import strawberry
-from datetime import datetime
+from strawberry.types import Info
+
+if TYPE_CHECKING:
+    from app.graphql.types.expense import ExpenseType
+
+MAX_CATEGORY_EXPENSES = 100
 
 
 @strawberry.type
@@ -9,3 +19,19 @@ class CategoryType:
     color: str
     icon: str | None
     created_at: datetime
+
+    @strawberry.field
+    async def expenses(
+        self, info: Info, limit: int = 20, include_upcoming: bool = False
+    ) -> list[Annotated[ExpenseType, strawberry.lazy("app.graphql.types.expense")]]:
+        """The ``limit`` newest expenses in this category; use ``expenses`` to page further.
+
+        Occurrences of recurring expenses generated ahead of their date are
+        left out unless ``include_upcoming`` is set, as in ``expenses``.
+        """
+        if not 1 <= limit <= MAX_CATEGORY_EXPENSES:
+            raise ValueError(f"limit must be between 1 and {MAX_CATEGORY_EXPENSES}")
+        until = None if include_upcoming else date.today()
+        return await info.context["loaders"].expenses_by_category_id.load(
+            (int(self.id), limit, until)
+        )
@@ -5,7 +5,9 @@ from decimal import Decimal
 import strawberry
 
 from app.graphql.types.category import CategoryType
+from app.graphql.types.exchange_rate import CurrencyTotal
 from app.graphql.types.expense import ExpenseType
+from app.graphql.types.income import IncomeTypeEnum
 from app.graphql.types.investment import AssetType
 
 
@@ -24,6 +26,14 @@ class AllocationSlice:
     percentage: Decimal
 
 
+@strawberry.type
+class IncomeSlice:
+    income_type: IncomeTypeEnum
+    total_amount: Decimal
+    percentage: Decimal
+    count: int
+
+
 @strawberry.type
 class MonthlyExpense:
     month: str
@@ -32,6 +42,7 @@ class MonthlyExpense:
 
 @strawberry.type
 class DashboardSummary:
+    currency: str  # Main currency that portfolio and income amounts are converted to
     total_expenses_this_month: Decimal
     total_expenses_last_month: Decimal
     expense_change_percent: Decimal | None
@@ -44,3 +55,6 @@ class DashboardSummary:
     recent_expenses: list[ExpenseType]
     portfolio_allocation: list[AllocationSlice]
     monthly_expense_trend: list[MonthlyExpense]
+    portfolio_value_by_currency: list[CurrencyTotal]
+    monthly_income_by_currency: list[CurrencyTotal]
+    monthly_income_by_type: list[IncomeSlice]
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from datetime import datetime
+from decimal import Decimal
+
+import strawberry
+
+
+@strawberry.type
+class ExchangeRateType:
+    currency: str
+    rate: Decimal  # Units of ``currency`` per one unit of the base
+
+
+@strawberry.type
+class ExchangeRatesResponse:
+    base: str
+    rates: list[ExchangeRateType]
+    fetched_at: datetime
+
+
+@strawberry.type
+class CurrencyTotal:
+    currency: str
+    amount: Decimal  # In ``currency``
+    converted_amount: Decimal | None  # In the main currency; None without an exchange rate
@@ -6,7 +6,10 @@ import strawberry
 from datetime import date, datetime
 from decimal import Decimal
 
+from strawberry.types import Info
+
 from app.graphql.types.category import CategoryType
+from app.graphql.types.pagination import PageInfo
 
 
 @strawberry.enum
@@ -26,20 +29,37 @@ class ExpenseType:
     description: str
     notes: str | None
     date: date
-    category: CategoryType
+    category_id: strawberry.Private[int]
     is_recurring: bool
     recurrence_rule: str | None
+    recurrence_parent_id: strawberry.ID | None  # Recurring expense it was generated from
     is_paid: bool
     paid_at: datetime | None
     created_at: datetime
     updated_at: datetime
 
+    @strawberry.field
+    async def category(self, info: Info) -> CategoryType:
+        return await info.context["loaders"].category_by_id.load(self.category_id)
+
 
 @strawberry.type
 class ExpenseConnection:
     items: list[ExpenseType]
     total_count: int
     has_more: bool
+    page_info: PageInfo
+
+
+@strawberry.type
+class ExpenseCategoryBreakdown:
+    category: CategoryType
+    total_amount: Decimal
+    paid_amount: Decimal
+    unpaid_amount: Decimal
+    total_count: int
+    paid_count: int
+    unpaid_count: int
 
 
 @strawberry.type
@@ -50,3 +70,4 @@ class ExpenseSummaryType:
     total_count: int
     paid_count: int
     unpaid_count: int
+    by_category: list[ExpenseCategoryBreakdown]
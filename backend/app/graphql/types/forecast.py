@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+from decimal import Decimal
+
+import strawberry
+
+
+@strawberry.type
+class CashFlowMonth:
+    month: str
+    inflow: Decimal
+    outflow: Decimal
+    net: Decimal
+    balance: Decimal  # Running total of net from the first projected month
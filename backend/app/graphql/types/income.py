@@ -6,6 +6,8 @@ import strawberry
 from datetime import date, datetime
 from decimal import Decimal
 
+from app.graphql.types.pagination import PageInfo
+
 
 @strawberry.enum
 class IncomeTypeEnum(enum.Enum):
@@ -40,3 +42,4 @@ class IncomeConnection:
     items: list[IncomeType]
     total_count: int
     has_more: bool
+    page_info: PageInfo
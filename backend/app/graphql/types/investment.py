@@ -36,3 +36,9 @@ class AssetGQL:
     gain_loss_percent: Decimal | None
     created_at: datetime
     updated_at: datetime
+
+
+@strawberry.type
+class BulkPriceUpdateResult:
+    recorded_prices: int
+    updated_assets: int
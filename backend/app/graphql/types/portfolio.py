@@ -1,10 +1,12 @@
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import date, datetime
 from decimal import Decimal
 
 import strawberry
+from strawberry.types import Info
 
+from app.graphql.types.exchange_rate import CurrencyTotal
 from app.graphql.types.investment import AssetGQL
 
 
@@ -13,10 +15,39 @@ class PortfolioType:
     id: strawberry.ID
     name: str
     description: str | None
-    assets: list[AssetGQL]
-    total_value: Decimal
-    total_cost: Decimal
-    total_gain_loss: Decimal
-    total_gain_loss_percent: Decimal
     created_at: datetime
     updated_at: datetime
+
+    @strawberry.field
+    async def assets(self, info: Info) -> list[AssetGQL]:
+        return await info.context["loaders"].assets_by_portfolio_id.load(int(self.id))
+
+    @strawberry.field
+    async def total_value(self, info: Info) -> Decimal:
+        return (await self._totals(info))["total_value"]
+
+    @strawberry.field
+    async def total_cost(self, info: Info) -> Decimal:
+        return (await self._totals(info))["total_cost"]
+
+    @strawberry.field
+    async def total_gain_loss(self, info: Info) -> Decimal:
+        return (await self._totals(info))["total_gain_loss"]
+
+    @strawberry.field
+    async def total_gain_loss_percent(self, info: Info) -> Decimal:
+        return (await self._totals(info))["total_gain_loss_percent"]
+
+    @strawberry.field
+    async def value_by_currency(self, info: Info) -> list[CurrencyTotal]:
+        return [CurrencyTotal(**row) for row in (await self._totals(info))["by_currency"]]
+
+    async def _totals(self, info: Info) -> dict:
+        return await info.context["loaders"].portfolio_totals_by_id.load(int(self.id))
+
+
+@strawberry.type
+class PortfolioValuePoint:
+    date: date
+    total_value: Decimal
+    total_cost: Decimal
@@ -1,12 +1,22 @@
+import asyncio
+from contextlib import suppress
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from strawberry.fastapi import GraphQLRouter
 
+from app.api.exports import router as exports_router
+from app.api.imports import router as imports_router
 from app.config import settings
 from app.graphql.context import get_context
 from app.graphql.schema import schema
 from app.models import Base
-from app.database import engine
+from app.models.expense import ensure_expense_fts
+from app.database import SessionLocal, engine, pool_status
+from app.services.cache import cache_stats
+from app.services.dashboard_service import section_timings
+from app.services.recurrence_service import run_scheduler
+from app.services.rollup_service import RollupService
 
 app = FastAPI(title="MyMoney API")
 
@@ -20,8 +30,38 @@ app.add_middleware(
 
 graphql_router = GraphQLRouter(schema, context_getter=get_context)
 app.include_router(graphql_router, prefix="/graphql")
+app.include_router(imports_router)
+app.include_router(exports_router)
+
+
+@app.get("/metrics")
+def metrics():
+    return {
+        "pool": pool_status(),
+        "caches": cache_stats(),
+        "dashboard_sections": section_timings(),
+    }
 
 
 @app.on_event("startup")
 def on_startup():
     Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        ensure_expense_fts(connection)
+    with SessionLocal() as db:
+        RollupService(db).ensure_built()
+
+
+@app.on_event("startup")
+async def start_recurrence_scheduler():
+    if settings.recurrence_interval > 0:
+        app.state.recurrence_task = asyncio.create_task(run_scheduler())
+
+
+@app.on_event("shutdown")
+async def stop_recurrence_scheduler():
+    task = getattr(app.state, "recurrence_task", None)
+    if task is not None:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
@@ -3,7 +3,23 @@ from app.models.category import Category
 from app.models.expense import Expense
 from app.models.portfolio import Portfolio
 from app.models.asset import Asset
+from app.models.asset_price import AssetPrice
 from app.models.income import Income
+from app.models.exchange_rate import ExchangeRate
 from app.models.settings import UserSettings
+from app.models.rollup import MonthlyCategoryRollup
+from app.models.table_version import TableVersion
 
-__all__ = ["Base", "Category", "Expense", "Portfolio", "Asset", "Income", "UserSettings"]
+__all__ = [
+    "Base",
+    "Category",
+    "Expense",
+    "Portfolio",
+    "Asset",
+    "AssetPrice",
+    "Income",
+    "ExchangeRate",
+    "UserSettings",
+    "MonthlyCategoryRollup",
+    "TableVersion",
+]
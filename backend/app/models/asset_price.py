@@ -0,0 +1,24 @@
+from datetime import date, datetime
+from decimal import Decimal
+
+from sqlalchemy import Date, Index, Numeric, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class AssetPrice(Base):
+    """Price history: one price per symbol and day.
+
+    Appended by ``InvestmentService.update_asset_price`` and
+    ``bulk_update_prices``; ``Asset.current_price`` holds the latest value.
+    """
+
+    __tablename__ = "asset_prices"
+    __table_args__ = (Index("ix_asset_prices_symbol_date", "symbol", "date", unique=True),)
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    symbol: Mapped[str] = mapped_column(String(20), nullable=False)
+    date: Mapped[date] = mapped_column(Date, nullable=False)
+    price: Mapped[Decimal] = mapped_column(Numeric(12, 2), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
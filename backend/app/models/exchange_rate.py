@@ -0,0 +1,18 @@
+from datetime import datetime
+from decimal import Decimal
+
+from sqlalchemy import Numeric, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class ExchangeRate(Base):
+    """Last fetched rates: units of ``currency`` per one unit of ``base``."""
+
+    __tablename__ = "exchange_rates"
+
+    base: Mapped[str] = mapped_column(String(3), primary_key=True)
+    currency: Mapped[str] = mapped_column(String(3), primary_key=True)
+    rate: Mapped[Decimal] = mapped_column(Numeric(18, 8), nullable=False)
+    fetched_at: Mapped[datetime] = mapped_column(nullable=False)
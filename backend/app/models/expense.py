@@ -1,7 +1,20 @@
 from datetime import date, datetime
 from decimal import Decimal
 
-from sqlalchemy import Boolean, Date, DateTime, ForeignKey, Numeric, String, Text
+from sqlalchemy import (
+    DDL,
+    Boolean,
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+    Numeric,
+    String,
+    Text,
+    column,
+    event,
+    table,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base
@@ -9,6 +22,17 @@ from app.models.base import Base
 
 class Expense(Base):
     __tablename__ = "expenses"
+    __table_args__ = (
+        Index("ix_expenses_date_created_at", "date", "created_at"),
+        Index("ix_expenses_date_id", "date", "id"),
+        Index("ix_expenses_category_id_date", "category_id", "date"),
+        Index("ix_expenses_is_paid_date", "is_paid", "date"),
+        Index("ix_expenses_is_recurring_date", "is_recurring", "date"),
+        Index("ix_expenses_amount", "amount"),
+        # One occurrence per series and date, so materialization is idempotent
+        Index("ix_expenses_recurrence_parent_id_date", "recurrence_parent_id", "date", unique=True),
+        Index("ix_expenses_import_hash", "import_hash", unique=True),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     amount: Mapped[Decimal] = mapped_column(Numeric(12, 2), nullable=False)
@@ -18,9 +42,76 @@ class Expense(Base):
     category_id: Mapped[int] = mapped_column(ForeignKey("categories.id"), nullable=False)
     is_recurring: Mapped[bool] = mapped_column(Boolean, default=False)
     recurrence_rule: Mapped[str | None] = mapped_column(String(50))
+    # Occurrences generated from a recurring expense point at it; on the
+    # recurring expense itself, the last date occurrences were generated
+    # through. (Quoted because ``date`` is the column above in this scope.)
+    recurrence_parent_id: Mapped[int | None] = mapped_column(ForeignKey("expenses.id"))
+    materialized_until: Mapped["date | None"] = mapped_column(Date)
+    # Fingerprint of the statement line an imported expense came from
+    import_hash: Mapped[str | None] = mapped_column(String(32))
     is_paid: Mapped[bool] = mapped_column(Boolean, default=False)
     paid_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
     created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(default=datetime.utcnow, onupdate=datetime.utcnow)
 
     category: Mapped["Category"] = relationship(back_populates="expenses")  # noqa: F821
+
+
+# ── Full-text search ──
+# External-content FTS5 index over description/notes, kept in sync by triggers.
+# Mirrored by the add_expense_fts migration for databases managed by Alembic.
+
+EXPENSE_FTS_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS expenses_fts USING fts5(
+        description, notes,
+        content='expenses', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS expenses_fts_ai AFTER INSERT ON expenses BEGIN
+        INSERT INTO expenses_fts(rowid, description, notes)
+        VALUES (new.id, new.description, new.notes);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS expenses_fts_ad AFTER DELETE ON expenses BEGIN
+        INSERT INTO expenses_fts(expenses_fts, rowid, description, notes)
+        VALUES ('delete', old.id, old.description, old.notes);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS expenses_fts_au AFTER UPDATE OF description, notes ON expenses
+    BEGIN
+        INSERT INTO expenses_fts(expenses_fts, rowid, description, notes)
+        VALUES ('delete', old.id, old.description, old.notes);
+        INSERT INTO expenses_fts(rowid, description, notes)
+        VALUES (new.id, new.description, new.notes);
+    END
+    """,
+]
+
+expenses_fts = table("expenses_fts", column("rowid"), column("rank"))
+
+for _statement in EXPENSE_FTS_DDL:
+    event.listen(
+        Expense.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite")
+    )
+event.listen(
+    Expense.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS expenses_fts").execute_if(dialect="sqlite"),
+)
+
+
+def ensure_expense_fts(connection) -> None:
+    """Create and backfill the FTS index on databases built without migrations."""
+    exists = connection.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'expenses_fts'"
+    ).first()
+    if exists:
+        return
+    for statement in EXPENSE_FTS_DDL:
+        connection.exec_driver_sql(statement)
+    connection.exec_driver_sql("INSERT INTO expenses_fts(expenses_fts) VALUES ('rebuild')")
@@ -1,14 +1,34 @@
 from datetime import date, datetime
-from decimal import Decimal
+from decimal import ROUND_HALF_UP, Decimal
 
-from sqlalchemy import Boolean, Date, Numeric, String, Text
+from sqlalchemy import (
+    Boolean,
+    ColumnElement,
+    Date,
+    Index,
+    Integer,
+    Numeric,
+    String,
+    Text,
+    case,
+    cast,
+    func,
+    type_coerce,
+)
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.models.base import Base
 
+_CENTS = Decimal("0.01")
+
 
 class Income(Base):
     __tablename__ = "incomes"
+    __table_args__ = (
+        Index("ix_incomes_is_active", "is_active"),
+        Index("ix_incomes_created_at_id", "created_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column(String(100), nullable=False)
@@ -27,9 +47,9 @@ class Income(Base):
     created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(default=datetime.utcnow, onupdate=datetime.utcnow)
 
-    @property
+    @hybrid_property
     def net_amount(self) -> Decimal:
-        """Calculate net amount after tax and fees deductions."""
+        """Calculate net amount after tax and fees deductions, to the cent."""
         if not self.is_gross:
             return self.amount
 
@@ -42,4 +62,30 @@ class Income(Base):
         if self.other_fees:
             net -= self.other_fees
 
-        return max(net, Decimal("0"))
+        return max(net.quantize(_CENTS, ROUND_HALF_UP), Decimal("0"))
+
+    @net_amount.inplace.expression
+    @classmethod
+    def _net_amount_expression(cls) -> ColumnElement[Decimal]:
+        return type_coerce(cls.net_cents / 100.0, Numeric(12, 2))
+
+    @hybrid_property
+    def net_cents(self) -> int:
+        """The net amount in whole cents."""
+        return int(self.net_amount * 100)
+
+    @net_cents.inplace.expression
+    @classmethod
+    def _net_cents_expression(cls) -> ColumnElement[int]:
+        # Same rules in SQL, so totals can be summed by the database. It is
+        # integer arithmetic on cents and hundredths of a percent, rounded
+        # half up like the getter, so a sum matches the per-row amounts.
+        amount = cast(func.round(cls.amount * 100), Integer)
+        fees = cast(func.round(func.coalesce(cls.other_fees, 0) * 100), Integer)
+        tax = cast(func.round(func.coalesce(cls.tax_rate, 0) * 100), Integer)
+        # The net amount in millionths, i.e. cents times 10000
+        net = amount * (10000 - tax) - fees * 10000
+        return case(
+            (cls.is_gross, case((net > 0, (net + 5000) // 10000), else_=0)),
+            else_=amount,
+        )
@@ -0,0 +1,23 @@
+from decimal import Decimal
+
+from sqlalchemy import ForeignKey, Integer, Numeric, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class MonthlyCategoryRollup(Base):
+    """Pre-aggregated expense totals per month and category.
+
+    Maintained incrementally by ``app.services.rollup_service`` whenever
+    expenses are written; rebuild with ``python -m app.rollup``.
+    """
+
+    __tablename__ = "monthly_category_rollup"
+
+    year_month: Mapped[str] = mapped_column(String(7), primary_key=True)  # "YYYY-MM"
+    category_id: Mapped[int] = mapped_column(ForeignKey("categories.id"), primary_key=True)
+    total: Mapped[Decimal] = mapped_column(Numeric(14, 2), nullable=False, default=0)
+    count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    paid_total: Mapped[Decimal] = mapped_column(Numeric(14, 2), nullable=False, default=0)
+    paid_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
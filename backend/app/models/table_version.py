@@ -0,0 +1,17 @@
+from sqlalchemy import Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class TableVersion(Base):
+    """Write counter per table, bumped in the transaction that writes it.
+
+    Result caches key on these versions (see ``app.services.cache``);
+    keeping them in the database lets every process see every commit.
+    """
+
+    __tablename__ = "table_versions"
+
+    table_name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
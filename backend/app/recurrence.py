@@ -0,0 +1,28 @@
+"""Generate upcoming occurrences of recurring expenses.
+
+Usage (from backend/):
+    python -m app.recurrence [--days 90]
+"""
+
+import argparse
+from datetime import date, timedelta
+
+from app.config import settings
+from app.database import SessionLocal
+from app.services.recurrence_service import RecurrenceService
+
+
+def materialize(days: int) -> None:
+    db = SessionLocal()
+    try:
+        until = date.today() + timedelta(days=days)
+        created = RecurrenceService(db).materialize(until)
+        print(f"Materialized {created} recurring expense occurrences through {until}.")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=settings.recurrence_horizon_days)
+    materialize(parser.parse_args().days)
@@ -0,0 +1,17 @@
+"""Rebuild the monthly category rollup from raw expenses (for backfills)."""
+
+from app.database import SessionLocal
+from app.services.rollup_service import RollupService
+
+
+def rebuild():
+    db = SessionLocal()
+    try:
+        rows = RollupService(db).rebuild()
+        print(f"Rebuilt monthly category rollup ({rows} rows).")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    rebuild()
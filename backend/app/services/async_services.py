@@ -0,0 +1,196 @@
+"""Async front-ends for the synchronous services.
+
+The services are written against the synchronous ``Session`` API. These
+wrappers run each service call through ``AsyncSession.run_sync``, so the
+query executes on the aiosqlite driver without holding a threadpool worker.
+The services eager-load everything the GraphQL converters read, so the
+returned objects can be used after the call returns.
+
+GraphQL resolves sibling fields concurrently, and a session must not be
+used by two coroutines at once, so calls sharing an ``AsyncSession`` are
+serialized by a lock stored on the session.
+"""
+
+import asyncio
+import logging
+import weakref
+from collections.abc import Callable, Iterable
+from typing import Any, Generic, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.pool import Pool, QueuePool
+
+from app.config import settings
+from app.services.cache import has_pending_writes
+from app.services.currency import CurrencyConverter
+from app.services.dashboard_service import SECTIONS, DashboardService, sections_for
+from app.services.exchange_rate_service import get_exchange_rates
+from app.services.expense_service import CategoryService, ExpenseService
+from app.services.forecast_service import ForecastService
+from app.services.income_service import IncomeService
+from app.services.investment_service import InvestmentService
+from app.services.settings_service import SettingsService
+
+S = TypeVar("S")
+T = TypeVar("T")
+
+_LOCK_KEY = "run_sync_lock"
+
+logger = logging.getLogger(__name__)
+
+# Per event loop and connection pool: how many dashboard sections may hold
+# a connection at once, across all requests
+_section_slots: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def session_lock(db: AsyncSession) -> asyncio.Lock:
+    return db.info.setdefault(_LOCK_KEY, asyncio.Lock())
+
+
+async def end_read_transaction(db: AsyncSession) -> None:
+    """Return the session's connection to the pool if it only read.
+
+    A request then holds a connection only while a call runs, never while
+    it waits for another one, so concurrent requests cannot take the whole
+    pool and wait on each other. Uncommitted writes are left alone.
+    """
+    if db.in_transaction() and not has_pending_writes(db.sync_session):
+        await db.commit()
+
+
+class AsyncService(Generic[S]):
+    """Exposes every method of ``service_class`` as a coroutine.
+
+    ``await AsyncExpenseService(db).get_expense(1)`` runs
+    ``ExpenseService(session).get_expense(1)`` on the session's connection.
+    """
+
+    service_class: type[S]
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def run(self, fn: Callable[[S], T]) -> T:
+        """Call ``fn`` with a synchronous service bound to this session."""
+        async with session_lock(self.db):
+            result = await self.db.run_sync(lambda session: fn(self.service_class(session)))
+            await end_read_transaction(self.db)
+            return result
+
+    def __getattr__(self, name: str) -> Callable[..., Any]:
+        if name.startswith("_") or not callable(getattr(self.service_class, name, None)):
+            raise AttributeError(f"{self.service_class.__name__} has no method {name!r}")
+
+        async def call(*args, **kwargs):
+            return await self.run(lambda service: getattr(service, name)(*args, **kwargs))
+
+        call.__name__ = name
+        return call
+
+
+class AsyncExpenseService(AsyncService[ExpenseService]):
+    service_class = ExpenseService
+
+
+class AsyncCategoryService(AsyncService[CategoryService]):
+    service_class = CategoryService
+
+
+class AsyncIncomeService(AsyncService[IncomeService]):
+    service_class = IncomeService
+
+
+class AsyncInvestmentService(AsyncService[InvestmentService]):
+    service_class = InvestmentService
+
+
+class AsyncDashboardService(AsyncService[DashboardService]):
+    service_class = DashboardService
+
+    async def get_summary(
+        self,
+        month: str | None = None,
+        fields: Iterable[str] | None = None,
+        converter: CurrencyConverter | None = None,
+    ) -> dict:
+        """Dashboard summary with its sections computed concurrently.
+
+        Each section runs on its own short-lived session, so the request
+        takes as long as the slowest section rather than the sum of all.
+        Disabled by ``MYMONEY_DASHBOARD_CONCURRENT_SECTIONS=false``.
+        Amounts are converted to the main currency (``converter`` defaults
+        to :func:`load_converter`).
+
+        The request session's read transaction is ended first, so the
+        request does not hold a connection while its sections wait for
+        theirs, and the sections of all requests together take at most the pool's
+        persistent connections (see :func:`section_slots`).
+        """
+        converter = converter or await load_converter(self.db)
+        sections = sections_for(fields)
+        if not settings.dashboard_concurrent_sections or len(sections) <= 1:
+            async with session_lock(self.db):
+                return await self.db.run_sync(
+                    lambda session: DashboardService(session, converter).get_summary(month, fields)
+                )
+
+        async with session_lock(self.db):
+            await end_read_transaction(self.db)
+
+        year, mon = DashboardService.resolve_month(month)
+        read_sessions = async_sessionmaker(self.db.bind, expire_on_commit=False)
+        slots = section_slots(self.db.bind.sync_engine.pool)
+
+        async def compute(section: str) -> dict:
+            async with slots, read_sessions() as db:
+                return await db.run_sync(
+                    lambda session: DashboardService(session, converter).compute_section(
+                        section, year, mon
+                    )
+                )
+
+        summary: dict = {}
+        for part in await asyncio.gather(*(compute(section) for section in sections)):
+            summary.update(part)
+        return summary
+
+
+def section_slots(pool: Pool) -> asyncio.Semaphore:
+    """Semaphore bounding the dashboard sections computed at once on ``pool``.
+
+    Sized to the pool's persistent connections; the overflow stays free for
+    request sessions, so sections and requests cannot starve each other.
+    """
+    slots = _section_slots.setdefault(asyncio.get_running_loop(), {})
+    if pool not in slots:
+        size = pool.size() if isinstance(pool, QueuePool) else len(SECTIONS)
+        slots[pool] = asyncio.Semaphore(max(1, size))
+    return slots[pool]
+
+
+class AsyncSettingsService(AsyncService[SettingsService]):
+    service_class = SettingsService
+
+
+class AsyncForecastService(AsyncService[ForecastService]):
+    service_class = ForecastService
+
+
+async def load_converter(db: AsyncSession) -> CurrencyConverter:
+    """Converter into the user's main currency, with rates fetched once.
+
+    ``db`` is the request session; only its engine is used.
+
+    If no rates can be had, the converter only converts amounts already in
+    the main currency; the others are left out of converted totals.
+    """
+    # A short-lived session of its own: the request's connection is not
+    # taken, and the settings read does not hold one while rates are fetched
+    async with async_sessionmaker(db.bind, expire_on_commit=False)() as session:
+        main_currency = (await AsyncSettingsService(session).get_settings()).main_currency
+    try:
+        rates, fetched_at = await get_exchange_rates(db.bind).rates_for(main_currency)
+    except Exception:
+        logger.exception("exchange rates unavailable for %s", main_currency)
+        return CurrencyConverter(main_currency)
+    return CurrencyConverter(main_currency, rates, fetched_at)
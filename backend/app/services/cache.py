@@ -0,0 +1,147 @@
+"""In-process result caches invalidated by committed writes.
+
+Every commit that flushed or ran ORM bulk statements bumps a per-table
+version counter in the ``table_versions`` table, inside the same
+transaction. Caches fold the versions of the tables they read into their
+keys, so an entry simply stops matching once one of those tables changes.
+Each worker keeps its own caches, but the counters live in the database:
+writes from other workers and from the CLI commands invalidate them too,
+at the cost of one primary-key read per lookup.
+"""
+
+import threading
+from collections import OrderedDict
+from collections.abc import Hashable
+from itertools import chain
+from typing import Any
+
+from sqlalchemy import event, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.models.table_version import TableVersion
+
+_WRITTEN_TABLES = "written_tables"
+
+version_table = TableVersion.__table__
+
+_caches: list["LRUCache"] = []
+
+
+class LRUCache:
+    """Thread-safe LRU mapping with hit/miss counters."""
+
+    def __init__(self, maxsize: int = 128, name: str | None = None):
+        self.maxsize = maxsize
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[Hashable, Any] = OrderedDict()
+        self._lock = threading.Lock()
+        _caches.append(self)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+def table_versions(session: Session, *tables: str) -> tuple[int, ...]:
+    """Current write versions for ``tables``, for use in cache keys.
+
+    Read them before the cached data: a write committed in between then
+    only makes the entry miss, never serves older data under a newer key.
+    """
+    versions = dict(
+        session.execute(
+            select(version_table.c.table_name, version_table.c.version).where(
+                version_table.c.table_name.in_(tables)
+            )
+        ).all()
+    )
+    return tuple(versions.get(table, 0) for table in tables)
+
+
+def bump_versions(session: Session, *tables: str) -> None:
+    """Increment the versions of ``tables`` in ``session``'s transaction."""
+    stmt = sqlite_insert(version_table).on_conflict_do_update(
+        index_elements=["table_name"], set_={"version": version_table.c.version + 1}
+    )
+    # On the connection, so the bump is not itself tracked as a write
+    session.connection().execute(stmt, [{"table_name": t, "version": 1} for t in sorted(tables)])
+
+
+def has_pending_writes(session: Session) -> bool:
+    """Whether ``session`` holds writes that are not committed yet.
+
+    Results read inside such a transaction must not be cached: they may
+    include rows that are later rolled back.
+    """
+    return bool(
+        session.new or session.dirty or session.deleted or session.info.get(_WRITTEN_TABLES)
+    )
+
+
+def cache_stats() -> dict[str, dict]:
+    """Stats of every named cache, keyed by name."""
+    return {cache.name: cache.stats() for cache in _caches if cache.name}
+
+
+def reset_caches() -> None:
+    """Drop every cached entry (used by tests)."""
+    for cache in _caches:
+        cache.clear()
+
+
+@event.listens_for(Session, "after_flush")
+def _track_flushed_tables(session, flush_context):
+    written = session.info.setdefault(_WRITTEN_TABLES, set())
+    for obj in chain(session.new, session.dirty, session.deleted):
+        written.add(obj.__table__.name)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_bulk_statements(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        written = orm_execute_state.session.info.setdefault(_WRITTEN_TABLES, set())
+        written.add(orm_execute_state.statement.table.name)
+
+
+@event.listens_for(Session, "before_commit")
+def _bump_written_tables(session):
+    # Flush first so the tables written by the commit's own flush are known
+    session.flush()
+    written = session.info.pop(_WRITTEN_TABLES, None)
+    if written:
+        bump_versions(session, *written)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back_tables(session):
+    session.info.pop(_WRITTEN_TABLES, None)
@@ -0,0 +1,87 @@
+"""Conversion of per-currency totals into the user's main currency.
+
+Rates are looked up once per request (see ``load_converter`` in
+``async_services``) and applied to totals that SQL has already grouped by
+currency, so converting costs the same however many rows were summed.
+Currencies are free text on assets and incomes, so some may have no rate:
+their amounts are left out of converted totals and reported with a
+``None`` converted amount instead of failing the whole result.
+"""
+
+from collections.abc import Mapping
+from datetime import datetime
+from decimal import Decimal
+
+_CENTS = Decimal("0.01")
+
+
+class CurrencyConverter:
+    """Converts amounts into ``target`` with a fixed set of rates.
+
+    ``rates`` are units of each currency per one unit of ``target``, as
+    returned by ``ExchangeRates.rates_for(target)``.
+    """
+
+    def __init__(
+        self,
+        target: str,
+        rates: Mapping[str, Decimal] | None = None,
+        as_of: datetime | None = None,
+    ):
+        self.target = target
+        self.rates = {**(rates or {}), target: Decimal("1")}
+        self.as_of = as_of
+
+    @property
+    def cache_key(self) -> tuple:
+        """Identifies the target and rates, for keys of cached converted results."""
+        return self.target, self.as_of
+
+    def convert(self, amount: Decimal, currency: str) -> Decimal | None:
+        """``amount`` in ``currency`` expressed in the target currency.
+
+        None when there is no rate for ``currency``.
+        """
+        if currency == self.target:
+            return amount
+        rate = self.rates.get(currency)
+        if rate is None:
+            return None
+        return (amount / rate).quantize(_CENTS)
+
+    def total(self, amounts: Mapping[str, Decimal]) -> Decimal:
+        """Sum of per-currency ``amounts`` in the target currency.
+
+        Currencies without a rate are left out; :meth:`breakdown` lists them.
+        """
+        converted = (self.convert(amount, currency) for currency, amount in amounts.items())
+        return sum((amount for amount in converted if amount is not None), Decimal("0"))
+
+    def breakdown(self, amounts: Mapping[str, Decimal]) -> list[dict]:
+        """Native and converted amount per currency, largest converted first.
+
+        Currencies without a rate come last, with a ``None`` converted amount.
+        """
+        rows = [
+            {
+                "currency": currency,
+                "amount": amount,
+                "converted_amount": self.convert(amount, currency),
+            }
+            for currency, amount in amounts.items()
+        ]
+        return sorted(
+            rows,
+            key=lambda row: (row["converted_amount"] is not None, row["converted_amount"] or 0),
+            reverse=True,
+        )
+
+
+class PassthroughConverter(CurrencyConverter):
+    """Adds amounts in any currency as-is, for callers without rates at hand."""
+
+    def __init__(self):
+        super().__init__(target="")
+
+    def convert(self, amount: Decimal, currency: str) -> Decimal:
+        return amount
@@ -1,36 +1,201 @@
+import logging
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Iterable
 from datetime import date, datetime
 from decimal import Decimal
 
-from sqlalchemy import func, extract
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session
 
-from app.models.asset import Asset
-from app.models.category import Category
 from app.models.expense import Expense
-from app.models.portfolio import Portfolio
+from app.services.cache import LRUCache, has_pending_writes, table_versions
+from app.services.currency import CurrencyConverter, PassthroughConverter
 from app.services.investment_service import InvestmentService
 from app.services.income_service import IncomeService
+from app.services.periods import month_key, shift_month
+from app.services.rollup_service import RollupService
+
+
+logger = logging.getLogger(__name__)
+
+# Independent parts of the dashboard and the summary fields each produces.
+# A section only reads what it needs, so sections can run on separate
+# sessions concurrently (see AsyncDashboardService).
+SECTIONS: dict[str, tuple[str, ...]] = {
+    "expenses": (
+        "total_expenses_this_month",
+        "total_expenses_last_month",
+        "expense_change_percent",
+        "monthly_expense_trend",
+    ),
+    "portfolio": (
+        "total_portfolio_value",
+        "total_portfolio_cost",
+        "net_worth",
+        "portfolio_allocation",
+        "portfolio_value_by_currency",
+    ),
+    "top_categories": ("top_categories",),
+    "recent_expenses": ("recent_expenses",),
+    "income": (
+        "total_monthly_income",
+        "income_streams_count",
+        "monthly_income_by_currency",
+        "monthly_income_by_type",
+    ),
+}
+
+# Tables each section reads; a committed write to any of them invalidates
+# the section's cached result. Only some sections depend on the month.
+SECTION_TABLES: dict[str, tuple[str, ...]] = {
+    "expenses": ("expenses", "monthly_category_rollup"),
+    "portfolio": ("assets", "portfolios"),
+    "top_categories": ("expenses", "categories", "monthly_category_rollup"),
+    "recent_expenses": ("expenses", "categories"),
+    "income": ("incomes",),
+}
+_MONTHLY_SECTIONS = {"expenses", "top_categories"}
+# Sections that depend on today's date, e.g. to leave out upcoming bills
+_DAILY_SECTIONS = {"recent_expenses"}
+# Sections holding amounts converted to the main currency; their cached
+# results also depend on the target currency and the rates used.
+_CONVERTED_SECTIONS = {"portfolio", "income"}
+
+_section_cache = LRUCache(maxsize=512, name="dashboard_sections")
+
+
+def sections_for(fields: Iterable[str] | None) -> list[str]:
+    """Sections needed to produce ``fields`` (summary keys); all of them for None."""
+    if fields is None:
+        return list(SECTIONS)
+    wanted = set(fields)
+    return [section for section, produced in SECTIONS.items() if wanted.intersection(produced)]
+
+
+def converts_amounts(fields: Iterable[str] | None) -> bool:
+    """Whether producing ``fields`` converts amounts to the main currency."""
+    return not _CONVERTED_SECTIONS.isdisjoint(sections_for(fields))
+
+
+_timings_lock = threading.Lock()
+_section_timings: dict[str, dict] = {}
+
+
+def record_section_timing(section: str, seconds: float) -> None:
+    elapsed_ms = seconds * 1000
+    logger.debug("dashboard section %s took %.2f ms", section, elapsed_ms)
+    with _timings_lock:
+        stats = _section_timings.setdefault(
+            section, {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "last_ms": 0.0}
+        )
+        stats["count"] += 1
+        stats["total_ms"] += elapsed_ms
+        stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+        stats["last_ms"] = elapsed_ms
+
+
+def section_timings() -> dict[str, dict]:
+    """Per-section timing counters since process start."""
+    with _timings_lock:
+        return {
+            section: {
+                "count": stats["count"],
+                "avg_ms": round(stats["total_ms"] / stats["count"], 2),
+                "max_ms": round(stats["max_ms"], 2),
+                "last_ms": round(stats["last_ms"], 2),
+            }
+            for section, stats in _section_timings.items()
+        }
 
 
 class DashboardService:
-    def __init__(self, db: Session):
+    """Dashboard summary; amounts in several currencies are converted with ``converter``.
+
+    Without a converter, amounts in different currencies are added as-is.
+    """
+
+    def __init__(self, db: Session, converter: CurrencyConverter | None = None):
         self.db = db
+        self.converter = converter or PassthroughConverter()
+
+    def get_summary(self, month: str | None = None, fields: Iterable[str] | None = None) -> dict:
+        """Dashboard summary for ``month`` ("YYYY-MM", default: current month).
 
-    def get_summary(self, month: str | None = None) -> dict:
+        When ``fields`` is given, only the sections producing those keys are
+        computed and the result holds just their keys.
+        """
+        year, mon = self.resolve_month(month)
+        sections = sections_for(fields)
+        versions = None
+        if not has_pending_writes(self.db):
+            # The versions of every table the sections read, in one query
+            tables = sorted({table for section in sections for table in SECTION_TABLES[section]})
+            versions = dict(zip(tables, table_versions(self.db, *tables)))
+        summary: dict = {}
+        for section in sections:
+            summary.update(self.compute_section(section, year, mon, versions))
+        return summary
+
+    @staticmethod
+    def resolve_month(month: str | None) -> tuple[int, int]:
         if month:
             year, mon = map(int, month.split("-"))
-        else:
-            today = date.today()
-            year, mon = today.year, today.month
+            return year, mon
+        today = date.today()
+        return today.year, today.month
 
-        # Calculate previous month
-        if mon == 1:
-            prev_year, prev_mon = year - 1, 12
-        else:
-            prev_year, prev_mon = year, mon - 1
+    def compute_section(
+        self, section: str, year: int, month: int, versions: dict[str, int] | None = None
+    ) -> dict:
+        """One entry of :data:`SECTIONS`, served from cache when its tables are unchanged.
 
-        total_this_month = self._total_expenses_for_month(year, mon)
-        total_last_month = self._total_expenses_for_month(prev_year, prev_mon)
+        ``versions`` are table versions the caller already read; otherwise
+        the section reads its own.
+        """
+        # Uncommitted writes in this session are invisible to other readers
+        cacheable = not has_pending_writes(self.db)
+        if cacheable:
+            tables = SECTION_TABLES[section]
+            if versions is None:
+                section_versions = table_versions(self.db, *tables)
+            else:
+                section_versions = tuple(versions[table] for table in tables)
+            period = None
+            if section in _MONTHLY_SECTIONS:
+                period = (year, month)
+            elif section in _DAILY_SECTIONS:
+                period = date.today()
+            key = (section, period, section_versions)
+            if section in _CONVERTED_SECTIONS:
+                key += self.converter.cache_key
+            cached = _section_cache.get(key)
+            if cached is not None:
+                return cached
+
+        started = time.perf_counter()
+        result = getattr(self, f"_{section}_section")(year, month)
+        record_section_timing(section, time.perf_counter() - started)
+
+        if cacheable:
+            self._detach(result)
+            _section_cache.set(key, result)
+        return result
+
+    def _detach(self, result: dict) -> None:
+        """Expunge ORM objects in ``result`` so the cached copy outlives this session."""
+        objects = [c["category"] for c in result.get("top_categories", [])]
+        objects += result.get("recent_expenses", [])
+        for obj in objects:
+            if obj in self.db:
+                self.db.expunge(obj)
+
+    def _expenses_section(self, year: int, month: int) -> dict:
+        # One rollup query covers the whole trend window; this/last month are
+        # read from the same result set instead of being queried separately.
+        monthly_trend = self._monthly_expense_trend(year, month)
+        total_this_month = monthly_trend[-1]["total_amount"]
+        total_last_month = monthly_trend[-2]["total_amount"]
 
         expense_change_percent = None
         if total_last_month > 0:
@@ -38,83 +203,91 @@ class DashboardService:
                 (total_this_month - total_last_month) / total_last_month * 100
             )
 
-        # Portfolio totals
-        portfolio_value, portfolio_cost = self._portfolio_totals()
+        return {
+            "total_expenses_this_month": total_this_month,
+            "total_expenses_last_month": total_last_month,
+            "expense_change_percent": expense_change_percent,
+            "monthly_expense_trend": monthly_trend,
+        }
 
-        # Net worth = portfolio value - total expenses (lifetime) ... or just portfolio value
-        # More meaningful: net worth = portfolio value
-        net_worth = portfolio_value
+    def _portfolio_section(self, year: int, month: int) -> dict:
+        # One aggregate grouped by type and currency yields the allocation,
+        # the totals and the currency breakdown; only its rows are converted.
+        rows = InvestmentService(self.db).valuation_by_type_and_currency()
 
-        top_categories = self._top_categories(year, mon)
-        recent_expenses = self._recent_expenses()
-        portfolio_allocation = self._portfolio_allocation()
-        monthly_trend = self._monthly_expense_trend(year, mon)
+        by_type: dict[str, dict] = {}
+        native_by_currency: dict[str, Decimal] = defaultdict(Decimal)
+        for row in rows:
+            totals = by_type.setdefault(
+                row["asset_type"],
+                {
+                    "asset_type": row["asset_type"],
+                    "total_value": Decimal("0"),
+                    "total_cost": Decimal("0"),
+                },
+            )
+            # Currencies without a rate only show up in the currency breakdown
+            totals["total_value"] += self.converter.total({row["currency"]: row["total_value"]})
+            totals["total_cost"] += self.converter.total({row["currency"]: row["total_cost"]})
+            native_by_currency[row["currency"]] += row["total_value"]
 
-        # Income totals
-        income_service = IncomeService(self.db)
-        total_monthly_income = income_service.get_total_monthly_income()
-        income_streams_count = income_service.get_active_income_count()
+        allocation = sorted(by_type.values(), key=lambda row: row["total_value"], reverse=True)
+        portfolio_value = sum((row["total_value"] for row in allocation), Decimal("0"))
+        portfolio_cost = sum((row["total_cost"] for row in allocation), Decimal("0"))
 
+        # Net worth = portfolio value - total expenses (lifetime) ... or just portfolio value
+        # More meaningful: net worth = portfolio value
         return {
-            "total_expenses_this_month": total_this_month,
-            "total_expenses_last_month": total_last_month,
-            "expense_change_percent": expense_change_percent,
             "total_portfolio_value": portfolio_value,
             "total_portfolio_cost": portfolio_cost,
-            "net_worth": net_worth,
-            "total_monthly_income": total_monthly_income,
-            "income_streams_count": income_streams_count,
-            "top_categories": top_categories,
-            "recent_expenses": recent_expenses,
-            "portfolio_allocation": portfolio_allocation,
-            "monthly_expense_trend": monthly_trend,
+            "net_worth": portfolio_value,
+            "portfolio_allocation": self._portfolio_allocation(allocation, portfolio_value),
+            "portfolio_value_by_currency": self.converter.breakdown(native_by_currency),
         }
 
-    def _total_expenses_for_month(self, year: int, month: int) -> Decimal:
-        result = (
-            self.db.query(func.coalesce(func.sum(Expense.amount), 0))
-            .filter(extract("year", Expense.date) == year)
-            .filter(extract("month", Expense.date) == month)
-            .scalar()
-        )
-        return Decimal(str(result))
+    def _top_categories_section(self, year: int, month: int) -> dict:
+        return {"top_categories": self._top_categories(year, month)}
 
-    def _portfolio_totals(self) -> tuple[Decimal, Decimal]:
-        portfolios = (
-            self.db.query(Portfolio).options(joinedload(Portfolio.assets)).all()
-        )
-        total_value = Decimal("0")
-        total_cost = Decimal("0")
-        for p in portfolios:
-            totals = InvestmentService.compute_portfolio_totals(p)
-            total_value += totals["total_value"]
-            total_cost += totals["total_cost"]
-        return total_value, total_cost
+    def _recent_expenses_section(self, year: int, month: int) -> dict:
+        return {"recent_expenses": self._recent_expenses()}
 
-    def _top_categories(self, year: int, month: int, limit: int = 5) -> list[dict]:
-        results = (
-            self.db.query(
-                Category,
-                func.sum(Expense.amount).label("total"),
-                func.count(Expense.id).label("count"),
+    def _income_section(self, year: int, month: int) -> dict:
+        # One aggregate grouped by type and currency yields the total, the
+        # stream count and both breakdowns.
+        groups = IncomeService(self.db).active_income_breakdown()
+
+        by_type: dict[str, dict] = {}
+        native_by_currency: dict[str, Decimal] = defaultdict(Decimal)
+        for group in groups:
+            totals = by_type.setdefault(
+                group["income_type"],
+                {"income_type": group["income_type"], "total_amount": Decimal("0"), "count": 0},
             )
-            .join(Expense, Expense.category_id == Category.id)
-            .filter(extract("year", Expense.date) == year)
-            .filter(extract("month", Expense.date) == month)
-            .group_by(Category.id)
-            .order_by(func.sum(Expense.amount).desc())
-            .limit(limit)
-            .all()
-        )
+            totals["total_amount"] += self.converter.total(
+                {group["currency"]: group["total_amount"]}
+            )
+            totals["count"] += group["stream_count"]
+            native_by_currency[group["currency"]] += group["total_amount"]
 
-        grand_total = sum(Decimal(str(r.total)) for r in results) or Decimal("1")
+        total = self.converter.total(native_by_currency)
+        return {
+            "total_monthly_income": total,
+            "income_streams_count": sum(group["stream_count"] for group in groups),
+            "monthly_income_by_currency": self.converter.breakdown(native_by_currency),
+            "monthly_income_by_type": self._income_by_type(by_type.values(), total),
+        }
+
+    def _top_categories(self, year: int, month: int, limit: int = 5) -> list[dict]:
+        results = RollupService(self.db).category_summaries(month_key(year, month), limit)
+
+        grand_total = sum(r["total_amount"] for r in results) or Decimal("1")
 
         return [
             {
-                "category": r[0],
-                "total_amount": Decimal(str(r.total)),
-                "percentage": Decimal(str(r.total)) / grand_total * 100,
-                "transaction_count": r.count,
+                "category": r["category"],
+                "total_amount": r["total_amount"],
+                "percentage": r["total_amount"] / grand_total * 100,
+                "transaction_count": r["total_count"],
             }
             for r in results
         ]
@@ -122,45 +295,33 @@ class DashboardService:
     def _recent_expenses(self, limit: int = 5) -> list[Expense]:
         return (
             self.db.query(Expense)
-            .options(joinedload(Expense.category))
+            # Generated occurrences of recurring expenses are not recent yet
+            .filter(Expense.date <= date.today())
             .order_by(Expense.date.desc(), Expense.created_at.desc())
             .limit(limit)
             .all()
         )
 
-    def _portfolio_allocation(self) -> list[dict]:
-        assets = self.db.query(Asset).all()
-        allocation: dict[str, Decimal] = {}
-
-        for asset in assets:
-            value = InvestmentService.compute_asset_current_value(asset)
-            if value is None:
-                value = InvestmentService.compute_asset_total_cost(asset)
-            asset_type = asset.asset_type
-            allocation[asset_type] = allocation.get(asset_type, Decimal("0")) + value
-
-        total = sum(allocation.values()) or Decimal("1")
-
+    def _portfolio_allocation(self, by_type: list[dict], total: Decimal) -> list[dict]:
+        total = total or Decimal("1")
         return [
             {
-                "asset_type": atype,
-                "total_value": aval,
-                "percentage": aval / total * 100,
+                "asset_type": row["asset_type"],
+                "total_value": row["total_value"],
+                "percentage": row["total_value"] / total * 100,
             }
-            for atype, aval in sorted(allocation.items(), key=lambda x: x[1], reverse=True)
+            for row in by_type
         ]
 
+    def _income_by_type(self, by_type: Iterable[dict], total: Decimal) -> list[dict]:
+        total = total or Decimal("1")
+        rows = [{**row, "percentage": row["total_amount"] / total * 100} for row in by_type]
+        return sorted(rows, key=lambda row: row["total_amount"], reverse=True)
+
     def _monthly_expense_trend(self, year: int, month: int, months_back: int = 6) -> list[dict]:
-        trend = []
-        y, m = year, month
-        for _ in range(months_back):
-            total = self._total_expenses_for_month(y, m)
-            trend.append({"month": f"{y:04d}-{m:02d}", "total_amount": total})
-            if m == 1:
-                y -= 1
-                m = 12
-            else:
-                m -= 1
+        months = [shift_month(year, month, -offset) for offset in range(months_back - 1, -1, -1)]
+        keys = [month_key(y, m) for y, m in months]
+        totals = RollupService(self.db).monthly_totals(keys[0], keys[-1])
+
+        return [{"month": key, "total_amount": totals.get(key, Decimal("0"))} for key in keys]
 
-        trend.reverse()
-        return trend
@@ -0,0 +1,211 @@
+"""Exchange rates with an in-process TTL cache and a persistent copy.
+
+Rates are fetched from a pluggable provider for a single pivot currency and
+stored in the ``exchange_rates`` table; rates for any other base are cross
+rates derived from the pivot's. A request is answered from the in-process
+cache while it is fresh, then from the table, and only reaches the provider
+once per TTL. Concurrent callers that miss the cache share one refresh.
+When the provider fails, the last stored rates keep being served.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections.abc import Callable
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import Protocol
+from weakref import WeakKeyDictionary
+
+import httpx
+from sqlalchemy import delete, insert
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import async_engine
+from app.models.exchange_rate import ExchangeRate
+
+logger = logging.getLogger(__name__)
+
+_RATE_PLACES = Decimal("0.00000001")
+# How long to wait before asking a failing provider again
+_RETRY_AFTER = 60
+
+
+class RateProvider(Protocol):
+    async def fetch(self, base: str) -> dict[str, Decimal]:
+        """Units of each currency per one unit of ``base``, ``base`` included."""
+        ...
+
+
+class FileRateProvider:
+    """Serves rates from a JSON file, for offline use and tests.
+
+    The file holds ``{"base": "USD", "rates": {"EUR": 0.92, ...}}``; rates
+    for other bases are derived from it.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+
+    async def fetch(self, base: str) -> dict[str, Decimal]:
+        data = json.loads(await asyncio.to_thread(self.path.read_text))
+        return cross_rates(_parse_rates(data["base"], data["rates"]), base)
+
+
+class HttpRateProvider:
+    """Fetches rates from an HTTP API answering ``{"rates": {...}}``.
+
+    ``url`` is formatted with ``base``, e.g. the Frankfurter API's
+    ``https://api.frankfurter.app/latest?from={base}``.
+    """
+
+    def __init__(self, url: str, timeout: float = 10.0):
+        self.url = url
+        self.timeout = timeout
+
+    async def fetch(self, base: str) -> dict[str, Decimal]:
+        async with httpx.AsyncClient(timeout=self.timeout) as client:
+            response = await client.get(self.url.format(base=base))
+            response.raise_for_status()
+        return _parse_rates(base, response.json()["rates"])
+
+
+def cross_rates(rates: dict[str, Decimal], base: str) -> dict[str, Decimal]:
+    """Re-express ``rates`` (all relative to one currency) relative to ``base``."""
+    if base not in rates:
+        raise ValueError(f"No exchange rate for currency: {base}")
+    divisor = rates[base]
+    return {currency: (rate / divisor).quantize(_RATE_PLACES) for currency, rate in rates.items()}
+
+
+def _parse_rates(base: str, raw: dict) -> dict[str, Decimal]:
+    rates = {currency: Decimal(str(rate)) for currency, rate in raw.items()}
+    rates[base] = Decimal("1")
+    return rates
+
+
+class ExchangeRateService:
+    """Reads and replaces the stored rates of a base currency."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def stored_rates(self, base: str) -> tuple[dict[str, Decimal], datetime | None]:
+        rows = self.db.query(ExchangeRate).filter(ExchangeRate.base == base).all()
+        if not rows:
+            return {}, None
+        return {row.currency: row.rate for row in rows}, min(row.fetched_at for row in rows)
+
+    def store_rates(self, base: str, rates: dict[str, Decimal], fetched_at: datetime) -> None:
+        self.db.execute(delete(ExchangeRate).where(ExchangeRate.base == base))
+        self.db.execute(
+            insert(ExchangeRate),
+            [
+                {"base": base, "currency": currency, "rate": rate, "fetched_at": fetched_at}
+                for currency, rate in rates.items()
+            ],
+        )
+        self.db.commit()
+
+
+class ExchangeRates:
+    """Cached access to exchange rates for any base currency."""
+
+    def __init__(
+        self,
+        provider: RateProvider,
+        session_factory: Callable[[], AsyncSession],
+        pivot: str = "USD",
+        ttl: float = 3600,
+    ):
+        self.provider = provider
+        self.session_factory = session_factory
+        self.pivot = pivot
+        self.ttl = ttl
+        self._cached: tuple[float, dict[str, Decimal], datetime] | None = None
+        self._refresh_task: asyncio.Task | None = None
+
+    async def rates_for(self, base: str) -> tuple[dict[str, Decimal], datetime]:
+        """Rates relative to ``base`` and when they were fetched.
+
+        Raises ``ValueError`` for a currency the provider has no rate for.
+        """
+        rates, fetched_at = await self._pivot_rates()
+        return cross_rates(rates, base), fetched_at
+
+    def clear(self) -> None:
+        """Forget the in-process copy; the next call reads the table again."""
+        self._cached = None
+
+    async def _pivot_rates(self) -> tuple[dict[str, Decimal], datetime]:
+        if self._cached and self._cached[0] > time.monotonic():
+            return self._cached[1], self._cached[2]
+
+        task = self._refresh_task
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = self._refresh_task = asyncio.ensure_future(self._refresh())
+            task.add_done_callback(self._refresh_done)
+        # Shielded so one caller going away does not cancel the others' fetch
+        return await asyncio.shield(task)
+
+    def _refresh_done(self, task: asyncio.Task) -> None:
+        if self._refresh_task is task:
+            self._refresh_task = None
+
+    async def _refresh(self) -> tuple[dict[str, Decimal], datetime]:
+        async with self.session_factory() as db:
+            rates, fetched_at = await db.run_sync(
+                lambda session: ExchangeRateService(session).stored_rates(self.pivot)
+            )
+            age = (datetime.utcnow() - fetched_at).total_seconds() if fetched_at else None
+            if age is not None and age < self.ttl:
+                keep_for = self.ttl - age
+            else:
+                try:
+                    rates = await self.provider.fetch(self.pivot)
+                except (httpx.HTTPError, OSError, KeyError, ValueError) as exc:
+                    if not rates:
+                        raise
+                    logger.warning(
+                        "exchange rate refresh failed, serving rates from %s: %s", fetched_at, exc
+                    )
+                    keep_for = min(self.ttl, _RETRY_AFTER)
+                else:
+                    fetched_at = datetime.utcnow()
+                    await db.run_sync(
+                        lambda session: ExchangeRateService(session).store_rates(
+                            self.pivot, rates, fetched_at
+                        )
+                    )
+                    keep_for = self.ttl
+
+        self._cached = (time.monotonic() + keep_for, rates, fetched_at)
+        return rates, fetched_at
+
+
+_instances: "WeakKeyDictionary[AsyncEngine, ExchangeRates]" = WeakKeyDictionary()
+
+
+def get_exchange_rates(bind: AsyncEngine | None = None) -> ExchangeRates:
+    """The :class:`ExchangeRates` storing its rates through ``bind``.
+
+    One instance per engine (the application's by default), configured
+    from settings, so its cache and stored rates match that database.
+    """
+    bind = bind or async_engine
+    if bind not in _instances:
+        if settings.exchange_rate_provider == "http":
+            provider: RateProvider = HttpRateProvider(settings.exchange_rate_url)
+        else:
+            provider = FileRateProvider(settings.exchange_rate_file)
+        _instances[bind] = ExchangeRates(
+            provider,
+            async_sessionmaker(bind, expire_on_commit=False),
+            pivot=settings.exchange_rate_pivot,
+            ttl=settings.exchange_rate_ttl,
+        )
+    return _instances[bind]
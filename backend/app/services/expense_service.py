@@ -1,11 +1,26 @@
+import re
 from datetime import date, datetime
 from decimal import Decimal
 
-from sqlalchemy import extract, func, or_
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import case, func, literal_column, or_, select, tuple_
+from sqlalchemy.orm import Session
 
 from app.models.category import Category
-from app.models.expense import Expense
+from app.models.expense import Expense, expenses_fts
+from app.services.cache import LRUCache, has_pending_writes, table_versions
+from app.services.pagination import decode_cursor, encode_cursor
+from app.services.periods import month_key
+from app.services.recurrence_service import RecurrenceService
+from app.services.rollup_service import RollupService
+
+# Total counts per filter signature; keyed on the expenses table version so
+# any committed expense write invalidates them.
+_count_cache = LRUCache(maxsize=256, name="expense_counts")
+
+# Changing any of these on a recurring expense regenerates its future occurrences
+_SERIES_FIELDS = {
+    "amount", "description", "notes", "date", "category_id", "is_recurring", "recurrence_rule"
+}
 
 
 class ExpenseService:
@@ -23,64 +38,216 @@ class ExpenseService:
         is_recurring: bool | None = None,
         is_paid: bool | None = None,
         search: str | None = None,
+        occurrences_until=None,
         sort_by: str = "date",
         sort_direction: str = "desc",
         limit: int = 20,
         offset: int = 0,
+        after: str | None = None,
+        include_total: bool = True,
     ):
-        query = self.db.query(Expense).options(joinedload(Expense.category))
+        """List expenses with offset or keyset pagination.
+
+        When ``after`` is given (a cursor from :meth:`cursor_for`), the page
+        starts right after that row by seeking on the ``(sort column, id)``
+        index instead of skipping ``offset`` rows. ``has_more`` comes from
+        reading one extra row; the total is only counted when
+        ``include_total`` is set and is ``None`` otherwise. Generated
+        occurrences of recurring expenses dated after ``occurrences_until``
+        are left out.
+        """
+        filters = {
+            "category_id": category_id,
+            "start_date": start_date,
+            "end_date": end_date,
+            "min_amount": min_amount,
+            "max_amount": max_amount,
+            "is_recurring": is_recurring,
+            "is_paid": is_paid,
+            "search": search,
+            "occurrences_until": occurrences_until,
+        }
+        query = self.db.query(Expense)
+
+        fts_query = self._fts_query(search) if search else None
+        if sort_by == "relevance" and fts_query is not None:
+            if after is not None:
+                raise ValueError("Cursor pagination is not available when sorting by relevance")
+            # Join the ranked FTS matches and order by bm25 (lower is better)
+            ranked = (
+                select(expenses_fts.c.rowid, expenses_fts.c.rank)
+                .where(literal_column("expenses_fts").op("MATCH")(fts_query))
+                .subquery()
+            )
+            query = query.join(ranked, ranked.c.rowid == Expense.id).filter(
+                *self._filter_criteria(**{**filters, "search": None})
+            )
+            items = query.order_by(ranked.c.rank, Expense.id).offset(offset).limit(limit + 1).all()
+            has_more = len(items) > limit
+            total_count = self.count_expenses(**filters) if include_total else None
+            return items[:limit], total_count, has_more
+
+        query = query.filter(*self._filter_criteria(**filters))
+        sort_column = Expense.amount if sort_by == "amount" else Expense.date
+        if after is not None:
+            key = tuple_(sort_column, Expense.id)
+            position = tuple_(*self._decode_cursor(after, sort_by))
+            query = query.filter(key < position if sort_direction == "desc" else key > position)
+
+        if sort_direction == "desc":
+            order = (sort_column.desc(), Expense.id.desc())
+        else:
+            order = (sort_column.asc(), Expense.id.asc())
+
+        query = query.order_by(*order)
+        if after is None:
+            query = query.offset(offset)
+        items = query.limit(limit + 1).all()
+        has_more = len(items) > limit
+
+        total_count = self.count_expenses(**filters) if include_total else None
+        return items[:limit], total_count, has_more
 
+    def count_expenses(self, **filters) -> int:
+        """Count expenses matching ``filters``, cached until expenses change."""
+        # Uncommitted writes in this session are invisible to other readers
+        cacheable = not has_pending_writes(self.db)
+        if cacheable:
+            key = (tuple(sorted(filters.items())), table_versions(self.db, Expense.__tablename__))
+            count = _count_cache.get(key)
+            if count is not None:
+                return count
+        count = (
+            self.db.query(func.count(Expense.id))
+            .filter(*self._filter_criteria(**filters))
+            .scalar()
+        )
+        if cacheable:
+            _count_cache.set(key, count)
+        return count
+
+    @staticmethod
+    def _filter_criteria(
+        *,
+        category_id: int | None = None,
+        start_date=None,
+        end_date=None,
+        min_amount=None,
+        max_amount=None,
+        is_recurring: bool | None = None,
+        is_paid: bool | None = None,
+        search: str | None = None,
+        occurrences_until=None,
+    ) -> list:
+        criteria = []
         if category_id is not None:
-            query = query.filter(Expense.category_id == category_id)
+            criteria.append(Expense.category_id == category_id)
         if start_date is not None:
-            query = query.filter(Expense.date >= start_date)
+            criteria.append(Expense.date >= start_date)
         if end_date is not None:
-            query = query.filter(Expense.date <= end_date)
+            criteria.append(Expense.date <= end_date)
         if min_amount is not None:
-            query = query.filter(Expense.amount >= min_amount)
+            criteria.append(Expense.amount >= min_amount)
         if max_amount is not None:
-            query = query.filter(Expense.amount <= max_amount)
+            criteria.append(Expense.amount <= max_amount)
         if is_recurring is not None:
-            query = query.filter(Expense.is_recurring == is_recurring)
+            criteria.append(Expense.is_recurring == is_recurring)
         if is_paid is not None:
-            query = query.filter(Expense.is_paid == is_paid)
+            criteria.append(Expense.is_paid == is_paid)
+        if occurrences_until is not None:
+            criteria.append(
+                or_(Expense.recurrence_parent_id.is_(None), Expense.date <= occurrences_until)
+            )
         if search:
-            pattern = f"%{search}%"
-            query = query.filter(
-                or_(
-                    Expense.description.ilike(pattern),
-                    Expense.notes.ilike(pattern),
+            fts_query = ExpenseService._fts_query(search)
+            if fts_query is not None:
+                matches = select(expenses_fts.c.rowid).where(
+                    literal_column("expenses_fts").op("MATCH")(fts_query)
                 )
-            )
-
-        total_count = query.count()
+                criteria.append(Expense.id.in_(matches))
+            else:
+                # Nothing indexable (e.g. only punctuation): fall back to a substring scan
+                pattern = f"%{search}%"
+                criteria.append(
+                    or_(
+                        Expense.description.ilike(pattern),
+                        Expense.notes.ilike(pattern),
+                    )
+                )
+        return criteria
 
-        sort_column = Expense.date if sort_by == "date" else Expense.amount
-        if sort_direction == "desc":
-            sort_column = sort_column.desc()
-        else:
-            sort_column = sort_column.asc()
+    @staticmethod
+    def _fts_query(search: str) -> str | None:
+        """Turn free text into an FTS5 query matching every word as a prefix."""
+        words = re.findall(r"\w+", search)
+        if not words:
+            return None
+        return " ".join(f'"{word}"*' for word in words)
 
-        items = query.order_by(sort_column).offset(offset).limit(limit).all()
-        has_more = (offset + limit) < total_count
+    @staticmethod
+    def cursor_for(expense: Expense, sort_by: str = "date") -> str:
+        """Opaque keyset cursor pointing at ``expense`` for the given sort field."""
+        value = expense.amount if sort_by == "amount" else expense.date
+        return encode_cursor(sort_by, value, expense.id)
 
-        return items, total_count, has_more
+    @staticmethod
+    def _decode_cursor(cursor: str, sort_by: str) -> tuple:
+        values = decode_cursor(cursor)
+        if len(values) != 3 or values[0] != sort_by:
+            raise ValueError("Cursor does not match the requested sort order")
+        _, value, expense_id = values
+        try:
+            if sort_by == "amount":
+                return Decimal(value), int(expense_id)
+            return date.fromisoformat(value), int(expense_id)
+        except (TypeError, ValueError, ArithmeticError):
+            raise ValueError("Invalid cursor") from None
 
     def get_expense(self, expense_id: int) -> Expense | None:
-        return (
+        return self.db.query(Expense).filter(Expense.id == expense_id).first()
+
+    def expenses_by_category_ids(
+        self, category_ids: list[int], limit: int = 20, occurrences_until=None
+    ) -> dict[int, list[Expense]]:
+        """The ``limit`` newest expenses of each category, in one ``IN`` query.
+
+        The limit applies per category: rows are numbered within their
+        category by a window function and only the first ``limit`` kept.
+        Generated occurrences dated after ``occurrences_until`` are left
+        out, as in :meth:`list_expenses`.
+        """
+        grouped: dict[int, list[Expense]] = {category_id: [] for category_id in category_ids}
+        newest_first = (Expense.date.desc(), Expense.id.desc())
+        ranked = (
+            select(
+                Expense.id,
+                func.row_number()
+                .over(partition_by=Expense.category_id, order_by=newest_first)
+                .label("position"),
+            )
+            .where(
+                Expense.category_id.in_(category_ids),
+                *self._filter_criteria(occurrences_until=occurrences_until),
+            )
+            .subquery()
+        )
+        expenses = (
             self.db.query(Expense)
-            .options(joinedload(Expense.category))
-            .filter(Expense.id == expense_id)
-            .first()
+            .join(ranked, Expense.id == ranked.c.id)
+            .filter(ranked.c.position <= limit)
+            .order_by(*newest_first)
+            .all()
         )
+        for expense in expenses:
+            grouped[expense.category_id].append(expense)
+        return grouped
 
     def create_expense(self, **kwargs) -> Expense:
         expense = Expense(**kwargs)
+        RecurrenceService(self.db).start_series(expense)
         self.db.add(expense)
         self.db.commit()
         self.db.refresh(expense)
-        # Eager load category
-        self.db.refresh(expense, attribute_names=["category"])
         return expense
 
     def update_expense(self, expense_id: int, **kwargs) -> Expense | None:
@@ -88,20 +255,25 @@ class ExpenseService:
         if not expense:
             return None
 
-        for key, value in kwargs.items():
-            if value is not None:
-                setattr(expense, key, value)
+        changed = {key for key, value in kwargs.items() if value is not None}
+        for key in changed:
+            setattr(expense, key, kwargs[key])
+        if expense.materialized_until and changed & _SERIES_FIELDS:
+            RecurrenceService(self.db).discard_future(expense, date.today())
+        # An expense made recurring by this update starts its series today
+        RecurrenceService(self.db).start_series(expense)
 
         expense.updated_at = datetime.utcnow()
         self.db.commit()
         self.db.refresh(expense)
-        self.db.refresh(expense, attribute_names=["category"])
         return expense
 
     def delete_expense(self, expense_id: int) -> bool:
         expense = self.db.query(Expense).filter(Expense.id == expense_id).first()
         if not expense:
             return False
+        if expense.materialized_until:
+            RecurrenceService(self.db).end_series(expense, date.today())
         self.db.delete(expense)
         self.db.commit()
         return True
@@ -116,37 +288,82 @@ class ExpenseService:
         expense.updated_at = datetime.utcnow()
         self.db.commit()
         self.db.refresh(expense)
-        self.db.refresh(expense, attribute_names=["category"])
         return expense
 
-    def get_expense_summary(self, month: int | None = None, year: int | None = None):
-        """Get expense summary for a given month/year. Defaults to current month."""
-        today = date.today()
-        target_month = month if month is not None else today.month
-        target_year = year if year is not None else today.year
+    def get_expense_summary(
+        self,
+        month: int | None = None,
+        year: int | None = None,
+        *,
+        start_date: date | None = None,
+        end_date: date | None = None,
+        include_categories: bool = False,
+    ):
+        """Get expense summary for a given month/year. Defaults to current month.
 
-        query = self.db.query(Expense).filter(
-            extract("month", Expense.date) == target_month,
-            extract("year", Expense.date) == target_year,
-        )
+        Passing ``start_date`` and/or ``end_date`` (inclusive) summarizes that
+        range instead. With ``include_categories`` the result also carries a
+        per-category breakdown under ``"categories"``, largest total first.
+        """
+        if start_date is None and end_date is None:
+            # Whole months are served from the pre-aggregated rollup
+            today = date.today()
+            target_month = month if month is not None else today.month
+            target_year = year if year is not None else today.year
+            rollup = RollupService(self.db)
+            summary = rollup.month_summary(month_key(target_year, target_month))
+            if include_categories:
+                summary["categories"] = rollup.category_summaries(
+                    month_key(target_year, target_month)
+                )
+            return summary
 
-        expenses = query.all()
+        criteria = []
+        if start_date is not None:
+            criteria.append(Expense.date >= start_date)
+        if end_date is not None:
+            criteria.append(Expense.date <= end_date)
 
-        total_amount = sum((e.amount for e in expenses), Decimal("0"))
-        paid_amount = sum((e.amount for e in expenses if e.is_paid), Decimal("0"))
-        unpaid_amount = total_amount - paid_amount
+        totals = self.db.query(*self._summary_columns()).filter(*criteria).one()
+        summary = self._summary_row(totals)
 
-        total_count = len(expenses)
-        paid_count = sum(1 for e in expenses if e.is_paid)
-        unpaid_count = total_count - paid_count
+        if include_categories:
+            rows = (
+                self.db.query(Category, *self._summary_columns())
+                .join(Expense, Expense.category_id == Category.id)
+                .filter(*criteria)
+                .group_by(Category.id)
+                .order_by(func.sum(Expense.amount).desc())
+                .all()
+            )
+            summary["categories"] = [
+                {"category": row[0], **self._summary_row(row)} for row in rows
+            ]
+
+        return summary
+
+    @staticmethod
+    def _summary_columns() -> tuple:
+        return (
+            func.coalesce(func.sum(Expense.amount), 0).label("total_amount"),
+            func.coalesce(
+                func.sum(case((Expense.is_paid, Expense.amount), else_=0)), 0
+            ).label("paid_amount"),
+            func.count(Expense.id).label("total_count"),
+            func.coalesce(func.sum(case((Expense.is_paid, 1), else_=0)), 0).label("paid_count"),
+        )
 
+    @staticmethod
+    def _summary_row(row) -> dict:
+        total_amount = Decimal(str(row.total_amount))
+        paid_amount = Decimal(str(row.paid_amount))
         return {
             "total_amount": total_amount,
             "paid_amount": paid_amount,
-            "unpaid_amount": unpaid_amount,
-            "total_count": total_count,
-            "paid_count": paid_count,
-            "unpaid_count": unpaid_count,
+            "unpaid_amount": total_amount - paid_amount,
+            "total_count": row.total_count,
+            "paid_count": row.paid_count,
+            "unpaid_count": row.total_count - row.paid_count,
         }
 
 
@@ -157,10 +374,16 @@ class CategoryService:
     def list_categories(self) -> list[Category]:
         return self.db.query(Category).order_by(Category.name).all()
 
+    def categories_by_ids(self, category_ids: list[int]) -> dict[int, Category]:
+        categories = self.db.query(Category).filter(Category.id.in_(category_ids)).all()
+        return {category.id: category for category in categories}
+
     def get_category(self, category_id: int) -> Category | None:
         return self.db.query(Category).filter(Category.id == category_id).first()
 
-    def create_category(self, name: str, color: str = "#6B7280", icon: str | None = None) -> Category:
+    def create_category(
+        self, name: str, color: str = "#6B7280", icon: str | None = None
+    ) -> Category:
         category = Category(name=name, color=color, icon=icon)
         self.db.add(category)
         self.db.commit()
@@ -0,0 +1,199 @@
+"""Streaming export of expenses and incomes as CSV, NDJSON or Parquet.
+
+Rows are read with ``yield_per``, which streams the result: SQLite steps
+its cursor as rows are fetched, and they come back in batches of
+``MYMONEY_EXPORT_BATCH_SIZE``. Each batch is encoded and handed to the
+caller before the next one is read, so memory depends on the batch size
+and not on how many rows are exported. Parquet needs the optional
+``pyarrow`` package and writes one row group per batch.
+"""
+
+import csv
+import io
+import json
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from datetime import date, datetime
+from decimal import Decimal
+from importlib.util import find_spec
+
+from sqlalchemy import (
+    Boolean,
+    Date,
+    DateTime,
+    Integer,
+    Numeric,
+    Row,
+    Select,
+    select,
+)
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.category import Category
+from app.models.expense import Expense
+from app.models.income import Income
+from app.services.expense_service import ExpenseService
+
+# Expense columns in the layout the CSV import reads back
+EXPENSE_COLUMNS = (
+    Expense.id,
+    Expense.date,
+    Expense.amount,
+    Expense.description,
+    Category.name.label("category"),
+    Expense.notes,
+    Expense.is_recurring,
+    Expense.recurrence_rule,
+    Expense.is_paid,
+    Expense.paid_at,
+)
+
+INCOME_COLUMNS = (
+    Income.id,
+    Income.name,
+    Income.income_type,
+    Income.amount,
+    Income.currency,
+    Income.is_gross,
+    Income.tax_rate,
+    Income.other_fees,
+    Income.net_amount.label("net_amount"),
+    Income.is_active,
+    Income.start_date,
+    Income.notes,
+)
+
+
+def parquet_available() -> bool:
+    """Whether ``pyarrow``, needed for Parquet exports, is installed."""
+    return find_spec("pyarrow") is not None
+
+
+class ExportService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def export_expenses(
+        self, format: str, batch_size: int | None = None, **filters
+    ) -> Iterator[str | bytes]:
+        """Expenses matching ``filters`` (as for ``list_expenses``), oldest first, encoded."""
+        stmt = (
+            select(*EXPENSE_COLUMNS)
+            .join(Category, Expense.category_id == Category.id)
+            .where(*ExpenseService._filter_criteria(**filters))
+            .order_by(Expense.date, Expense.id)
+        )
+        return self._export(stmt, format, batch_size)
+
+    def export_incomes(
+        self, format: str, batch_size: int | None = None, is_active: bool | None = None
+    ) -> Iterator[str | bytes]:
+        """Incomes, optionally only active or inactive ones, encoded."""
+        stmt = select(*INCOME_COLUMNS).order_by(Income.id)
+        if is_active is not None:
+            stmt = stmt.where(Income.is_active == is_active)
+        return self._export(stmt, format, batch_size)
+
+    def _export(self, stmt: Select, format: str, batch_size: int | None) -> Iterator[str | bytes]:
+        batch_size = batch_size or settings.export_batch_size
+        result = self.db.execute(stmt.execution_options(yield_per=batch_size))
+        return ENCODERS[format](stmt.selected_columns, result.partitions())
+
+
+def encode_csv(columns: Sequence, batches: Iterable[Sequence[Row]]) -> Iterator[str]:
+    """A header line, then the CSV lines of each batch as one string."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow([column.name for column in columns])
+    for batch in batches:
+        writer.writerows([_text(value) for value in row] for row in batch)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def encode_ndjson(columns: Sequence, batches: Iterable[Sequence[Row]]) -> Iterator[str]:
+    """One JSON object per row; amounts are strings so no precision is lost."""
+    names = [column.name for column in columns]
+    for batch in batches:
+        yield "".join(
+            json.dumps(dict(zip(names, (_json(value) for value in row)))) + "\n"
+            for row in batch
+        )
+
+
+def encode_parquet(columns: Sequence, batches: Iterable[Sequence[Row]]) -> Iterator[bytes]:
+    """A Parquet file with one row group per batch, yielded as it is written."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([(column.name, _arrow_type(pa, column.type)) for column in columns])
+    sink = _DrainingSink()
+    with pq.ParquetWriter(sink, schema) as writer:
+        for batch in batches:
+            writer.write_table(pa.Table.from_pylist([row._asdict() for row in batch], schema))
+            yield sink.drain()
+    yield sink.drain()
+
+
+ENCODERS: dict[str, Callable[[Sequence, Iterable[Sequence[Row]]], Iterator]] = {
+    "csv": encode_csv,
+    "ndjson": encode_ndjson,
+    "parquet": encode_parquet,
+}
+
+
+class _DrainingSink(io.RawIOBase):
+    """Write-only file that hands over what was written since the last drain.
+
+    ``tell`` keeps counting from the start of the file, which the Parquet
+    writer relies on for the offsets in its footer.
+    """
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _text(value):
+    return value.isoformat() if isinstance(value, (date, datetime)) else value
+
+
+def _json(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def _arrow_type(pa, sql_type):
+    if isinstance(sql_type, Boolean):
+        return pa.bool_()
+    if isinstance(sql_type, Integer):
+        return pa.int64()
+    if isinstance(sql_type, Numeric):
+        return pa.decimal128(sql_type.precision or 18, sql_type.scale or 2)
+    if isinstance(sql_type, DateTime):
+        return pa.timestamp("us")
+    if isinstance(sql_type, Date):
+        return pa.date32()
+    return pa.string()
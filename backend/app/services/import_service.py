@@ -0,0 +1,262 @@
+"""Bulk import of expenses from CSV files and OFX bank statements.
+
+Files are parsed as a stream and written in chunks of
+``MYMONEY_IMPORT_CHUNK_SIZE`` records: each chunk is one batched INSERT,
+one rollup update and one commit, so memory stays bounded by the chunk
+size and an interrupted import keeps the chunks already written.
+Categories are resolved from a name map loaded once, and every row gets an
+``import_hash`` fingerprint whose unique index skips rows already imported,
+so importing the same file twice adds nothing.
+"""
+
+import csv
+import hashlib
+import re
+from collections.abc import Iterable, Iterator
+from datetime import date, datetime, time
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+from typing import TextIO
+
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.category import Category
+from app.models.expense import Expense
+from app.services.rollup_service import RollupService
+
+expense_table = Expense.__table__
+
+_CENTS = Decimal("0.01")
+_CSV_REQUIRED = {"date", "amount", "description"}
+_TRUE = {"1", "true", "yes", "y"}
+_FALSE = {"0", "false", "no", "n"}
+
+# An OFX tag and the text up to the next tag; works for SGML (1.x), where
+# leaf elements are not closed, and for XML (2.x) alike
+_OFX_TOKEN = re.compile(r"<(/?)([A-Za-z0-9.]+)>([^<]*)")
+_OFX_FIELDS = {"DTPOSTED", "TRNAMT", "NAME", "MEMO", "FITID"}
+
+
+class ImportService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def import_expenses(
+        self,
+        records: Iterable[dict],
+        default_category_id: int | None = None,
+        chunk_size: int | None = None,
+    ) -> Iterator[dict]:
+        """Insert parsed ``records`` chunk by chunk, yielding a report after each.
+
+        Records come from :func:`parse_csv` or :func:`parse_ofx`. Rows
+        without a category, or with one that does not exist, go to
+        ``default_category_id``; without it they are rejected. Each report
+        has the chunk number, how many records it held, how many were
+        inserted, were already imported or skipped, and the rejected ones
+        as ``{"record", "error"}``. A last report with ``"done": True``
+        carries the totals.
+        """
+        chunk_size = chunk_size or settings.import_chunk_size
+        categories = {
+            name.casefold(): category_id
+            for category_id, name in self.db.execute(select(Category.id, Category.name))
+        }
+        seen: dict[bytes, int] = {}
+        totals = {"rows": 0, "inserted": 0, "duplicates": 0, "skipped": 0, "errors": 0}
+
+        records = iter(records)
+        number = 0
+        while chunk := list(islice(records, chunk_size)):
+            number += 1
+            rows, errors, skipped = [], [], 0
+            for record in chunk:
+                if record.get("skip"):
+                    skipped += 1
+                    continue
+                try:
+                    rows.append(_to_row(record, categories, default_category_id, seen))
+                except ValueError as exc:
+                    errors.append({"record": record["record"], "error": str(exc)})
+
+            inserted = self._insert(rows)
+            report = {
+                "chunk": number,
+                "rows": len(chunk),
+                "inserted": inserted,
+                "duplicates": len(rows) - inserted,
+                "skipped": skipped,
+                "errors": errors,
+            }
+            for key in ("rows", "inserted", "duplicates", "skipped"):
+                totals[key] += report[key]
+            totals["errors"] += len(errors)
+            yield report
+
+        yield {"done": True, "chunks": number, **totals}
+
+    def _insert(self, rows: list[dict]) -> int:
+        """Insert one chunk and fold it into the rollup; returns rows inserted."""
+        if not rows:
+            return 0
+        # Rows whose fingerprint is already present are skipped; only the
+        # rows actually inserted come back for the rollup.
+        stmt = (
+            sqlite_insert(expense_table)
+            .on_conflict_do_nothing(index_elements=["import_hash"])
+            .returning(
+                expense_table.c.date,
+                expense_table.c.category_id,
+                expense_table.c.amount,
+                expense_table.c.is_paid,
+            )
+        )
+        created = [row._asdict() for row in self.db.execute(stmt, rows)]
+        RollupService(self.db).apply_rows(created)
+        self.db.commit()
+        return len(created)
+
+
+def parse_csv(stream: TextIO) -> Iterator[dict]:
+    """Records of a CSV file with ``date``, ``amount`` and ``description`` columns.
+
+    ``category``, ``notes`` and ``is_paid`` columns are optional; header
+    names are case-insensitive. Dates are ``YYYY-MM-DD`` and amounts are
+    positive. Each record's ``record`` is its line in the file. The header
+    is checked right away and a ``ValueError`` raised if a required column
+    is missing; rows are read as the result is iterated.
+    """
+    reader = csv.reader(stream)
+    header = [name.strip().casefold() for name in next(reader, [])]
+    missing = _CSV_REQUIRED - set(header)
+    if missing:
+        raise ValueError(f"CSV is missing columns: {', '.join(sorted(missing))}")
+    return _csv_records(reader, header)
+
+
+def _csv_records(reader, header: list[str]) -> Iterator[dict]:
+    for values in reader:
+        if not any(values):
+            continue
+        record = dict(zip(header, (value.strip() for value in values)))
+        record["record"] = reader.line_num
+        yield record
+
+
+def parse_ofx(stream: TextIO, block_size: int = 64 * 1024) -> Iterator[dict]:
+    """Records of the transactions (``<STMTTRN>``) of an OFX bank statement.
+
+    The file is tokenized in blocks of ``block_size`` characters. Debits
+    become expenses of their absolute amount, identified by the bank's
+    ``FITID``; credits are not expenses and come back as skipped records.
+    ``record`` is the transaction's position in the statement.
+    """
+    number = 0
+    current: dict | None = None
+
+    def tokens() -> Iterator[tuple[str, str, str]]:
+        buffer = ""
+        for block in iter(lambda: stream.read(block_size), ""):
+            buffer += block
+            # Keep the last, possibly incomplete, tag for the next block; the
+            # text before it is complete because it runs up to that tag
+            cut = buffer.rfind("<")
+            if cut > 0:
+                yield from _OFX_TOKEN.findall(buffer, 0, cut)
+                buffer = buffer[cut:]
+        yield from _OFX_TOKEN.findall(buffer)
+
+    for closing, tag, text in tokens():
+        tag = tag.upper()
+        if tag == "STMTTRN":
+            if closing and current is not None:
+                yield _ofx_record(current)
+                current = None
+            elif not closing:
+                number += 1
+                current = {"record": number}
+        elif current is not None and not closing and tag in _OFX_FIELDS:
+            current[tag] = text.strip()
+
+
+def _ofx_record(fields: dict) -> dict:
+    record = {"record": fields["record"]}
+    amount = fields.get("TRNAMT", "")
+    if amount.startswith("-"):
+        amount = amount[1:]
+    elif amount:
+        return {**record, "skip": "credit"}
+    posted = fields.get("DTPOSTED", "")
+    name, memo = fields.get("NAME", ""), fields.get("MEMO", "")
+    return {
+        **record,
+        # YYYYMMDD[HHMMSS[.XXX][[offset:TZ]]]
+        "date": f"{posted[:4]}-{posted[4:6]}-{posted[6:8]}" if len(posted) >= 8 else posted,
+        "amount": amount,
+        "description": name or memo,
+        "notes": memo if name and memo != name else "",
+        "fitid": fields.get("FITID", ""),
+    }
+
+
+def _to_row(
+    record: dict, categories: dict[str, int], default_category_id: int | None, seen: dict
+) -> dict:
+    """Validated expense row of one record; raises ``ValueError`` if it is not valid."""
+    try:
+        day = date.fromisoformat(record.get("date", ""))
+    except ValueError:
+        raise ValueError(f"Invalid date: {record.get('date', '')!r}") from None
+    try:
+        amount = Decimal(record.get("amount", "")).quantize(_CENTS)
+    except InvalidOperation:
+        raise ValueError(f"Invalid amount: {record.get('amount', '')!r}") from None
+    if not amount > 0:
+        raise ValueError("Amount must be positive")
+    description = record.get("description", "")[:255]
+    if not description:
+        raise ValueError("Description is required")
+
+    name = record.get("category", "")
+    category_id = categories.get(name.casefold(), default_category_id)
+    if category_id is None:
+        raise ValueError(f"Unknown category: {name!r}" if name else "Category is required")
+
+    is_paid = record.get("is_paid", "").casefold()
+    if is_paid and is_paid not in _TRUE | _FALSE:
+        raise ValueError(f"Invalid is_paid: {record['is_paid']!r}")
+    # Statement lines are transactions that already happened
+    is_paid = is_paid not in _FALSE
+
+    return {
+        "amount": amount,
+        "description": description,
+        "notes": record.get("notes") or None,
+        "date": day,
+        "category_id": category_id,
+        "is_recurring": False,
+        "is_paid": is_paid,
+        "paid_at": datetime.combine(day, time()) if is_paid else None,
+        "import_hash": _import_hash(record.get("fitid", ""), day, amount, description, seen),
+    }
+
+
+def _import_hash(fitid: str, day: date, amount: Decimal, description: str, seen: dict) -> str:
+    """Fingerprint of a statement line.
+
+    The bank's transaction id when there is one; otherwise date, amount and
+    description, plus how many identical lines came before in the file, so
+    two genuine identical purchases on one day stay two expenses while a
+    re-import of the same file matches line for line.
+    """
+    if fitid:
+        key = f"fitid|{fitid}"
+    else:
+        base = f"{day.isoformat()}|{amount}|{description.casefold()}"
+        digest = hashlib.blake2b(base.encode(), digest_size=16).digest()
+        ordinal = seen[digest] = seen.get(digest, 0) + 1
+        key = f"{base}|{ordinal}"
+    return hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
@@ -1,10 +1,13 @@
+from collections import defaultdict
 from datetime import datetime
 from decimal import Decimal
 
-from sqlalchemy import func
+from sqlalchemy import func, select, tuple_
 from sqlalchemy.orm import Session
 
 from app.models.income import Income
+from app.services.currency import CurrencyConverter, PassthroughConverter
+from app.services.pagination import decode_cursor, encode_cursor
 
 
 class IncomeService:
@@ -17,19 +20,44 @@ class IncomeService:
         is_active: bool | None = None,
         limit: int = 50,
         offset: int = 0,
+        after: str | None = None,
     ):
+        """List incomes newest first, with offset or keyset (``after``) pagination."""
         query = self.db.query(Income)
 
         if is_active is not None:
             query = query.filter(Income.is_active == is_active)
 
         total_count = query.count()
+        order = (Income.created_at.desc(), Income.id.desc())
 
-        items = query.order_by(Income.created_at.desc()).offset(offset).limit(limit).all()
+        if after is not None:
+            position = tuple_(*self._decode_cursor(after))
+            query = query.filter(tuple_(Income.created_at, Income.id) < position)
+            items = query.order_by(*order).limit(limit + 1).all()
+            has_more = len(items) > limit
+            return items[:limit], total_count, has_more
+
+        items = query.order_by(*order).offset(offset).limit(limit).all()
         has_more = (offset + limit) < total_count
 
         return items, total_count, has_more
 
+    @staticmethod
+    def cursor_for(income: Income) -> str:
+        """Opaque keyset cursor pointing at ``income``."""
+        return encode_cursor("created_at", income.created_at.isoformat(), income.id)
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> tuple:
+        values = decode_cursor(cursor)
+        if len(values) != 3 or values[0] != "created_at":
+            raise ValueError("Invalid cursor")
+        try:
+            return datetime.fromisoformat(values[1]), int(values[2])
+        except (TypeError, ValueError):
+            raise ValueError("Invalid cursor") from None
+
     def get_income(self, income_id: int) -> Income | None:
         return self.db.query(Income).filter(Income.id == income_id).first()
 
@@ -62,11 +90,43 @@ class IncomeService:
         self.db.commit()
         return True
 
-    def get_total_monthly_income(self) -> Decimal:
-        """Sum of all active income streams (net amounts after taxes/fees)."""
-        active_incomes = self.db.query(Income).filter(Income.is_active == True).all()
-        return sum((income.net_amount for income in active_incomes), Decimal("0"))
+    def get_total_monthly_income(self, converter: CurrencyConverter | None = None) -> Decimal:
+        """Sum of all active income streams (net amounts after taxes/fees).
+
+        Each currency's total is converted with ``converter``; without one
+        the totals are added as-is.
+        """
+        by_currency: dict[str, Decimal] = defaultdict(Decimal)
+        for group in self.active_income_breakdown():
+            by_currency[group["currency"]] += group["total_amount"]
+        return (converter or PassthroughConverter()).total(by_currency)
+
+    def active_income_breakdown(self) -> list[dict]:
+        """Net total and stream count of active incomes per (income type, currency).
+
+        One aggregate query; totals and counts across groups add up to the
+        overall figures.
+        """
+        rows = self.db.execute(
+            select(
+                Income.income_type,
+                Income.currency,
+                func.sum(Income.net_cents).label("total_cents"),
+                func.count().label("stream_count"),
+            )
+            .where(Income.is_active)
+            .group_by(Income.income_type, Income.currency)
+        ).all()
+        return [
+            {
+                "income_type": row.income_type,
+                "currency": row.currency,
+                "total_amount": Decimal(row.total_cents).scaleb(-2),
+                "stream_count": row.stream_count,
+            }
+            for row in rows
+        ]
 
     def get_active_income_count(self) -> int:
         """Count of active income streams."""
-        return self.db.query(Income).filter(Income.is_active == True).count()
+        return self.db.query(Income).filter(Income.is_active).count()
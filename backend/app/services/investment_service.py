@@ -1,10 +1,38 @@
-from datetime import datetime
+from bisect import bisect_left
+from collections import defaultdict
+from collections.abc import Iterable
+from datetime import date, datetime
 from decimal import Decimal
+from itertools import groupby
+from operator import itemgetter
 
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import (
+    Integer,
+    Numeric,
+    String,
+    bindparam,
+    case,
+    cast,
+    func,
+    select,
+    type_coerce,
+    update,
+)
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
 
 from app.models.asset import Asset
+from app.models.asset_price import AssetPrice
 from app.models.portfolio import Portfolio
+from app.services.currency import CurrencyConverter, PassthroughConverter
+from app.services.periods import period_ends
+
+price_table = AssetPrice.__table__
+
+_CENTS = Decimal("0.01")
+# Integer scales used by the value series: quantities are Numeric(18, 8), prices cents
+_QUANTITY_DIGITS = 8
+_VALUE_DIGITS = _QUANTITY_DIGITS + 2
 
 
 class InvestmentService:
@@ -14,20 +42,10 @@ class InvestmentService:
     # ── Portfolios ──
 
     def list_portfolios(self) -> list[Portfolio]:
-        return (
-            self.db.query(Portfolio)
-            .options(joinedload(Portfolio.assets))
-            .order_by(Portfolio.name)
-            .all()
-        )
+        return self.db.query(Portfolio).order_by(Portfolio.name).all()
 
     def get_portfolio(self, portfolio_id: int) -> Portfolio | None:
-        return (
-            self.db.query(Portfolio)
-            .options(joinedload(Portfolio.assets))
-            .filter(Portfolio.id == portfolio_id)
-            .first()
-        )
+        return self.db.query(Portfolio).filter(Portfolio.id == portfolio_id).first()
 
     def create_portfolio(self, name: str, description: str | None = None) -> Portfolio:
         portfolio = Portfolio(name=name, description=description)
@@ -58,6 +76,84 @@ class InvestmentService:
 
     # ── Assets ──
 
+    def assets_by_portfolio_ids(self, portfolio_ids: list[int]) -> dict[int, list[Asset]]:
+        """Assets of each portfolio in one ``IN`` query."""
+        grouped: dict[int, list[Asset]] = {portfolio_id: [] for portfolio_id in portfolio_ids}
+        assets = (
+            self.db.query(Asset)
+            .filter(Asset.portfolio_id.in_(portfolio_ids))
+            .order_by(Asset.id)
+            .all()
+        )
+        for asset in assets:
+            grouped[asset.portfolio_id].append(asset)
+        return grouped
+
+    # ── Valuation (SQL aggregates) ──
+
+    def portfolio_valuations(
+        self, portfolio_ids: list[int], converter: CurrencyConverter | None = None
+    ) -> dict[int, dict]:
+        """Totals per portfolio, as :meth:`compute_portfolio_totals`, summed in SQL.
+
+        Assets are summed per currency and each currency's subtotal is
+        converted with ``converter`` (without one, subtotals are added
+        as-is). ``by_currency`` lists the native and converted values.
+        """
+        rows = self.db.execute(
+            select(Asset.portfolio_id, Asset.currency, *self._valuation_columns())
+            .where(Asset.portfolio_id.in_(portfolio_ids))
+            .group_by(Asset.portfolio_id, Asset.currency)
+        ).all()
+        grouped: dict[int, list] = {portfolio_id: [] for portfolio_id in portfolio_ids}
+        for row in rows:
+            grouped[row.portfolio_id].append(row)
+
+        converter = converter or PassthroughConverter()
+        valuations = {}
+        for portfolio_id, subtotals in grouped.items():
+            total_cost = converter.total({r.currency: r.total_cost for r in subtotals})
+            total_value = converter.total({r.currency: r.total_value for r in subtotals})
+            has_value = any(r.priced_count > 0 for r in subtotals)
+            valuations[portfolio_id] = {
+                **self._totals(total_cost, total_value, has_value),
+                "by_currency": converter.breakdown({r.currency: r.total_value for r in subtotals}),
+            }
+        return valuations
+
+    def valuation_by_type_and_currency(self) -> list[dict]:
+        """Native value and cost of all assets per (asset type, currency)."""
+        rows = self.db.execute(
+            select(Asset.asset_type, Asset.currency, *self._valuation_columns())
+            .group_by(Asset.asset_type, Asset.currency)
+        ).all()
+        return [
+            {
+                "asset_type": row.asset_type,
+                "currency": row.currency,
+                "total_value": row.total_value,
+                "total_cost": row.total_cost,
+            }
+            for row in rows
+        ]
+
+    @staticmethod
+    def _valuation_columns() -> tuple:
+        # Unpriced assets are valued at cost, as in compute_asset_current_value
+        # callers. SQLite computes in REAL; the Numeric type brings the sums
+        # back as Decimals at the scale the per-asset math produces.
+        amount = Numeric(28, 10)
+        return (
+            type_coerce(func.sum(Asset.quantity * Asset.purchase_price), amount).label(
+                "total_cost"
+            ),
+            type_coerce(
+                func.sum(Asset.quantity * func.coalesce(Asset.current_price, Asset.purchase_price)),
+                amount,
+            ).label("total_value"),
+            func.sum(case((Asset.current_price.is_not(None), 1), else_=0)).label("priced_count"),
+        )
+
     def get_asset(self, asset_id: int) -> Asset | None:
         return self.db.query(Asset).filter(Asset.id == asset_id).first()
 
@@ -88,6 +184,219 @@ class InvestmentService:
         self.db.commit()
         return True
 
+    # ── Prices ──
+
+    def update_asset_price(
+        self, asset_id: int, price: Decimal, as_of: date | None = None
+    ) -> Asset | None:
+        """Set one asset's current price and record it in the price history."""
+        asset = self.db.query(Asset).filter(Asset.id == asset_id).first()
+        if not asset:
+            return None
+        self._record_prices(
+            [{"symbol": asset.symbol, "date": as_of or date.today(), "price": price}]
+        )
+        asset.current_price = price
+        asset.updated_at = datetime.utcnow()
+        self.db.commit()
+        self.db.refresh(asset)
+        return asset
+
+    def bulk_update_prices(self, prices: list[dict]) -> dict:
+        """Record many price points and reprice every lot of each symbol.
+
+        Each item holds ``symbol``, ``price`` and ``as_of``. Everything is
+        written in one transaction with one executemany per statement. Lots
+        are only repriced from a symbol's newest known date, so backfilling
+        older history never overwrites a current price.
+        """
+        points = {(p["symbol"], p["as_of"]): p["price"] for p in prices}
+        if not points:
+            return {"recorded_prices": 0, "updated_assets": 0}
+
+        latest: dict[str, tuple[date, Decimal]] = {}
+        for (symbol, day), price in points.items():
+            if symbol not in latest or day >= latest[symbol][0]:
+                latest[symbol] = (day, price)
+        stored = dict(
+            self.db.execute(
+                select(AssetPrice.symbol, func.max(AssetPrice.date))
+                .where(AssetPrice.symbol.in_(latest))
+                .group_by(AssetPrice.symbol)
+            ).all()
+        )
+
+        self._record_prices(
+            [
+                {"symbol": symbol, "date": day, "price": price}
+                for (symbol, day), price in points.items()
+            ]
+        )
+
+        now = datetime.utcnow()
+        current = [
+            {"b_symbol": symbol, "b_price": price, "b_updated_at": now}
+            for symbol, (day, price) in latest.items()
+            if symbol not in stored or day >= stored[symbol]
+        ]
+        updated = 0
+        if current:
+            assets = Asset.__table__
+            result = self.db.execute(
+                update(assets)
+                .where(assets.c.symbol == bindparam("b_symbol"))
+                .values(current_price=bindparam("b_price"), updated_at=bindparam("b_updated_at")),
+                current,
+            )
+            updated = result.rowcount
+        self.db.commit()
+        return {"recorded_prices": len(points), "updated_assets": updated}
+
+    def _record_prices(self, rows: list[dict]) -> None:
+        # A second price for the same symbol and day replaces the first
+        stmt = sqlite_insert(AssetPrice.__table__)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["symbol", "date"], set_={"price": stmt.excluded.price}
+        )
+        self.db.execute(stmt, rows)
+
+    # ── History ──
+
+    def portfolio_value_series(
+        self,
+        portfolio_id: int,
+        start: date,
+        end: date,
+        interval: str = "day",
+        converter: CurrencyConverter | None = None,
+    ) -> list[dict] | None:
+        """Value and cost of a portfolio at the close of each period in [start, end].
+
+        Lots count from their purchase date and are valued at their symbol's
+        last recorded price on or before each date (at cost until a price
+        exists). Instead of revaluing every lot on every date, each symbol's
+        lots and prices are swept once in date order and every change is
+        added to the period it falls in; the series is the running sum of
+        those changes. The sweep works on exact integers (quantities in
+        1e-8 units, prices in cents) to keep Decimal out of the hot loop.
+        Sums are kept per currency and each period's are converted with
+        ``converter``, as in :meth:`portfolio_valuations`.
+        """
+        if not self.db.get(Portfolio, portfolio_id):
+            return None
+
+        lots: dict[tuple[str, str], list[tuple]] = defaultdict(list)
+        for lot in self.db.execute(
+            select(
+                Asset.symbol,
+                Asset.currency,
+                Asset.quantity,
+                Asset.purchase_price,
+                Asset.purchase_date,
+            )
+            .where(Asset.portfolio_id == portfolio_id, Asset.purchase_date <= end)
+            .order_by(Asset.purchase_date)
+        ):
+            lots[(lot.symbol, lot.currency)].append((
+                lot.purchase_date.isoformat(),
+                int(lot.quantity.scaleb(_QUANTITY_DIGITS)),
+                int((lot.quantity * lot.purchase_price).scaleb(_VALUE_DIGITS)),
+            ))
+        prices = self._price_points(sorted({symbol for symbol, _ in lots}), start, end, interval)
+
+        closes = period_ends(start, end, interval)
+        close_days = [close.isoformat() for close in closes]
+        value_changes: dict[str, list[int]] = defaultdict(lambda: [0] * len(closes))
+        cost_changes: dict[str, list[int]] = defaultdict(lambda: [0] * len(closes))
+        for (symbol, currency), symbol_lots in lots.items():
+            _sweep_symbol(
+                symbol_lots,
+                prices.get(symbol, ()),
+                close_days,
+                value_changes[currency],
+                cost_changes[currency],
+            )
+
+        converter = converter or PassthroughConverter()
+        total_value = dict.fromkeys(value_changes, 0)
+        total_cost = dict.fromkeys(cost_changes, 0)
+        series = []
+        for index, close in enumerate(closes):
+            for currency in total_value:
+                total_value[currency] += value_changes[currency][index]
+                total_cost[currency] += cost_changes[currency][index]
+            series.append({
+                "date": close,
+                "total_value": _converted_units(converter, total_value),
+                "total_cost": _converted_units(converter, total_cost),
+            })
+        return series
+
+    def _price_points(
+        self, symbols: list[str], start: date, end: date, interval: str = "day"
+    ) -> dict[str, list]:
+        """(symbol, ISO date, cents) rows per symbol: the last price known at
+        ``start``, then the later ones through ``end``, oldest first.
+
+        For weekly and monthly series only the last price of each period is
+        read, since that is the one the period closes at.
+        """
+        if not symbols:
+            return {}
+        # Core columns skip ORM row loading; ISO date strings compare like
+        # dates and skip per-row date parsing
+        day = type_coerce(price_table.c.date, String)
+        cents = cast(func.round(price_table.c.price * 100), Integer)
+        opening = (
+            select(price_table.c.symbol, func.max(price_table.c.date).label("date"))
+            .where(price_table.c.symbol.in_(symbols), price_table.c.date <= start)
+            .group_by(price_table.c.symbol)
+            .subquery()
+        )
+        points: dict[str, list] = {
+            row.symbol: [row]
+            for row in self.db.execute(
+                select(price_table.c.symbol, day, cents).join(
+                    opening,
+                    (opening.c.symbol == price_table.c.symbol)
+                    & (opening.c.date == price_table.c.date),
+                )
+            )
+        }
+        in_range = (
+            price_table.c.symbol.in_(symbols),
+            price_table.c.date > start,
+            price_table.c.date <= end,
+        )
+        if interval == "day":
+            # Read in (symbol, date) index order so SQLite needs no sort
+            query = (
+                select(price_table.c.symbol, day, cents)
+                .where(*in_range)
+                .order_by(price_table.c.symbol, price_table.c.date)
+            )
+        else:
+            # SQLite returns the bare ``cents`` column from the max(date) row
+            period = (
+                func.date(price_table.c.date, "weekday 0")
+                if interval == "week"
+                else func.strftime("%Y-%m", price_table.c.date)
+            )
+            query = (
+                select(
+                    price_table.c.symbol,
+                    type_coerce(func.max(price_table.c.date), String),
+                    cents,
+                )
+                .where(*in_range)
+                .group_by(price_table.c.symbol, period)
+                .order_by(price_table.c.symbol, period)
+            )
+        rows = self.db.execute(query).all()
+        for symbol, group in groupby(rows, key=itemgetter(0)):
+            points.setdefault(symbol, []).extend(group)
+        return points
+
     # ── Computed Fields ──
 
     @staticmethod
@@ -117,20 +426,33 @@ class InvestmentService:
 
     @staticmethod
     def compute_portfolio_totals(portfolio: Portfolio) -> dict:
+        return InvestmentService.compute_totals(
+            (
+                InvestmentService.compute_asset_total_cost(asset),
+                InvestmentService.compute_asset_current_value(asset),
+            )
+            for asset in portfolio.assets
+        )
+
+    @staticmethod
+    def compute_totals(costs_and_values: Iterable[tuple[Decimal, Decimal | None]]) -> dict:
+        """Portfolio totals from each asset's (total cost, current value or None)."""
         total_cost = Decimal("0")
         total_value = Decimal("0")
         has_value = False
 
-        for asset in portfolio.assets:
-            cost = InvestmentService.compute_asset_total_cost(asset)
+        for cost, current_value in costs_and_values:
             total_cost += cost
-            current_value = InvestmentService.compute_asset_current_value(asset)
             if current_value is not None:
                 total_value += current_value
                 has_value = True
             else:
                 total_value += cost  # Use cost as fallback
 
+        return InvestmentService._totals(total_cost, total_value, has_value)
+
+    @staticmethod
+    def _totals(total_cost: Decimal, total_value: Decimal, has_value: bool) -> dict:
         total_gain_loss = total_value - total_cost if has_value else Decimal("0")
         total_gain_loss_percent = (
             (total_gain_loss / total_cost * 100) if total_cost > 0 and has_value else Decimal("0")
@@ -142,3 +464,49 @@ class InvestmentService:
             "total_gain_loss": total_gain_loss,
             "total_gain_loss_percent": total_gain_loss_percent,
         }
+
+
+def _converted_units(converter: CurrencyConverter, units: dict[str, int]) -> Decimal:
+    """Per-currency value-series sums (integer units) as one amount in the target currency."""
+    amounts = {currency: Decimal(value).scaleb(-_VALUE_DIGITS) for currency, value in units.items()}
+    return converter.total(amounts).quantize(_CENTS)
+
+
+def _sweep_symbol(
+    lots: list[tuple], prices, close_days: list[str], value_changes: list, cost_changes: list
+) -> None:
+    """Add one symbol's value and cost changes to the periods they fall in.
+
+    ``lots`` are (ISO date, quantity units, cost units) and ``prices`` are
+    (symbol, ISO date, cents), both oldest first; a purchase is applied before a
+    price of the same day. ``close_days`` are the ISO period ends; a day
+    belongs to the first period closing on or after it, so days before the
+    series start count in period 0.
+    """
+    quantity = cost = 0
+    price = None
+    pending = iter(lots)
+    lot = next(pending, None)
+
+    def buy(lot):
+        nonlocal quantity, cost
+        day, lot_quantity, lot_cost = lot
+        period = bisect_left(close_days, day)
+        quantity += lot_quantity
+        cost += lot_cost
+        cost_changes[period] += lot_cost
+        value_changes[period] += lot_cost if price is None else lot_quantity * price
+
+    for _, day, cents in prices:
+        while lot is not None and lot[0] <= day:
+            buy(lot)
+            lot = next(pending, None)
+        # A symbol's first price replaces the cost it was counted at until then
+        value_changes[bisect_left(close_days, day)] += quantity * cents - (
+            cost if price is None else quantity * price
+        )
+        price = cents
+    while lot is not None:
+        buy(lot)
+        lot = next(pending, None)
+
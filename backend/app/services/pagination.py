@@ -0,0 +1,19 @@
+import base64
+import json
+
+
+def encode_cursor(*values) -> str:
+    """Encode a keyset position (sort field, sort value, id) as an opaque cursor."""
+    payload = json.dumps([str(v) if v is not None else None for v in values])
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> list[str | None]:
+    """Decode a cursor produced by :func:`encode_cursor`."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, UnicodeDecodeError):
+        values = None
+    if isinstance(values, list):
+        return values
+    raise ValueError("Invalid cursor")
@@ -0,0 +1,51 @@
+from datetime import date, timedelta
+
+
+def shift_month(year: int, month: int, delta: int) -> tuple[int, int]:
+    """Move (year, month) by ``delta`` months, crossing year boundaries."""
+    index = year * 12 + (month - 1) + delta
+    return index // 12, index % 12 + 1
+
+
+def month_key(year: int, month: int) -> str:
+    """"YYYY-MM" label used for month buckets."""
+    return f"{year:04d}-{month:02d}"
+
+
+def month_bounds(year: int, month: int) -> tuple[date, date]:
+    """Half-open [first_of_month, first_of_next_month) range for a month.
+
+    Filtering with ``date >= start AND date < end`` keeps monthly predicates
+    sargable so SQLite can range-scan the date indexes instead of evaluating
+    ``strftime`` on every row.
+    """
+    next_year, next_month = shift_month(year, month, 1)
+    return date(year, month, 1), date(next_year, next_month, 1)
+
+
+def add_months(day: date, months: int) -> date:
+    """``day`` moved by ``months``, clamped to the end of shorter months."""
+    year, month = shift_month(day.year, day.month, months)
+    last_day = (month_bounds(year, month)[1] - timedelta(days=1)).day
+    return date(year, month, min(day.day, last_day))
+
+
+def period_ends(start: date, end: date, interval: str) -> list[date]:
+    """Closing date of each "day", "week" (Mon-Sun) or "month" in [start, end].
+
+    The last period is cut off at ``end``, so a series always ends on ``end``.
+    """
+    if interval == "day":
+        return [start + timedelta(days=i) for i in range((end - start).days + 1)]
+    ends = []
+    day = start
+    while day <= end:
+        if interval == "week":
+            close = day + timedelta(days=6 - day.weekday())
+        elif interval == "month":
+            close = month_bounds(day.year, day.month)[1] - timedelta(days=1)
+        else:
+            raise ValueError(f"Unknown interval {interval!r}")
+        ends.append(min(close, end))
+        day = close + timedelta(days=1)
+    return ends
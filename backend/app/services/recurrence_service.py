@@ -0,0 +1,216 @@
+"""Generation of future occurrences of recurring expenses.
+
+A recurring expense (``is_recurring`` with a ``recurrence_rule``) is the
+first occurrence of its series. :meth:`RecurrenceService.materialize`
+inserts the later occurrences up to a horizon as ordinary unpaid expenses
+pointing back at it through ``recurrence_parent_id``, so month totals and
+summaries include upcoming bills. Each series records the date it has been
+generated through (``materialized_until``) and a run only generates past
+it; the unique (parent, date) index makes repeated or concurrent runs
+harmless.
+
+Occurrences are only generated after the day a series is created (see
+:meth:`RecurrenceService.start_series`); earlier ones are entered by hand.
+Bills entered by hand each period before occurrences were generated were
+linked into one series by migration ``f3a9c1d27e85``.
+"""
+
+import asyncio
+import logging
+from collections.abc import Callable
+from datetime import date, timedelta
+
+from sqlalchemy import bindparam, or_, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models.expense import Expense
+from app.services.periods import add_months
+from app.services.rollup_service import RollupService
+
+logger = logging.getLogger(__name__)
+
+expense_table = Expense.__table__
+
+# Rule -> (days, months) between occurrences
+RULE_STEPS: dict[str, tuple[int, int]] = {
+    "daily": (1, 0),
+    "weekly": (7, 0),
+    "biweekly": (14, 0),
+    "monthly": (0, 1),
+    "quarterly": (0, 3),
+    "yearly": (0, 12),
+}
+
+
+class RecurrenceService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def materialize(self, until: date | None = None) -> int:
+        """Generate occurrences of every series through ``until``.
+
+        ``until`` defaults to ``MYMONEY_RECURRENCE_HORIZON_DAYS`` from today.
+        All occurrences are inserted in one bulk statement and folded into
+        the rollup in the same transaction. Returns how many were created.
+        """
+        until = until or date.today() + timedelta(days=settings.recurrence_horizon_days)
+        series = self.db.execute(
+            select(
+                Expense.id,
+                Expense.amount,
+                Expense.description,
+                Expense.notes,
+                Expense.date,
+                Expense.category_id,
+                Expense.recurrence_rule,
+                Expense.materialized_until,
+            ).where(
+                *series_criteria(),
+                or_(Expense.materialized_until.is_(None), Expense.materialized_until < until),
+            )
+        ).all()
+        if not series:
+            return 0
+
+        rows = [
+            {
+                "amount": s.amount,
+                "description": s.description,
+                "notes": s.notes,
+                "date": day,
+                "category_id": s.category_id,
+                "is_recurring": False,
+                "is_paid": False,
+                "recurrence_parent_id": s.id,
+            }
+            for s in series
+            for day in occurrence_dates(
+                s.date, s.recurrence_rule, max(s.date, s.materialized_until or s.date), until
+            )
+        ]
+
+        created = []
+        if rows:
+            # Occurrences another run already inserted are skipped; only the
+            # rows actually inserted come back for the rollup.
+            stmt = (
+                sqlite_insert(expense_table)
+                .on_conflict_do_nothing(index_elements=["recurrence_parent_id", "date"])
+                .returning(
+                    expense_table.c.date,
+                    expense_table.c.category_id,
+                    expense_table.c.amount,
+                    expense_table.c.is_paid,
+                )
+            )
+            created = [row._asdict() for row in self.db.execute(stmt, rows)]
+            RollupService(self.db).apply_rows(created)
+
+        self.db.execute(
+            update(expense_table)
+            .where(expense_table.c.id == bindparam("b_id"))
+            .values(materialized_until=bindparam("b_until")),
+            [{"b_id": s.id, "b_until": until} for s in series],
+        )
+        self.db.commit()
+        return len(created)
+
+    def start_series(self, expense: Expense) -> None:
+        """Mark a new series as generated through today, or its date if later.
+
+        Its past periods are not backfilled: they are entered by hand, as
+        they were before occurrences were generated. Does not commit.
+        """
+        if (
+            expense.is_recurring
+            and expense.recurrence_rule in RULE_STEPS
+            and expense.recurrence_parent_id is None
+            and expense.materialized_until is None
+        ):
+            expense.materialized_until = max(expense.date, date.today())
+
+    def discard_future(self, series: Expense, after: date) -> None:
+        """Delete the series' unpaid occurrences dated after ``after``.
+
+        They are generated again, from the series as it is by then, on the
+        next run. Does not commit.
+        """
+        occurrences = self.db.query(Expense).filter(
+            Expense.recurrence_parent_id == series.id,
+            Expense.date > after,
+            Expense.is_paid.is_(False),
+        )
+        for occurrence in occurrences:
+            self.db.delete(occurrence)
+        if series.materialized_until and series.materialized_until > after:
+            series.materialized_until = after
+
+    def end_series(self, series: Expense, after: date) -> None:
+        """Discard the unpaid occurrences after ``after`` and detach the rest.
+
+        Used before the series itself is deleted; earlier and paid
+        occurrences stay as standalone expenses. Does not commit.
+        """
+        self.discard_future(series, after)
+        self.db.execute(
+            update(Expense)
+            .where(Expense.recurrence_parent_id == series.id)
+            .values(recurrence_parent_id=None)
+        )
+
+
+def series_criteria() -> tuple:
+    """Criteria selecting the recurring expenses that start a series."""
+    return (
+        Expense.is_recurring,
+        Expense.recurrence_rule.in_(RULE_STEPS),
+        Expense.recurrence_parent_id.is_(None),
+    )
+
+
+def occurrence_dates(start: date, rule: str, after: date, until: date) -> list[date]:
+    """Dates of the series starting on ``start`` within (``after``, ``until``].
+
+    Month-based rules keep the day of ``start``, clamped to shorter months,
+    so a series on the 31st falls on the last day of each month.
+    """
+    days, months = RULE_STEPS[rule]
+    if days:
+        first = max(1, (after - start).days // days + 1)
+        last = (until - start).days // days
+        return [start + timedelta(days=days * k) for k in range(first, last + 1)]
+
+    # First step whose month is not past ``after``'s; earlier ones are all before it
+    k = max(1, ((after.year - start.year) * 12 + after.month - start.month) // months)
+    dates = []
+    while (day := add_months(start, k * months)) <= until:
+        if day > after:
+            dates.append(day)
+        k += 1
+    return dates
+
+
+async def run_scheduler(
+    session_factory: Callable[[], AsyncSession] = AsyncSessionLocal,
+    interval: float | None = None,
+) -> None:
+    """Materialize occurrences now and then every ``interval`` seconds, until cancelled.
+
+    ``interval`` defaults to ``MYMONEY_RECURRENCE_INTERVAL``.
+    """
+    interval = interval or settings.recurrence_interval
+    while True:
+        try:
+            async with session_factory() as db:
+                created = await db.run_sync(
+                    lambda session: RecurrenceService(session).materialize()
+                )
+            if created:
+                logger.info("materialized %d recurring expense occurrences", created)
+        except Exception:
+            logger.exception("recurring expense materialization failed")
+        await asyncio.sleep(interval)
@@ -0,0 +1,210 @@
+from collections import defaultdict
+from collections.abc import Iterable
+from itertools import chain
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import case, delete, event, func, insert, inspect, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.models.category import Category
+from app.models.expense import Expense
+from app.models.rollup import MonthlyCategoryRollup
+from app.services.periods import month_key
+
+rollup_table = MonthlyCategoryRollup.__table__
+
+# (year_month, category_id) -> [total, count, paid_total, paid_count]
+Deltas = dict[tuple[str, int], list]
+
+
+class RollupService:
+    """Reads and maintains the ``monthly_category_rollup`` table.
+
+    ORM writes to expenses are folded in automatically by flush hooks
+    (including date/category moves and paid-status changes) in the same
+    transaction as the write; bulk statements that bypass the unit of work
+    call :meth:`apply_rows` themselves.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    # ── Reads ──
+
+    def monthly_totals(self, start_month: str, end_month: str) -> dict[str, Decimal]:
+        """Totals keyed by "YYYY-MM" for months in [start_month, end_month]."""
+        rows = self.db.execute(
+            select(rollup_table.c.year_month, func.sum(rollup_table.c.total).label("total"))
+            .where(rollup_table.c.year_month.between(start_month, end_month))
+            .group_by(rollup_table.c.year_month)
+        ).all()
+        return {r.year_month: Decimal(str(r.total)) for r in rows}
+
+    def month_summary(self, year_month: str) -> dict:
+        row = self.db.execute(
+            select(*self._summary_columns()).where(rollup_table.c.year_month == year_month)
+        ).one()
+        return self._summary_row(row)
+
+    def category_summaries(self, year_month: str, limit: int | None = None) -> list[dict]:
+        """Per-category summaries for a month, largest total first."""
+        query = (
+            self.db.query(Category, *self._summary_columns())
+            .join(rollup_table, rollup_table.c.category_id == Category.id)
+            .filter(rollup_table.c.year_month == year_month)
+            .group_by(Category.id)
+            .order_by(func.sum(rollup_table.c.total).desc())
+        )
+        if limit is not None:
+            query = query.limit(limit)
+        return [{"category": row[0], **self._summary_row(row)} for row in query.all()]
+
+    @staticmethod
+    def _summary_columns() -> tuple:
+        return (
+            func.coalesce(func.sum(rollup_table.c.total), 0).label("total_amount"),
+            func.coalesce(func.sum(rollup_table.c.paid_total), 0).label("paid_amount"),
+            func.coalesce(func.sum(rollup_table.c.count), 0).label("total_count"),
+            func.coalesce(func.sum(rollup_table.c.paid_count), 0).label("paid_count"),
+        )
+
+    @staticmethod
+    def _summary_row(row) -> dict:
+        total_amount = Decimal(str(row.total_amount))
+        paid_amount = Decimal(str(row.paid_amount))
+        return {
+            "total_amount": total_amount,
+            "paid_amount": paid_amount,
+            "unpaid_amount": total_amount - paid_amount,
+            "total_count": row.total_count,
+            "paid_count": row.paid_count,
+            "unpaid_count": row.total_count - row.paid_count,
+        }
+
+    # ── Maintenance ──
+
+    def rebuild(self) -> int:
+        """Recompute the whole rollup from raw expenses. Returns the row count."""
+        year_month = func.strftime("%Y-%m", Expense.date)
+        aggregated = select(
+            year_month,
+            Expense.category_id,
+            func.round(func.sum(Expense.amount), 2),
+            func.count(Expense.id),
+            func.round(func.sum(case((Expense.is_paid, Expense.amount), else_=0)), 2),
+            func.sum(case((Expense.is_paid, 1), else_=0)),
+        ).group_by(year_month, Expense.category_id)
+
+        self.db.execute(delete(rollup_table))
+        self.db.execute(
+            insert(rollup_table).from_select(
+                ["year_month", "category_id", "total", "count", "paid_total", "paid_count"],
+                aggregated,
+            )
+        )
+        self.db.commit()
+        return self.db.execute(select(func.count()).select_from(rollup_table)).scalar()
+
+    def ensure_built(self) -> None:
+        """Backfill the rollup if it is empty while expenses exist.
+
+        Covers databases whose tables were created by ``create_all`` rather
+        than by the migration that backfills the rollup.
+        """
+        has_rollup = self.db.execute(select(rollup_table.c.year_month).limit(1)).first()
+        has_expenses = self.db.execute(select(Expense.id).limit(1)).first()
+        if has_expenses and not has_rollup:
+            self.rebuild()
+
+    def apply_rows(self, rows: Iterable[dict], sign: int = 1) -> None:
+        """Fold bulk-inserted (``sign=1``) or bulk-deleted (``sign=-1``) expense rows in.
+
+        Each row needs ``date``, ``category_id``, ``amount`` and optionally ``is_paid``.
+        """
+        deltas = _new_deltas()
+        for row in rows:
+            _add(deltas, row["date"], row["category_id"], row["amount"], row.get("is_paid"), sign)
+        _apply_deltas(self.db.connection(), deltas)
+
+
+_TRACKED = ("date", "category_id", "amount", "is_paid")
+
+
+def _add(
+    deltas: Deltas, day: date, category_id: int, amount, is_paid: bool | None, sign: int
+) -> None:
+    entry = deltas[(month_key(day.year, day.month), category_id)]
+    amount = Decimal(str(amount))
+    entry[0] += sign * amount
+    entry[1] += sign
+    if is_paid:
+        entry[2] += sign * amount
+        entry[3] += sign
+
+
+def _apply_deltas(connection, deltas: Deltas) -> None:
+    changed = [
+        {
+            "year_month": key[0],
+            "category_id": key[1],
+            "total": float(total),
+            "count": count,
+            "paid_total": float(paid_total),
+            "paid_count": paid_count,
+        }
+        for key, (total, count, paid_total, paid_count) in deltas.items()
+        if count or total or paid_count or paid_total
+    ]
+    if not changed:
+        return
+
+    stmt = sqlite_insert(rollup_table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["year_month", "category_id"],
+        set_={
+            # Amounts are REAL in SQLite; rounding keeps +/- deltas from drifting
+            "total": func.round(rollup_table.c.total + stmt.excluded.total, 2),
+            "count": rollup_table.c.count + stmt.excluded.count,
+            "paid_total": func.round(rollup_table.c.paid_total + stmt.excluded.paid_total, 2),
+            "paid_count": rollup_table.c.paid_count + stmt.excluded.paid_count,
+        },
+    )
+    connection.execute(stmt, changed)
+    connection.execute(delete(rollup_table).where(rollup_table.c.count <= 0))
+
+
+def _old_value(state, attr: str):
+    history = state.attrs[attr].history
+    if history.deleted:
+        return history.deleted[0]
+    return getattr(state.obj(), attr)
+
+
+def _new_deltas() -> Deltas:
+    return defaultdict(lambda: [Decimal("0"), 0, Decimal("0"), 0])
+
+
+@event.listens_for(Session, "before_flush")
+def _retract_old_contributions(session, flush_context, instances):
+    # Old values must be read before the flush: deleted rows can no longer be
+    # loaded afterwards. Unchanged dirty rows cancel out in after_flush.
+    deltas = session.info["rollup_deltas"] = _new_deltas()
+    with session.no_autoflush:
+        for obj in chain(session.deleted, session.dirty):
+            if isinstance(obj, Expense):
+                state = inspect(obj)
+                _add(deltas, *(_old_value(state, attr) for attr in _TRACKED), -1)
+
+
+@event.listens_for(Session, "after_flush")
+def _add_new_contributions(session, flush_context):
+    # New values are read after the flush so foreign keys assigned through
+    # relationships (e.g. ``expense.category = ...``) are already populated.
+    deltas = session.info.pop("rollup_deltas", None) or _new_deltas()
+    for obj in chain(session.new, session.dirty):
+        if isinstance(obj, Expense) and obj not in session.deleted:
+            _add(deltas, *(getattr(obj, attr) for attr in _TRACKED), 1)
+    if deltas:
+        _apply_deltas(session.connection(), deltas)
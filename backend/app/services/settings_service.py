@@ -1,5 +1,6 @@
 from datetime import datetime
 
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 
 from app.models.settings import UserSettings
@@ -32,10 +33,14 @@ class SettingsService:
         """Get or create singleton settings row."""
         settings = self.db.query(UserSettings).filter(UserSettings.id == 1).first()
         if not settings:
-            settings = UserSettings(id=1, main_currency="USD", language="en")
-            self.db.add(settings)
+            # Another session may be creating it at the same time
+            self.db.execute(
+                sqlite_insert(UserSettings)
+                .values(id=1, main_currency="USD", language="en")
+                .on_conflict_do_nothing(index_elements=["id"])
+            )
             self.db.commit()
-            self.db.refresh(settings)
+            settings = self.db.query(UserSettings).filter(UserSettings.id == 1).one()
         return settings
 
     def update_settings(
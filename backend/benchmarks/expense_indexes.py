@@ -0,0 +1,127 @@
+"""Compare expense query plans and timings with and without secondary indexes.
+
+Usage (from backend/):
+    python -m benchmarks.expense_indexes [--rows 1000000]
+
+Builds a throwaway SQLite database from the application models, fills the
+expenses table, and runs the filter/sort shapes used by ExpenseService and
+DashboardService once without the model indexes and once with them.
+"""
+
+import argparse
+import random
+import sqlite3
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import create_engine
+
+from app.models import Base, Expense
+
+QUERIES = {
+    "list (date desc)": (
+        "SELECT * FROM expenses ORDER BY date DESC LIMIT 20"
+    ),
+    "list by category + date range": (
+        "SELECT * FROM expenses WHERE category_id = 3 "
+        "AND date >= '2024-01-01' AND date <= '2024-03-31' ORDER BY date DESC LIMIT 20"
+    ),
+    "list unpaid": (
+        "SELECT * FROM expenses WHERE is_paid = 0 ORDER BY date DESC LIMIT 20"
+    ),
+    "list recurring": (
+        "SELECT * FROM expenses WHERE is_recurring = 1 ORDER BY date DESC LIMIT 20"
+    ),
+    "list by amount range": (
+        "SELECT * FROM expenses WHERE amount >= 900 AND amount <= 950 ORDER BY amount ASC LIMIT 20"
+    ),
+    "recent expenses": (
+        "SELECT * FROM expenses ORDER BY date DESC, created_at DESC LIMIT 5"
+    ),
+    "month total": (
+        "SELECT sum(amount) FROM expenses WHERE date >= '2024-05-01' AND date < '2024-06-01'"
+    ),
+}
+
+
+def _populate(conn: sqlite3.Connection, rows: int) -> None:
+    conn.executemany(
+        "INSERT INTO categories (id, name, color, created_at) VALUES (?, ?, ?, ?)",
+        [(i, f"Category {i}", "#6B7280", "2020-01-01 00:00:00") for i in range(1, 11)],
+    )
+    rng = random.Random(42)
+    start = date(2016, 1, 1)
+    batch = []
+    for i in range(rows):
+        day = start + timedelta(days=rng.randrange(3650))
+        batch.append(
+            (
+                round(rng.uniform(1, 1000), 2),
+                f"Expense {i}",
+                day.isoformat(),
+                rng.randint(1, 10),
+                rng.random() < 0.05,
+                rng.random() < 0.7,
+                datetime.combine(day, datetime.min.time()).isoformat(" "),
+                datetime.combine(day, datetime.min.time()).isoformat(" "),
+            )
+        )
+        if len(batch) == 50_000:
+            _insert(conn, batch)
+            batch = []
+    if batch:
+        _insert(conn, batch)
+    conn.commit()
+
+
+def _insert(conn: sqlite3.Connection, batch: list[tuple]) -> None:
+    conn.executemany(
+        "INSERT INTO expenses (amount, description, date, category_id, is_recurring, is_paid, "
+        "created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        batch,
+    )
+
+
+def _run(conn: sqlite3.Connection, label: str) -> None:
+    print(f"\n── {label} ──")
+    for name, sql in QUERIES.items():
+        plan = " | ".join(row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}"))
+        started = time.perf_counter()
+        conn.execute(sql).fetchall()
+        elapsed = (time.perf_counter() - started) * 1000
+        print(f"{name:32} {elapsed:9.2f} ms  {plan}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "bench.db"
+        engine = create_engine(f"sqlite:///{db_path}")
+        Base.metadata.create_all(bind=engine)
+        engine.dispose()
+
+        conn = sqlite3.connect(db_path)
+        indexes = [index.name for index in Expense.__table__.indexes]
+        for name in indexes:
+            conn.execute(f"DROP INDEX {name}")
+
+        print(f"Populating {args.rows:,} expenses...")
+        _populate(conn, args.rows)
+        conn.execute("ANALYZE")
+        _run(conn, "without indexes")
+
+        for index in Expense.__table__.indexes:
+            columns = ", ".join(column.name for column in index.columns)
+            conn.execute(f"CREATE INDEX {index.name} ON expenses ({columns})")
+        conn.execute("ANALYZE")
+        _run(conn, "with indexes")
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""Compare mixed read/write GraphQL throughput with and without SQLite pragmas.
+
+Usage (from backend/):
+    python -m benchmarks.sqlite_pragmas [--rows 50000] [--seconds 10] [--readers 4] [--writers 2]
+
+Builds two throwaway SQLite databases from the application models, fills
+each with the same expenses, and runs concurrent reader tasks (expense
+list and summary queries) alongside writer tasks (createExpense mutations)
+through the GraphQL schema on the async engine. The first run uses
+SQLite's defaults (rollback journal, synchronous=FULL); the second applies
+the pragmas configured in Settings.
+"""
+
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import apply_sqlite_pragmas
+from app.graphql.loaders import Loaders
+from app.graphql.schema import schema
+from app.models import Base, Category, Expense
+from app.services.rollup_service import RollupService
+
+READ_QUERIES = [
+    "{ expenses(limit: 20) { items { id amount date category { name } } } }",
+    '{ expenseSummary(month: 5, year: 2024) { totalAmount paidAmount totalCount } }',
+    '{ expenses(limit: 20, filter: { isPaid: false }) { items { id amount } } }',
+]
+
+WRITE_MUTATION = """
+mutation($amount: Decimal!, $date: Date!) {
+  createExpense(input: {
+    amount: $amount, description: "Benchmark", date: $date, categoryId: "1"
+  }) { id }
+}
+"""
+
+
+def _populate(db_path: Path, rows: int) -> None:
+    engine = create_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(bind=engine)
+
+    Session = sessionmaker(bind=engine)
+    rng = random.Random(42)
+    start = date(2020, 1, 1)
+    with Session() as db:
+        db.execute(
+            insert(Category),
+            [{"id": i, "name": f"Category {i}", "color": "#6B7280"} for i in range(1, 11)],
+        )
+        db.execute(
+            insert(Expense),
+            [
+                {
+                    "amount": round(rng.uniform(1, 1000), 2),
+                    "description": f"Expense {i}",
+                    "date": start + timedelta(days=rng.randrange(1825)),
+                    "category_id": rng.randint(1, 10),
+                    "is_paid": rng.random() < 0.7,
+                }
+                for i in range(rows)
+            ],
+        )
+        db.commit()
+        RollupService(db).rebuild()
+    engine.dispose()
+
+
+async def _worker(Session, deadline: float, counts: dict, kind: str, seed: int) -> None:
+    rng = random.Random(seed)
+    while time.perf_counter() < deadline:
+        async with Session() as db:
+            context = {"db": db, "loaders": Loaders(db)}
+            if kind == "read":
+                result = await schema.execute(rng.choice(READ_QUERIES), context_value=context)
+            else:
+                result = await schema.execute(
+                    WRITE_MUTATION,
+                    variable_values={
+                        "amount": str(round(rng.uniform(1, 500), 2)),
+                        "date": (date(2024, 1, 1) + timedelta(days=rng.randrange(365))).isoformat(),
+                    },
+                    context_value=context,
+                )
+        key = f"{kind}_errors" if result.errors else kind
+        counts[key] = counts.get(key, 0) + 1
+
+
+async def _run(label: str, db_path: Path, tuned: bool, args) -> None:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    if tuned:
+        event.listen(
+            engine.sync_engine, "connect", lambda conn, record: apply_sqlite_pragmas(conn)
+        )
+    Session = async_sessionmaker(engine, expire_on_commit=False)
+
+    counts: dict = {}
+    kinds = ["read"] * args.readers + ["write"] * args.writers
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(
+            _worker(Session, started + args.seconds, counts, kind, i)
+            for i, kind in enumerate(kinds)
+        )
+    )
+    elapsed = time.perf_counter() - started
+    await engine.dispose()
+
+    errors = counts.get("read_errors", 0) + counts.get("write_errors", 0)
+    print(
+        f"{label:10} reads {counts.get('read', 0) / elapsed:8.1f}/s   "
+        f"writes {counts.get('write', 0) / elapsed:8.1f}/s   "
+        f"errors {errors}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--writers", type=int, default=2)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, tuned in (("defaults", False), ("pragmas", True)):
+            print(f"Populating {args.rows:,} expenses ({label})...")
+            db_path = Path(tmp) / f"{label}.db"
+            _populate(db_path, args.rows)
+            asyncio.run(_run(label, db_path, tuned, args))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,9 @@ import pytest
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
+from app.api import exports, imports
 from app.models import Base
+from app.services.cache import reset_caches
 
 
 @pytest.fixture
@@ -16,3 +18,26 @@ def db_session():
     finally:
         session.close()
         Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def api_session_factory(tmp_path, monkeypatch):
+    """Sessions on a file database, used by the HTTP import and export routes.
+
+    A file rather than ``:memory:``: the routes run in worker threads, each
+    of which would get its own empty in-memory database.
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'api.db'}")
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+    monkeypatch.setattr(imports, "SessionLocal", factory)
+    monkeypatch.setattr(exports, "SessionLocal", factory)
+    yield factory
+    engine.dispose()
+
+
+@pytest.fixture(autouse=True)
+def _reset_caches():
+    reset_caches()
+    yield
+    reset_caches()
@@ -0,0 +1,138 @@
+import asyncio
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.config import settings
+from app.models import Base
+from app.services.dashboard_service import SECTIONS, section_timings
+from app.services.async_services import (
+    AsyncCategoryService,
+    AsyncDashboardService,
+    AsyncExpenseService,
+    AsyncSettingsService,
+)
+
+
+@pytest.fixture
+def async_session_factory(tmp_path):
+    db_path = tmp_path / "async.db"
+    sync_engine = create_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(bind=sync_engine)
+    sync_engine.dispose()
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    asyncio.run(engine.dispose())
+
+
+def test_async_service_round_trip(async_session_factory):
+    async def scenario():
+        async with async_session_factory() as db:
+            category = await AsyncCategoryService(db).create_category(name="Food")
+            expense = await AsyncExpenseService(db).create_expense(
+                amount=Decimal("12.50"),
+                description="Lunch",
+                date=date(2026, 3, 4),
+                category_id=category.id,
+            )
+            # Loaded inside the call, so usable outside it
+            assert expense.description == "Lunch"
+
+            items, total, has_more = await AsyncExpenseService(db).list_expenses()
+            return [e.id for e in items], total, has_more, expense.id
+
+    ids, total, has_more, expense_id = asyncio.run(scenario())
+    assert ids == [expense_id]
+    assert total == 1
+    assert has_more is False
+
+
+def test_concurrent_calls_on_one_session_are_serialized(async_session_factory):
+    async def scenario():
+        async with async_session_factory() as db:
+            category = await AsyncCategoryService(db).create_category(name="Food")
+            await AsyncExpenseService(db).create_expense(
+                amount=Decimal("40"),
+                description="Groceries",
+                date=date(2026, 3, 4),
+                category_id=category.id,
+            )
+            # Sibling GraphQL fields resolve like this, sharing one session
+            return await asyncio.gather(
+                AsyncDashboardService(db).get_summary(month="2026-03"),
+                AsyncExpenseService(db).get_expense_summary(month=3, year=2026),
+                AsyncSettingsService(db).get_settings(),
+            )
+
+    dashboard, summary, settings = asyncio.run(scenario())
+    assert dashboard["total_expenses_this_month"] == Decimal("40")
+    assert summary["total_amount"] == Decimal("40")
+    assert settings.main_currency == "USD"
+
+
+def test_unknown_method_raises_attribute_error(async_session_factory):
+    async def scenario():
+        async with async_session_factory() as db:
+            return AsyncExpenseService(db).no_such_method
+
+    with pytest.raises(AttributeError):
+        asyncio.run(scenario())
+
+
+@pytest.mark.parametrize("concurrent", [True, False])
+def test_dashboard_sections_match_sequential_summary(
+    async_session_factory, monkeypatch, concurrent
+):
+    monkeypatch.setattr(settings, "dashboard_concurrent_sections", concurrent)
+
+    async def scenario():
+        async with async_session_factory() as db:
+            category = await AsyncCategoryService(db).create_category(name="Food")
+            for day, amount in ((3, "40"), (20, "10")):
+                await AsyncExpenseService(db).create_expense(
+                    amount=Decimal(amount),
+                    description="Groceries",
+                    date=date(2026, 3, day),
+                    category_id=category.id,
+                )
+            return await AsyncDashboardService(db).get_summary(month="2026-03")
+
+    summary = asyncio.run(scenario())
+    assert set(summary) == {field for fields in SECTIONS.values() for field in fields}
+    assert summary["total_expenses_this_month"] == Decimal("50")
+    assert summary["top_categories"][0]["category"].name == "Food"
+    assert [e.amount for e in summary["recent_expenses"]] == [Decimal("10"), Decimal("40")]
+    assert set(section_timings()) >= set(SECTIONS)
+
+
+def test_concurrent_dashboards_do_not_exhaust_the_pool(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "dashboard_concurrent_sections", True)
+    db_path = tmp_path / "pool.db"
+    sync_engine = create_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(bind=sync_engine)
+    sync_engine.dispose()
+    # Room for as many connections as there are requests, not for their sections
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{db_path}", pool_size=2, max_overflow=2, pool_timeout=2
+    )
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def request():
+        async with session_factory() as db:
+            # A sibling field read on the request session first, as in a request
+            await AsyncExpenseService(db).list_expenses()
+            return await AsyncDashboardService(db).get_summary(month="2026-03")
+
+    async def scenario():
+        try:
+            return await asyncio.gather(*(request() for _ in range(4)))
+        finally:
+            await engine.dispose()
+
+    summaries = asyncio.run(scenario())
+    assert [s["total_expenses_this_month"] for s in summaries] == [Decimal("0")] * 4
+
@@ -0,0 +1,72 @@
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models import Base
+from app.models.category import Category
+from app.models.expense import Expense
+from app.services.cache import LRUCache, table_versions
+from app.services.expense_service import ExpenseService
+
+
+class TestLRUCache:
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        assert cache.get("a") == 1
+        cache.set("c", 3)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.stats() == {"size": 2, "maxsize": 2, "hits": 2, "misses": 1}
+
+
+class TestTableVersions:
+    def test_commit_bumps_written_table(self, db_session):
+        before = table_versions(db_session, "categories", "expenses")
+        db_session.add(Category(name="Food"))
+        db_session.flush()
+        assert table_versions(db_session, "categories", "expenses") == before
+        db_session.commit()
+        assert table_versions(db_session, "categories", "expenses") == (before[0] + 1, before[1])
+
+    def test_rollback_does_not_bump(self, db_session):
+        before = table_versions(db_session, "categories")
+        db_session.add(Category(name="Food"))
+        db_session.flush()
+        db_session.rollback()
+        db_session.commit()
+        assert table_versions(db_session, "categories") == before
+
+    def test_bulk_statement_bumps_on_commit(self, db_session):
+        db_session.add(Category(name="Food"))
+        db_session.commit()
+        before = table_versions(db_session, "expenses")
+        db_session.execute(
+            Expense.__table__.insert(),
+            [{"amount": 1, "description": "x", "date": date(2026, 1, 1), "category_id": 1}],
+        )
+        db_session.commit()
+        assert table_versions(db_session, "expenses") == (before[0] + 1,)
+
+
+def test_writes_from_another_process_invalidate_cached_results(tmp_path):
+    url = f"sqlite:///{tmp_path / 'shared.db'}"
+    # Two engines stand in for two worker processes sharing the database
+    worker, other = create_engine(url), create_engine(url)
+    Base.metadata.create_all(bind=worker)
+    with sessionmaker(bind=worker)() as db:
+        db.add(Category(name="Food"))
+        db.commit()
+        assert ExpenseService(db).count_expenses() == 0
+
+        with sessionmaker(bind=other)() as writer:
+            writer.add(Expense(amount=Decimal("5"), description="Tea", date=date(2026, 1, 1),
+                               category_id=1))
+            writer.commit()
+
+        assert ExpenseService(db).count_expenses() == 1
+    worker.dispose()
+    other.dispose()
@@ -1,11 +1,21 @@
 from datetime import date
 from decimal import Decimal
 
+from sqlalchemy import event
+
 from app.models.category import Category
 from app.models.expense import Expense
+from app.models.income import Income
 from app.models.portfolio import Portfolio
 from app.models.asset import Asset
-from app.services.dashboard_service import DashboardService
+from app.services.cache import cache_stats
+from app.services.currency import CurrencyConverter
+from app.services.dashboard_service import (
+    SECTIONS,
+    DashboardService,
+    converts_amounts,
+    sections_for,
+)
 
 
 def _seed_data(db):
@@ -132,3 +142,215 @@ class TestDashboardService:
         assert summary["top_categories"] == []
         assert summary["recent_expenses"] == []
         assert summary["portfolio_allocation"] == []
+
+    def test_trend_spans_year_boundary(self, db_session):
+        _seed_data(db_session)
+        service = DashboardService(db_session)
+        summary = service.get_summary(month="2026-01")
+        months = [t["month"] for t in summary["monthly_expense_trend"]]
+        assert months == ["2025-08", "2025-09", "2025-10", "2025-11", "2025-12", "2026-01"]
+        assert summary["total_expenses_last_month"] == Decimal("0")
+        assert summary["expense_change_percent"] is None
+
+    def test_query_count_is_constant(self, db_session):
+        _seed_data(db_session)
+        statements = []
+
+        def count(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        engine = db_session.get_bind()
+        event.listen(engine, "before_cursor_execute", count)
+        try:
+            DashboardService(db_session).get_summary(month="2026-02")
+        finally:
+            event.remove(engine, "before_cursor_execute", count)
+
+        # table versions, trend, assets, top categories, recent expenses, incomes
+        assert len(statements) <= 6
+
+    def test_only_requested_sections_are_computed(self, db_session):
+        _seed_data(db_session)
+        statements = []
+
+        def count(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        engine = db_session.get_bind()
+        event.listen(engine, "before_cursor_execute", count)
+        try:
+            summary = DashboardService(db_session).get_summary(
+                month="2026-02", fields={"total_expenses_this_month"}
+            )
+        finally:
+            event.remove(engine, "before_cursor_execute", count)
+
+        assert summary["total_expenses_this_month"] == Decimal("40")
+        assert "total_portfolio_value" not in summary
+        assert "recent_expenses" not in summary
+        # table versions and the rollup trend
+        assert len(statements) == 2
+
+
+class TestCurrencyConversion:
+    def _seed_foreign(self, db):
+        _seed_data(db)
+        portfolio = db.query(Portfolio).one()
+        db.add(Asset(
+            portfolio_id=portfolio.id, symbol="SAP", name="SAP", asset_type="stock",
+            quantity=Decimal("10"), purchase_price=Decimal("100"), purchase_date=date(2025, 1, 1),
+            current_price=Decimal("150"), currency="EUR",
+        ))
+        db.add(Income(name="Salary", amount=Decimal("1000"), income_type="salary", is_gross=False))
+        db.add(Income(
+            name="Consulting", amount=Decimal("1000"), income_type="freelance", currency="EUR",
+            is_gross=True, tax_rate=Decimal("10"), other_fees=Decimal("100"),
+        ))
+        db.commit()
+
+    def test_totals_are_converted_per_currency(self, db_session):
+        self._seed_foreign(db_session)
+        converter = CurrencyConverter("USD", {"EUR": Decimal("0.8")})
+        summary = DashboardService(db_session, converter).get_summary(month="2026-01")
+
+        # 26200 USD + EUR 1500 / 0.8
+        assert summary["total_portfolio_value"] == Decimal("28075.00")
+        assert summary["portfolio_value_by_currency"] == [
+            {"currency": "USD", "amount": Decimal("26200"), "converted_amount": Decimal("26200")},
+            {"currency": "EUR", "amount": Decimal("1500"), "converted_amount": Decimal("1875.00")},
+        ]
+        stock = next(a for a in summary["portfolio_allocation"] if a["asset_type"] == "stock")
+        assert stock["total_value"] == Decimal("3075.00")
+        # 1000 USD + EUR (1000 - 10% - 100) / 0.8
+        assert summary["total_monthly_income"] == Decimal("2000.00")
+        income = {r["currency"]: r["amount"] for r in summary["monthly_income_by_currency"]}
+        assert income == {"USD": Decimal("1000.00"), "EUR": Decimal("800.00")}
+        by_type = {r["income_type"]: r for r in summary["monthly_income_by_type"]}
+        assert by_type["freelance"]["total_amount"] == Decimal("1000.00")  # EUR 800 / 0.8
+        assert by_type["salary"]["percentage"] == Decimal("50")
+        assert summary["income_streams_count"] == 2
+
+    def test_cache_is_keyed_by_target_currency(self, db_session):
+        self._seed_foreign(db_session)
+        in_usd = CurrencyConverter("USD", {"EUR": Decimal("0.8")})
+        in_eur = CurrencyConverter("EUR", {"USD": Decimal("1.25")})
+
+        usd = DashboardService(db_session, in_usd).get_summary(fields={"net_worth"})
+        eur = DashboardService(db_session, in_eur).get_summary(fields={"net_worth"})
+
+        assert usd["net_worth"] == Decimal("28075.00")
+        assert eur["net_worth"] == Decimal("22460.00")  # 26200 / 1.25 + EUR 1500
+
+    def test_currencies_without_a_rate_are_listed_but_not_totalled(self, db_session):
+        self._seed_foreign(db_session)
+        portfolio = db_session.query(Portfolio).one()
+        db_session.add(Asset(
+            portfolio_id=portfolio.id, symbol="VOLV", name="Volvo", asset_type="stock",
+            quantity=Decimal("10"), purchase_price=Decimal("200"), purchase_date=date(2025, 1, 1),
+            current_price=Decimal("250"), currency="SEK",
+        ))
+        db_session.add(Income(name="Rent", amount=Decimal("5000"), income_type="rental",
+                              currency="SEK", is_gross=False))
+        db_session.commit()
+        converter = CurrencyConverter("USD", {"EUR": Decimal("0.8")})
+
+        summary = DashboardService(db_session, converter).get_summary(month="2026-01")
+
+        assert summary["total_portfolio_value"] == Decimal("28075.00")
+        assert summary["portfolio_value_by_currency"][-1] == {
+            "currency": "SEK", "amount": Decimal("2500"), "converted_amount": None
+        }
+        assert summary["total_monthly_income"] == Decimal("2000.00")
+        assert summary["monthly_income_by_currency"][-1]["converted_amount"] is None
+        assert summary["income_streams_count"] == 3
+
+
+def test_sections_for_fields():
+    assert sections_for(None) == list(SECTIONS)
+    assert sections_for({"net_worth", "income_streams_count"}) == ["portfolio", "income"]
+    assert sections_for({"__typename"}) == []
+
+
+def test_converts_amounts():
+    assert converts_amounts(None)
+    assert converts_amounts({"total_expenses_this_month", "net_worth"})
+    assert not converts_amounts({"total_expenses_this_month", "recent_expenses"})
+
+
+class TestDashboardCache:
+    @staticmethod
+    def _count_statements(db, fn):
+        statements = []
+
+        def count(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        engine = db.get_bind()
+        event.listen(engine, "before_cursor_execute", count)
+        try:
+            result = fn()
+        finally:
+            event.remove(engine, "before_cursor_execute", count)
+        return result, len(statements)
+
+    def test_repeat_summary_is_served_from_cache(self, db_session):
+        _seed_data(db_session)
+        service = DashboardService(db_session)
+        first = service.get_summary(month="2026-01")
+
+        second, statements = self._count_statements(
+            db_session, lambda: service.get_summary(month="2026-01")
+        )
+
+        # Only the table versions are read
+        assert statements == 1
+        assert second["total_expenses_this_month"] == first["total_expenses_this_month"]
+        assert cache_stats()["dashboard_sections"]["hits"] == len(SECTIONS)
+        # Cached ORM objects stay readable after the session moves on
+        db_session.commit()
+        assert second["recent_expenses"][0].description
+
+    def test_expense_write_invalidates_only_expense_sections(self, db_session):
+        _seed_data(db_session)
+        service = DashboardService(db_session)
+        service.get_summary(month="2026-01")
+
+        food = db_session.query(Category).filter_by(name="Food").one()
+        db_session.add(
+            Expense(amount=Decimal("5"), description="Coffee", date=date(2026, 1, 20), category_id=food.id)
+        )
+        db_session.commit()
+
+        summary, statements = self._count_statements(
+            db_session, lambda: service.get_summary(month="2026-01")
+        )
+        assert summary["total_expenses_this_month"] == Decimal("105")
+        assert "Coffee" in [e.description for e in summary["recent_expenses"]]
+        # expenses, top categories and recent expenses are recomputed;
+        # portfolio and income come from the cache
+        assert statements == 1 + 3
+
+    def test_asset_price_update_invalidates_portfolio(self, db_session):
+        _seed_data(db_session)
+        service = DashboardService(db_session)
+        assert service.get_summary(month="2026-01")["total_portfolio_value"] == Decimal("26200")
+
+        apple = db_session.query(Asset).filter_by(symbol="AAPL").one()
+        apple.current_price = Decimal("130")
+        db_session.commit()
+
+        assert service.get_summary(month="2026-01")["total_portfolio_value"] == Decimal("26300")
+
+    def test_uncommitted_writes_bypass_cache(self, db_session):
+        _seed_data(db_session)
+        service = DashboardService(db_session)
+        service.get_summary(month="2026-01")
+
+        food = db_session.query(Category).filter_by(name="Food").one()
+        db_session.add(
+            Expense(amount=Decimal("5"), description="Coffee", date=date(2026, 1, 20), category_id=food.id)
+        )
+        assert service.get_summary(month="2026-01")["total_expenses_this_month"] == Decimal("105")
+        db_session.rollback()
+
+        assert service.get_summary(month="2026-01")["total_expenses_this_month"] == Decimal("100")
@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine, event, func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app import database
+from app.models import Base, Category
+
+
+@pytest.fixture
+def session_factory(tmp_path, monkeypatch):
+    db_path = tmp_path / "requests.db"
+    sync_engine = create_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(bind=sync_engine)
+    sync_engine.dispose()
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    monkeypatch.setattr(database, "AsyncSessionLocal", factory)
+    yield factory
+    asyncio.run(engine.dispose())
+
+
+def test_get_async_db_closes_session(session_factory):
+    async def scenario():
+        gen = database.get_async_db()
+        db = await anext(gen)
+        db.add(Category(name="Food"))
+        await db.commit()
+        assert await db.scalar(select(func.count(Category.id))) == 1
+
+        await gen.aclose()
+
+        assert not db.identity_map
+        assert not db.in_transaction()
+
+    asyncio.run(scenario())
+
+
+def test_get_async_db_rolls_back_on_error(session_factory):
+    async def scenario():
+        gen = database.get_async_db()
+        db = await anext(gen)
+        db.add(Category(name="Food"))
+        await db.flush()
+
+        with pytest.raises(RuntimeError):
+            await gen.athrow(RuntimeError("request failed"))
+
+        async with session_factory() as check:
+            assert await check.scalar(select(func.count(Category.id))) == 0
+
+    asyncio.run(scenario())
+
+
+def test_pool_status_reports_pool_counters():
+    status = database.pool_status()
+    assert set(status) == {"size", "checked_in", "checked_out", "overflow"}
+
+
+def test_sqlite_pragmas_applied_on_connect(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'pragmas.db'}")
+    event.listen(engine, "connect", lambda conn, record: database.apply_sqlite_pragmas(conn))
+    expected = {"journal_mode": "wal", "synchronous": 1, "temp_store": 2, "busy_timeout": 5000}
+    with engine.connect() as connection:
+        for name, value in expected.items():
+            assert connection.exec_driver_sql(f"PRAGMA {name}").scalar() == value
+    engine.dispose()
@@ -0,0 +1,175 @@
+import asyncio
+import json
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.config import settings
+from app.models import Asset, Base, ExchangeRate, Portfolio
+from app.services.async_services import AsyncDashboardService
+from app.services.exchange_rate_service import (
+    ExchangeRates,
+    ExchangeRateService,
+    FileRateProvider,
+    cross_rates,
+)
+
+
+class CountingProvider:
+    def __init__(self, rates, fail=False):
+        self.rates = rates
+        self.fail = fail
+        self.calls = 0
+
+    async def fetch(self, base):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        if self.fail:
+            raise OSError("provider unavailable")
+        return cross_rates(self.rates, base)
+
+
+USD_RATES = {"USD": Decimal("1"), "EUR": Decimal("0.8"), "BRL": Decimal("5")}
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    db_path = tmp_path / "rates.db"
+    sync_engine = create_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(bind=sync_engine)
+    sync_engine.dispose()
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    asyncio.run(engine.dispose())
+
+
+def test_cross_rates_from_one_base():
+    rates = cross_rates(USD_RATES, "EUR")
+    assert rates == {"USD": Decimal("1.25"), "EUR": Decimal("1"), "BRL": Decimal("6.25")}
+    with pytest.raises(ValueError):
+        cross_rates(USD_RATES, "XXX")
+
+
+def test_file_provider(tmp_path):
+    path = tmp_path / "rates.json"
+    path.write_text(json.dumps({"base": "USD", "rates": {"EUR": 0.8, "BRL": 5}}))
+
+    rates = asyncio.run(FileRateProvider(path).fetch("BRL"))
+
+    assert rates["BRL"] == Decimal("1")
+    assert rates["USD"] == Decimal("0.2")
+    assert rates["EUR"] == Decimal("0.16")
+
+
+def test_concurrent_callers_share_one_fetch(session_factory):
+    provider = CountingProvider(USD_RATES)
+    exchange_rates = ExchangeRates(provider, session_factory, ttl=3600)
+
+    async def scenario():
+        results = await asyncio.gather(
+            *(exchange_rates.rates_for(base) for base in ["USD", "EUR", "BRL", "USD", "EUR"])
+        )
+        # Served from the in-process cache afterwards
+        await exchange_rates.rates_for("BRL")
+        return results
+
+    results = asyncio.run(scenario())
+    assert provider.calls == 1
+    assert results[1][0]["BRL"] == Decimal("6.25")
+
+
+def test_stored_rates_survive_a_restart(session_factory):
+    provider = CountingProvider(USD_RATES)
+    asyncio.run(ExchangeRates(provider, session_factory).rates_for("USD"))
+
+    restarted = ExchangeRates(provider, session_factory)
+    rates, _ = asyncio.run(restarted.rates_for("EUR"))
+
+    assert provider.calls == 1
+    assert rates["USD"] == Decimal("1.25")
+
+
+def test_expired_rates_are_refetched(session_factory):
+    provider = CountingProvider(USD_RATES)
+    exchange_rates = ExchangeRates(provider, session_factory, ttl=0)
+
+    asyncio.run(exchange_rates.rates_for("USD"))
+    asyncio.run(exchange_rates.rates_for("USD"))
+
+    assert provider.calls == 2
+
+
+def test_provider_failure_serves_stale_rates(session_factory):
+    async def seed():
+        async with session_factory() as db:
+            await db.run_sync(
+                lambda session: ExchangeRateService(session).store_rates(
+                    "USD", USD_RATES, datetime.utcnow() - timedelta(days=2)
+                )
+            )
+
+    asyncio.run(seed())
+    exchange_rates = ExchangeRates(CountingProvider(USD_RATES, fail=True), session_factory)
+
+    rates, fetched_at = asyncio.run(exchange_rates.rates_for("EUR"))
+
+    assert rates["BRL"] == Decimal("6.25")
+    assert fetched_at < datetime.utcnow() - timedelta(days=1)
+
+
+def test_provider_failure_without_stored_rates_raises(session_factory):
+    exchange_rates = ExchangeRates(CountingProvider(USD_RATES, fail=True), session_factory)
+    with pytest.raises(OSError):
+        asyncio.run(exchange_rates.rates_for("USD"))
+
+
+def test_dashboard_without_any_rates_totals_the_main_currency(
+    session_factory, monkeypatch, tmp_path
+):
+    # A provider that cannot answer and no stored rates to fall back on
+    monkeypatch.setattr(settings, "exchange_rate_provider", "file")
+    monkeypatch.setattr(settings, "exchange_rate_file", str(tmp_path / "missing.json"))
+
+    async def scenario():
+        async with session_factory() as db:
+            def seed(session):
+                portfolio = Portfolio(name="Main")
+                session.add(portfolio)
+                session.flush()
+                for symbol, currency in (("AAPL", "USD"), ("SAP", "EUR")):
+                    session.add(Asset(
+                        portfolio_id=portfolio.id, symbol=symbol, name=symbol,
+                        asset_type="stock", quantity=Decimal("1"),
+                        purchase_price=Decimal("100"), purchase_date=date(2025, 1, 1),
+                        current_price=Decimal("150"), currency=currency,
+                    ))
+                session.commit()
+
+            await db.run_sync(seed)
+            return await AsyncDashboardService(db).get_summary(
+                fields={"total_portfolio_value", "portfolio_value_by_currency"}
+            )
+
+    summary = asyncio.run(scenario())
+
+    assert summary["total_portfolio_value"] == Decimal("150")
+    breakdown = summary["portfolio_value_by_currency"]
+    assert [(r["currency"], r["converted_amount"]) for r in breakdown] == [
+        ("USD", Decimal("150")), ("EUR", None)
+    ]
+
+
+def test_store_rates_replaces_previous(db_session):
+    service = ExchangeRateService(db_session)
+    service.store_rates("USD", USD_RATES, datetime(2026, 1, 1))
+    service.store_rates("USD", {"USD": Decimal("1"), "EUR": Decimal("0.9")}, datetime(2026, 1, 2))
+
+    rates, fetched_at = service.stored_rates("USD")
+
+    assert rates == {"USD": Decimal("1"), "EUR": Decimal("0.9")}
+    assert fetched_at == datetime(2026, 1, 2)
+    assert db_session.query(ExchangeRate).count() == 2
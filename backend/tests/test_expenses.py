@@ -1,6 +1,8 @@
 from datetime import date
 from decimal import Decimal
 
+import pytest
+
 from app.models.category import Category
 from app.models.expense import Expense
 from app.services.expense_service import ExpenseService, CategoryService
@@ -182,3 +184,168 @@ class TestExpenseService:
     def test_delete_nonexistent(self, db_session):
         service = ExpenseService(db_session)
         assert service.delete_expense(999) is False
+
+    def test_expense_summary_month_boundaries(self, db_session):
+        cat = _seed_category(db_session)
+        service = ExpenseService(db_session)
+        for day in (date(2026, 1, 31), date(2026, 2, 1), date(2026, 2, 28), date(2026, 3, 1)):
+            service.create_expense(
+                amount=Decimal("10"), description=str(day), date=day, category_id=cat.id
+            )
+
+        summary = service.get_expense_summary(month=2, year=2026)
+        assert summary["total_count"] == 2
+        assert summary["total_amount"] == Decimal("20")
+
+    def test_list_expenses_keyset_pagination(self, db_session):
+        cat = _seed_category(db_session)
+        service = ExpenseService(db_session)
+        for i in range(7):
+            service.create_expense(
+                amount=Decimal(str(i % 3)),
+                description=f"Expense {i}",
+                date=date(2026, 1, 1 + i // 2),
+                category_id=cat.id,
+            )
+
+        for sort_by in ("date", "amount"):
+            expected, _, _ = service.list_expenses(sort_by=sort_by, limit=100)
+            seen, after = [], None
+            while True:
+                items, total, has_more = service.list_expenses(
+                    sort_by=sort_by, limit=3, after=after
+                )
+                seen.extend(items)
+                if not has_more:
+                    break
+                after = service.cursor_for(items[-1], sort_by)
+            assert total == 7
+            assert [e.id for e in seen] == [e.id for e in expected]
+
+    def test_list_expenses_cursor_sort_mismatch(self, db_session):
+        cat = _seed_category(db_session)
+        service = ExpenseService(db_session)
+        expense = service.create_expense(
+            amount=Decimal("10"), description="A", date=date(2026, 1, 1), category_id=cat.id
+        )
+        cursor = service.cursor_for(expense, "date")
+        with pytest.raises(ValueError):
+            service.list_expenses(sort_by="amount", after=cursor)
+        with pytest.raises(ValueError):
+            service.list_expenses(after="not-a-cursor")
+
+    def test_list_expenses_without_total(self, db_session):
+        cat = _seed_category(db_session)
+        service = ExpenseService(db_session)
+        for i in range(3):
+            service.create_expense(
+                amount=Decimal("10"), description=f"E{i}", date=date(2026, 1, 1), category_id=cat.id
+            )
+
+        items, total, has_more = service.list_expenses(limit=2, include_total=False)
+        assert total is None
+        assert len(items) == 2
+        assert has_more is True
+
+    def test_count_cache_invalidated_on_write(self, db_session):
+        cat = _seed_category(db_session)
+        service = ExpenseService(db_session)
+        service.create_expense(
+            amount=Decimal("10"), description="A", date=date(2026, 1, 1), category_id=cat.id
+        )
+        assert service.count_expenses(category_id=cat.id) == 1
+        assert service.count_expenses(category_id=cat.id) == 1
+
+        expense = service.create_expense(
+            amount=Decimal("20"), description="B", date=date(2026, 1, 2), category_id=cat.id
+        )
+        assert service.count_expenses(category_id=cat.id) == 2
+
+        service.delete_expense(expense.id)
+        assert service.count_expenses(category_id=cat.id) == 1
+
+    def test_search_prefix_and_notes(self, db_session):
+        cat = _seed_category(db_session)
+        service = ExpenseService(db_session)
+        service.create_expense(
+            amount=Decimal("10"), description="Café Central", date=date(2026, 1, 1),
+            category_id=cat.id,
+        )
+        service.create_expense(
+            amount=Decimal("20"), description="Groceries", notes="weekly supermarket run",
+            date=date(2026, 1, 2), category_id=cat.id,
+        )
+
+        items, _, _ = service.list_expenses(search="cafe")
+        assert [e.description for e in items] == ["Café Central"]
+        items, _, _ = service.list_expenses(search="super")
+        assert [e.description for e in items] == ["Groceries"]
+
+    def test_search_index_follows_updates_and_deletes(self, db_session):
+        cat = _seed_category(db_session)
+        service = ExpenseService(db_session)
+        expense = service.create_expense(
+            amount=Decimal("10"), description="Taxi", date=date(2026, 1, 1), category_id=cat.id
+        )
+        service.update_expense(expense.id, description="Train ticket")
+        assert service.list_expenses(search="taxi")[1] == 0
+        assert service.list_expenses(search="train")[1] == 1
+
+        service.delete_expense(expense.id)
+        assert service.list_expenses(search="train")[1] == 0
+
+    def test_search_sorted_by_relevance(self, db_session):
+        cat = _seed_category(db_session)
+        service = ExpenseService(db_session)
+        service.create_expense(
+            amount=Decimal("10"), description="Pizza", notes="pizza night with more pizza",
+            date=date(2026, 1, 1), category_id=cat.id,
+        )
+        service.create_expense(
+            amount=Decimal("20"), description="Lunch", notes="salad, a slice of pizza and juice",
+            date=date(2026, 1, 2), category_id=cat.id,
+        )
+
+        items, total, _ = service.list_expenses(search="pizza", sort_by="relevance")
+        assert total == 2
+        assert items[0].description == "Pizza"
+
+    def test_expense_summary_paid_totals(self, db_session):
+        cat = _seed_category(db_session)
+        service = ExpenseService(db_session)
+        paid = service.create_expense(
+            amount=Decimal("30.10"), description="Rent", date=date(2026, 3, 1), category_id=cat.id
+        )
+        service.mark_expense_paid(paid.id, True)
+        service.create_expense(
+            amount=Decimal("12.20"), description="Gym", date=date(2026, 3, 5), category_id=cat.id
+        )
+
+        summary = service.get_expense_summary(month=3, year=2026)
+        assert summary["total_amount"] == Decimal("42.30")
+        assert summary["paid_amount"] == Decimal("30.10")
+        assert summary["unpaid_amount"] == Decimal("12.20")
+        assert (summary["paid_count"], summary["unpaid_count"]) == (1, 1)
+        assert "categories" not in summary
+
+    def test_expense_summary_date_range_by_category(self, db_session):
+        food = _seed_category(db_session, "Food")
+        transport = _seed_category(db_session, "Transport")
+        service = ExpenseService(db_session)
+        service.create_expense(
+            amount=Decimal("10"), description="A", date=date(2026, 1, 20), category_id=food.id
+        )
+        service.create_expense(
+            amount=Decimal("25"), description="B", date=date(2026, 2, 3), category_id=transport.id
+        )
+        service.create_expense(
+            amount=Decimal("99"), description="C", date=date(2026, 2, 10), category_id=food.id
+        )
+
+        summary = service.get_expense_summary(
+            start_date=date(2026, 1, 15), end_date=date(2026, 2, 3), include_categories=True
+        )
+        assert summary["total_amount"] == Decimal("35")
+        assert summary["total_count"] == 2
+        assert [c["category"].name for c in summary["categories"]] == ["Transport", "Food"]
+        assert summary["categories"][0]["total_amount"] == Decimal("25")
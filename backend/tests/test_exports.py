@@ -0,0 +1,168 @@
+import io
+import json
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import exports
+from app.main import app
+from app.models.category import Category
+from app.models.expense import Expense
+from app.models.income import Income
+from app.services.export_service import ExportService
+from app.services.import_service import ImportService, parse_csv
+
+
+def _expenses(db, count):
+    category = Category(name="Food")
+    db.add(category)
+    db.flush()
+    for i in range(count):
+        db.add(
+            Expense(
+                amount=Decimal(f"{i + 1}.50"), description=f"Meal {i}", date=date(2026, 1, i + 1),
+                category_id=category.id, is_paid=i % 2 == 0, notes="with, comma" if i == 0 else None,
+            )
+        )
+    db.commit()
+    return category
+
+
+class TestExportExpenses:
+    def test_csv_is_written_batch_by_batch(self, db_session):
+        _expenses(db_session, 5)
+
+        chunks = list(ExportService(db_session).export_expenses("csv", batch_size=2))
+
+        assert len(chunks) == 3
+        lines = "".join(chunks).splitlines()
+        assert lines[0] == (
+            "id,date,amount,description,category,notes,is_recurring,recurrence_rule,is_paid,paid_at"
+        )
+        assert lines[1] == '1,2026-01-01,1.50,Meal 0,Food,"with, comma",False,,True,'
+        assert len(lines) == 6
+
+    def test_filters_match_the_expense_list(self, db_session):
+        _expenses(db_session, 5)
+
+        chunks = ExportService(db_session).export_expenses(
+            "ndjson", min_amount=Decimal("2"), is_paid=True, end_date=date(2026, 1, 4)
+        )
+
+        rows = [json.loads(line) for line in "".join(chunks).splitlines()]
+        assert rows == [
+            {
+                "id": 3, "date": "2026-01-03", "amount": "3.50", "description": "Meal 2",
+                "category": "Food", "notes": None, "is_recurring": False,
+                "recurrence_rule": None, "is_paid": True, "paid_at": None,
+            }
+        ]
+
+    def test_csv_reimports_as_duplicates(self, db_session):
+        category = _expenses(db_session, 3)
+        exported = "".join(ExportService(db_session).export_expenses("csv"))
+        # Rows created by hand have no import fingerprint, so the first import adds them
+        first = list(ImportService(db_session).import_expenses(parse_csv(io.StringIO(exported))))
+        again = list(ImportService(db_session).import_expenses(parse_csv(io.StringIO(exported))))
+
+        assert first[-1]["inserted"] == 3
+        assert again[-1]["duplicates"] == 3
+        assert db_session.query(Expense).filter_by(category_id=category.id).count() == 6
+
+    def test_parquet_row_groups(self, db_session):
+        pq = pytest.importorskip("pyarrow.parquet")
+        _expenses(db_session, 5)
+
+        data = b"".join(ExportService(db_session).export_expenses("parquet", batch_size=2))
+
+        parquet = pq.ParquetFile(io.BytesIO(data))
+        assert parquet.metadata.num_row_groups == 3
+        table = parquet.read()
+        assert table.column("amount").to_pylist()[0] == Decimal("1.50")
+        assert table.column("date").to_pylist()[-1] == date(2026, 1, 5)
+
+
+def test_export_incomes_with_net_amount(db_session):
+    db_session.add_all(
+        [
+            Income(name="Job", amount=Decimal("1000"), income_type="salary", is_gross=True,
+                   tax_rate=Decimal("20"), other_fees=Decimal("50")),
+            Income(name="Old", amount=Decimal("10"), income_type="other", is_active=False),
+        ]
+    )
+    db_session.commit()
+
+    chunks = ExportService(db_session).export_incomes("ndjson", is_active=True)
+
+    rows = [json.loads(line) for line in "".join(chunks).splitlines()]
+    assert [(row["name"], row["net_amount"]) for row in rows] == [("Job", "750.00")]
+
+
+class TestExportRoutes:
+    def test_csv_is_the_default_download(self, api_session_factory):
+        with api_session_factory() as db:
+            _expenses(db, 3)
+
+        response = TestClient(app).get("/exports/expenses")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "text/csv; charset=utf-8"
+        assert response.headers["content-disposition"] == 'attachment; filename="expenses.csv"'
+        assert len(response.text.splitlines()) == 4
+
+    def test_ndjson_with_filters(self, api_session_factory):
+        with api_session_factory() as db:
+            _expenses(db, 5)
+
+        response = TestClient(app).get(
+            "/exports/expenses",
+            params={"format": "ndjson", "min_amount": "2", "is_paid": "true",
+                    "end_date": "2026-01-04"},
+        )
+
+        assert response.headers["content-type"] == "application/x-ndjson"
+        assert [json.loads(line)["id"] for line in response.text.splitlines()] == [3]
+
+    def test_upcoming_occurrences_are_left_out_by_default(self, api_session_factory):
+        with api_session_factory() as db:
+            category = _expenses(db, 1)
+            db.add(
+                Expense(amount=Decimal("9"), description="Upcoming", category_id=category.id,
+                        date=date.today() + timedelta(days=3), recurrence_parent_id=1)
+            )
+            db.commit()
+        client = TestClient(app)
+
+        default = client.get("/exports/expenses", params={"format": "ndjson"})
+        upcoming = client.get(
+            "/exports/expenses", params={"format": "ndjson", "include_upcoming": "true"}
+        )
+
+        assert [json.loads(line)["description"] for line in default.text.splitlines()] == [
+            "Meal 0"
+        ]
+        assert [json.loads(line)["description"] for line in upcoming.text.splitlines()] == [
+            "Meal 0", "Upcoming"
+        ]
+
+    def test_incomes_and_unavailable_parquet(self, api_session_factory, monkeypatch):
+        with api_session_factory() as db:
+            db.add_all([
+                Income(name="Job", amount=Decimal("100"), income_type="salary"),
+                Income(name="Old", amount=Decimal("10"), income_type="other", is_active=False),
+            ])
+            db.commit()
+        monkeypatch.setattr(exports, "parquet_available", lambda: False)
+        client = TestClient(app)
+
+        incomes = client.get("/exports/incomes", params={"format": "ndjson", "is_active": "false"})
+        parquet = client.get("/exports/expenses", params={"format": "parquet"})
+        unknown = client.get("/exports/expenses", params={"format": "xlsx"})
+
+        assert incomes.headers["content-disposition"] == 'attachment; filename="incomes.ndjson"'
+        assert [json.loads(line)["name"] for line in incomes.text.splitlines()] == ["Old"]
+        assert parquet.status_code == 400
+        assert parquet.json()["detail"] == "Parquet export needs pyarrow installed"
+        assert unknown.status_code == 422
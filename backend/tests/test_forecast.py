@@ -0,0 +1,104 @@
+from datetime import date
+from decimal import Decimal
+
+from app.models.category import Category
+from app.models.expense import Expense
+from app.models.income import Income
+from app.services.currency import CurrencyConverter
+from app.services.forecast_service import ForecastService
+
+
+def _rule(db, rule, start, amount, description=None):
+    if not db.query(Category).first():
+        db.add(Category(name="Bills"))
+        db.flush()
+    db.add(
+        Expense(
+            amount=Decimal(amount), description=description or rule, date=start,
+            category_id=db.query(Category).first().id, is_recurring=True, recurrence_rule=rule,
+        )
+    )
+    db.commit()
+
+
+def _income(db, amount, start=None, **kwargs):
+    db.add(Income(name="Job", amount=Decimal(amount), income_type="salary", is_gross=False,
+                  start_date=start, **kwargs))
+    db.commit()
+
+
+class TestCashFlowForecast:
+    def test_months_and_running_balance(self, db_session):
+        _income(db_session, "3000")
+        _rule(db_session, "monthly", date(2025, 5, 31), "1200")
+
+        forecast = ForecastService(db_session).cash_flow_forecast(3, start=date(2026, 1, 20))
+
+        assert [m["month"] for m in forecast] == ["2026-01", "2026-02", "2026-03"]
+        assert [m["outflow"] for m in forecast] == [Decimal("1200.00")] * 3
+        assert [m["net"] for m in forecast] == [Decimal("1800.00")] * 3
+        assert [m["balance"] for m in forecast] == [
+            Decimal("1800.00"), Decimal("3600.00"), Decimal("5400.00")
+        ]
+
+    def test_occurrences_are_counted_per_month(self, db_session):
+        _rule(db_session, "weekly", date(2025, 12, 29), "10")  # Mondays
+        _rule(db_session, "quarterly", date(2025, 11, 15), "100")
+        _rule(db_session, "daily", date(2026, 2, 27), "1")  # starts inside the window
+
+        forecast = ForecastService(db_session).cash_flow_forecast(3, start=date(2026, 1, 1))
+
+        # January: 4 Mondays; February: 4 Mondays, quarterly, 2 daily;
+        # March: 5 Mondays, 31 daily
+        assert [m["outflow"] for m in forecast] == [
+            Decimal("40.00"), Decimal("142.00"), Decimal("81.00")
+        ]
+
+    def test_incomes_count_from_their_start_month(self, db_session):
+        _income(db_session, "1000", start=date(2026, 2, 15))
+        _income(db_session, "500", currency="EUR", start=date(2020, 1, 1))
+        _income(db_session, "999", is_active=False)
+        converter = CurrencyConverter("USD", {"EUR": Decimal("0.5")})
+
+        forecast = ForecastService(db_session).cash_flow_forecast(
+            3, start=date(2026, 1, 1), converter=converter
+        )
+
+        assert [m["inflow"] for m in forecast] == [
+            Decimal("1000.00"), Decimal("2000.00"), Decimal("2000.00")
+        ]
+
+    def test_occurrence_rows_are_not_counted_twice(self, db_session):
+        _rule(db_session, "monthly", date(2026, 1, 10), "50")
+        series = db_session.query(Expense).one()
+        db_session.add(
+            Expense(amount=Decimal("50"), description="monthly", date=date(2026, 2, 10),
+                    category_id=series.category_id, recurrence_parent_id=series.id)
+        )
+        db_session.commit()
+
+        forecast = ForecastService(db_session).cash_flow_forecast(2, start=date(2026, 1, 1))
+
+        assert [m["outflow"] for m in forecast] == [Decimal("50.00"), Decimal("50.00")]
+
+    def test_hand_entered_series_count_once(self, db_session):
+        # Rent entered again each month, linked into one series by the
+        # migration, and a recurring expense without a rule
+        for month in (1, 2, 3):
+            _rule(db_session, "monthly", date(2026, month, 1), "1000", description="Rent")
+        *earlier, latest = db_session.query(Expense).order_by(Expense.date).all()
+        for entry in earlier:
+            entry.recurrence_parent_id = latest.id
+        _rule(db_session, None, date(2026, 3, 5), "70", description="Gym")
+
+        forecast = ForecastService(db_session).cash_flow_forecast(3, start=date(2026, 4, 1))
+
+        assert [m["outflow"] for m in forecast] == [Decimal("1000.00")] * 3
+
+    def test_same_named_bills_are_both_counted(self, db_session):
+        _rule(db_session, "monthly", date(2026, 1, 5), "80", description="Insurance")
+        _rule(db_session, "monthly", date(2026, 2, 20), "40", description="Insurance")
+
+        forecast = ForecastService(db_session).cash_flow_forecast(3, start=date(2026, 4, 1))
+
+        assert [m["outflow"] for m in forecast] == [Decimal("120.00")] * 3
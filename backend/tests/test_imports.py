@@ -0,0 +1,157 @@
+import io
+import json
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models.category import Category
+from app.models.expense import Expense
+from app.services.import_service import ImportService, parse_csv, parse_ofx
+from app.services.rollup_service import RollupService
+
+CSV = """Date,Amount,Description,Category,Notes
+2026-01-02,12.50,Lunch,food,
+2026-01-02,12.50,Lunch,Food,with Ana
+2026-01-03,-5,Refund,food,
+2026-01-04,30,Taxi,Transport,
+2026-02-30,8,Coffee,food,
+"""
+
+OFX = """OFXHEADER:100
+DATA:OFXSGML
+
+<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS><BANKTRANLIST>
+<STMTTRN><TRNTYPE>DEBIT<DTPOSTED>20260105120000[-5:EST]<TRNAMT>-42.10<FITID>T1
+<NAME>GROCER<MEMO>Card 1234</STMTTRN>
+<STMTTRN><TRNTYPE>CREDIT<DTPOSTED>20260106<TRNAMT>1500.00<FITID>T2<NAME>PAYROLL</STMTTRN>
+<STMTTRN><TRNTYPE>DEBIT<DTPOSTED>20260107<TRNAMT>-9.99<FITID>T3<NAME>STREAMING</STMTTRN>
+</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>
+"""
+
+
+def _category(db, name="Food"):
+    category = Category(name=name)
+    db.add(category)
+    db.commit()
+    return category
+
+
+def _import(db, records, **kwargs):
+    return list(ImportService(db).import_expenses(records, **kwargs))
+
+
+class TestParsers:
+    def test_csv_header_is_checked_up_front(self):
+        with pytest.raises(ValueError, match="missing columns: amount"):
+            parse_csv(io.StringIO("date,description\n"))
+
+    def test_ofx_debits_across_block_boundaries(self):
+        records = list(parse_ofx(io.StringIO(OFX), block_size=7))
+
+        assert records[0] == {
+            "record": 1, "date": "2026-01-05", "amount": "42.10", "description": "GROCER",
+            "notes": "Card 1234", "fitid": "T1",
+        }
+        assert records[1] == {"record": 2, "skip": "credit"}
+        assert records[2]["amount"] == "9.99"
+
+
+class TestImportExpenses:
+    def test_reports_progress_and_errors_per_chunk(self, db_session):
+        food = _category(db_session)
+
+        reports = _import(db_session, parse_csv(io.StringIO(CSV)), chunk_size=3)
+
+        assert [r["chunk"] for r in reports[:-1]] == [1, 2]
+        assert reports[0]["inserted"] == 2
+        assert reports[0]["errors"] == [{"record": 4, "error": "Amount must be positive"}]
+        assert reports[1]["errors"] == [
+            {"record": 5, "error": "Unknown category: 'Transport'"},
+            {"record": 6, "error": "Invalid date: '2026-02-30'"},
+        ]
+        assert reports[-1] == {
+            "done": True, "chunks": 2, "rows": 5, "inserted": 2, "duplicates": 0,
+            "skipped": 0, "errors": 3,
+        }
+        expenses = db_session.query(Expense).order_by(Expense.id).all()
+        assert [(e.category_id, e.notes, e.is_paid) for e in expenses] == [
+            (food.id, None, True), (food.id, "with Ana", True)
+        ]
+        assert RollupService(db_session).month_summary("2026-01")["total_amount"] == Decimal("25")
+
+    def test_reimport_skips_rows_already_imported(self, db_session):
+        _category(db_session)
+        _import(db_session, parse_csv(io.StringIO(CSV)))
+        extra = CSV + "2026-01-02,12.50,Lunch,food,\n"
+
+        summary = _import(db_session, parse_csv(io.StringIO(extra)))[-1]
+
+        # The third identical lunch is a new expense; the first two are known
+        assert (summary["inserted"], summary["duplicates"]) == (1, 2)
+        assert db_session.query(Expense).count() == 3
+
+    def test_ofx_uses_default_category_and_bank_ids(self, db_session):
+        other = _category(db_session, "Other")
+
+        first = _import(db_session, parse_ofx(io.StringIO(OFX)), default_category_id=other.id)
+        again = _import(db_session, parse_ofx(io.StringIO(OFX)), default_category_id=other.id)
+
+        assert first[-1]["inserted"] == 2
+        assert first[-1]["skipped"] == 1
+        assert again[-1]["duplicates"] == 2
+        grocer = db_session.query(Expense).filter_by(description="GROCER").one()
+        assert (grocer.date, grocer.amount, grocer.category_id) == (
+            date(2026, 1, 5), Decimal("42.10"), other.id
+        )
+
+
+class TestImportRoute:
+    @staticmethod
+    def _upload(name, content, **params):
+        response = TestClient(app).post(
+            "/imports/expenses", params=params, files={"file": (name, content.encode())}
+        )
+        return response, [json.loads(line) for line in response.text.splitlines()]
+
+    def test_csv_upload_streams_reports_and_skips_duplicates(self, api_session_factory):
+        with api_session_factory() as db:
+            _category(db)
+
+        response, reports = self._upload("bank.csv", CSV)
+        _, again = self._upload("bank.csv", CSV)
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        assert reports[-1]["inserted"] == 2
+        assert (again[-1]["inserted"], again[-1]["duplicates"]) == (0, 2)
+        with api_session_factory() as db:
+            assert db.query(Expense).count() == 2
+
+    def test_ofx_upload_uses_the_category_and_bank_ids(self, api_session_factory):
+        with api_session_factory() as db:
+            other_id = _category(db, "Other").id
+
+        _, reports = self._upload("statement.qfx", OFX, category_id=other_id)
+        # The format parameter wins over the file name
+        _, again = self._upload("statement.txt", OFX, category_id=other_id, format="ofx")
+
+        assert (reports[-1]["inserted"], reports[-1]["skipped"]) == (2, 1)
+        assert (again[-1]["inserted"], again[-1]["duplicates"]) == (0, 2)
+        with api_session_factory() as db:
+            assert {e.category_id for e in db.query(Expense)} == {other_id}
+
+    def test_unknown_format_and_category_are_rejected(self, api_session_factory):
+        response, _ = self._upload("bank.txt", CSV)
+        assert response.status_code == 400
+        assert "format" in response.json()["detail"]
+
+        response, _ = self._upload("bank.csv", CSV, category_id=99)
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Category 99 not found"
+
+        response, _ = self._upload("bank.csv", "date,description\n")
+        assert response.status_code == 400
+        assert "missing columns" in response.json()["detail"]
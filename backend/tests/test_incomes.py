@@ -0,0 +1,79 @@
+from decimal import Decimal
+
+from sqlalchemy import select
+
+from app.models.income import Income
+from app.services.currency import CurrencyConverter
+from app.services.income_service import IncomeService
+
+
+def _create_income(service, name="Salary", **kwargs):
+    data = {"amount": Decimal("1000"), "income_type": "salary"}
+    data.update(kwargs)
+    return service.create_income(name=name, **data)
+
+
+class TestIncomeService:
+    def test_list_incomes_keyset_pagination(self, db_session):
+        service = IncomeService(db_session)
+        for i in range(5):
+            _create_income(service, name=f"Income {i}")
+
+        expected, _, _ = service.list_incomes(limit=100)
+        items, total, has_more = service.list_incomes(limit=2)
+        seen = list(items)
+        while has_more:
+            items, total, has_more = service.list_incomes(
+                limit=2, after=service.cursor_for(items[-1])
+            )
+            seen.extend(items)
+        assert total == 5
+        assert [i.id for i in seen] == [i.id for i in expected]
+
+    def test_net_amount_expression_matches_python(self, db_session):
+        service = IncomeService(db_session)
+        _create_income(service, name="Net", is_gross=False, tax_rate=Decimal("20"))
+        _create_income(service, name="Taxed", tax_rate=Decimal("12.5"), other_fees=Decimal("30"))
+        _create_income(service, name="Whole", amount=Decimal("999"), tax_rate=Decimal("10"))
+        _create_income(service, name="Clamped", other_fees=Decimal("1500"))
+        _create_income(service, name="Plain")
+        _create_income(service, name="Half", amount=Decimal("10.05"), tax_rate=Decimal("10"))
+
+        incomes = db_session.query(Income).order_by(Income.id).all()
+        in_sql = db_session.execute(select(Income.net_amount).order_by(Income.id)).scalars()
+        for income, net in zip(incomes, in_sql):
+            assert net == income.net_amount, income.name
+        assert [str(i.net_amount) for i in incomes] == [
+            "1000.00", "845.00", "899.10", "0", "1000.00", "9.05"
+        ]
+
+    def test_active_income_breakdown(self, db_session):
+        service = IncomeService(db_session)
+        _create_income(service, name="Job", tax_rate=Decimal("10"))
+        _create_income(service, name="Side job", amount=Decimal("500"), is_gross=False)
+        _create_income(service, name="Rent", amount=Decimal("800"), income_type="rental",
+                       currency="EUR", is_gross=False)
+        _create_income(service, name="Old job", is_active=False)
+
+        groups = sorted(service.active_income_breakdown(), key=lambda g: g["income_type"])
+        assert groups == [
+            {"income_type": "rental", "currency": "EUR", "total_amount": Decimal("800.00"),
+             "stream_count": 1},
+            {"income_type": "salary", "currency": "USD", "total_amount": Decimal("1400.00"),
+             "stream_count": 2},
+        ]
+        converter = CurrencyConverter("USD", {"EUR": Decimal("0.8")})
+        assert service.get_total_monthly_income(converter) == Decimal("2400.00")
+        assert service.get_active_income_count() == 3
+
+    def test_breakdown_adds_up_the_rounded_amounts(self, db_session):
+        service = IncomeService(db_session)
+        for i in range(3):
+            # 9.045 each, shown as 9.05
+            _create_income(service, name=f"Part {i}", amount=Decimal("10.05"),
+                           tax_rate=Decimal("10"))
+
+        [group] = service.active_income_breakdown()
+
+        incomes = db_session.query(Income).all()
+        assert group["total_amount"] == sum(i.net_amount for i in incomes) == Decimal("27.15")
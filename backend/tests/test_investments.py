@@ -1,7 +1,9 @@
 from datetime import date
 from decimal import Decimal
 
+from app.models.asset_price import AssetPrice
 from app.models.portfolio import Portfolio
+from app.services.currency import CurrencyConverter
 from app.services.investment_service import InvestmentService
 
 
@@ -216,3 +218,233 @@ class TestComputedFields:
 
         assert totals["total_cost"] == Decimal("1250.00")  # 1000 + 250
         assert totals["total_value"] == Decimal("1450.00")  # 1200 + 250 (fallback)
+
+
+class TestSqlValuation:
+    def _seed(self, db):
+        portfolio = _create_portfolio(db)
+        other = _create_portfolio(db, "Other")
+        service = InvestmentService(db)
+        lots = [
+            (portfolio, "AAPL", "stock", "10", "100.00", "120.00"),
+            (portfolio, "XYZ", "other", "5", "50.00", None),
+            (other, "BTC", "crypto", "0.5", "40000.00", "50000.00"),
+            (other, "MSFT", "stock", "3", "300.00", "310.50"),
+        ]
+        for owner, symbol, asset_type, quantity, cost, price in lots:
+            service.create_asset(
+                portfolio_id=owner.id,
+                symbol=symbol,
+                name=symbol,
+                asset_type=asset_type,
+                quantity=Decimal(quantity),
+                purchase_price=Decimal(cost),
+                purchase_date=date(2025, 6, 1),
+                current_price=Decimal(price) if price else None,
+            )
+        return service, portfolio, other
+
+    def test_portfolio_valuations_match_python_totals(self, db_session):
+        service, portfolio, other = self._seed(db_session)
+        empty = _create_portfolio(db_session, "Empty")
+
+        valuations = service.portfolio_valuations([portfolio.id, other.id, empty.id])
+
+        for p in (portfolio, other, empty):
+            expected = service.compute_portfolio_totals(service.get_portfolio(p.id))
+            totals = {k: v for k, v in valuations[p.id].items() if k != "by_currency"}
+            assert totals == expected
+
+    def test_unpriced_portfolio_has_no_gain(self, db_session):
+        portfolio = _create_portfolio(db_session)
+        service = InvestmentService(db_session)
+        service.create_asset(
+            portfolio_id=portfolio.id, symbol="XYZ", name="XYZ", asset_type="other",
+            quantity=Decimal("5"), purchase_price=Decimal("50.00"), purchase_date=date(2025, 6, 1),
+        )
+        totals = service.portfolio_valuations([portfolio.id])[portfolio.id]
+        assert totals["total_value"] == Decimal("250")
+        assert totals["total_gain_loss"] == Decimal("0")
+        assert totals["total_gain_loss_percent"] == Decimal("0")
+
+    def test_valuation_by_type_and_currency(self, db_session):
+        service, _, _ = self._seed(db_session)
+        rows = {row["asset_type"]: row for row in service.valuation_by_type_and_currency()}
+        assert set(rows) == {"crypto", "stock", "other"}
+        stock = rows["stock"]
+        assert stock["currency"] == "USD"
+        assert stock["total_value"] == Decimal("2131.50")  # 1200 + 931.50
+        assert stock["total_cost"] == Decimal("1900.00")
+
+    def test_portfolio_valuations_convert_each_currency(self, db_session):
+        service, portfolio, _ = self._seed(db_session)
+        service.create_asset(
+            portfolio_id=portfolio.id, symbol="SAP", name="SAP", asset_type="stock",
+            quantity=Decimal("2"), purchase_price=Decimal("100.00"), purchase_date=date(2025, 6, 1),
+            current_price=Decimal("150.00"), currency="EUR",
+        )
+        converter = CurrencyConverter("USD", {"EUR": Decimal("0.5")})
+
+        totals = service.portfolio_valuations([portfolio.id], converter)[portfolio.id]
+
+        # 1200 + 250 in USD, plus EUR 300 / 0.5
+        assert totals["total_value"] == Decimal("2050")
+        assert totals["total_cost"] == Decimal("1650")  # 1000 + 250 + EUR 200 / 0.5
+        assert totals["by_currency"] == [
+            {"currency": "USD", "amount": Decimal("1450"), "converted_amount": Decimal("1450")},
+            {"currency": "EUR", "amount": Decimal("300"), "converted_amount": Decimal("600.00")},
+        ]
+
+
+class TestPriceUpdates:
+    def _add_lot(self, service, portfolio, symbol, price="100.00"):
+        return service.create_asset(
+            portfolio_id=portfolio.id, symbol=symbol, name=symbol, asset_type="stock",
+            quantity=Decimal("1"), purchase_price=Decimal("90.00"),
+            purchase_date=date(2025, 6, 1), current_price=Decimal(price),
+        )
+
+    def _history(self, db, symbol):
+        rows = db.query(AssetPrice).filter(AssetPrice.symbol == symbol).order_by(AssetPrice.date)
+        return [(p.date, p.price) for p in rows]
+
+    def test_update_asset_price_records_history(self, db_session):
+        service = InvestmentService(db_session)
+        asset = self._add_lot(service, _create_portfolio(db_session), "AAPL")
+
+        service.update_asset_price(asset.id, Decimal("120.00"), date(2025, 7, 1))
+        service.update_asset_price(asset.id, Decimal("125.00"), date(2025, 7, 1))
+        updated = service.update_asset_price(asset.id, Decimal("130.00"), date(2025, 7, 2))
+
+        assert updated.current_price == Decimal("130.00")
+        assert self._history(db_session, "AAPL") == [
+            (date(2025, 7, 1), Decimal("125.00")),
+            (date(2025, 7, 2), Decimal("130.00")),
+        ]
+        assert service.update_asset_price(9999, Decimal("1.00")) is None
+
+    def test_bulk_update_reprices_every_lot_of_a_symbol(self, db_session):
+        service = InvestmentService(db_session)
+        portfolio = _create_portfolio(db_session)
+        other = _create_portfolio(db_session, "Other")
+        lots = [
+            self._add_lot(service, portfolio, "AAPL"),
+            self._add_lot(service, other, "AAPL"),
+            self._add_lot(service, portfolio, "MSFT"),
+            self._add_lot(service, portfolio, "BTC"),
+        ]
+
+        result = service.bulk_update_prices([
+            {"symbol": "AAPL", "price": Decimal("110.00"), "as_of": date(2025, 7, 1)},
+            {"symbol": "AAPL", "price": Decimal("115.00"), "as_of": date(2025, 7, 2)},
+            {"symbol": "MSFT", "price": Decimal("320.00"), "as_of": date(2025, 7, 2)},
+            {"symbol": "NONE", "price": Decimal("1.00"), "as_of": date(2025, 7, 2)},
+        ])
+
+        assert result == {"recorded_prices": 4, "updated_assets": 3}
+        prices = [service.get_asset(lot.id).current_price for lot in lots]
+        assert prices == [Decimal("115.00"), Decimal("115.00"), Decimal("320.00"), Decimal("100.00")]
+        assert self._history(db_session, "AAPL") == [
+            (date(2025, 7, 1), Decimal("110.00")),
+            (date(2025, 7, 2), Decimal("115.00")),
+        ]
+
+    def test_backfill_does_not_overwrite_newer_price(self, db_session):
+        service = InvestmentService(db_session)
+        lot = self._add_lot(service, _create_portfolio(db_session), "AAPL")
+        service.bulk_update_prices(
+            [{"symbol": "AAPL", "price": Decimal("150.00"), "as_of": date(2025, 7, 10)}]
+        )
+
+        result = service.bulk_update_prices(
+            [{"symbol": "AAPL", "price": Decimal("140.00"), "as_of": date(2025, 7, 1)}]
+        )
+
+        assert result == {"recorded_prices": 1, "updated_assets": 0}
+        assert service.get_asset(lot.id).current_price == Decimal("150.00")
+        assert len(self._history(db_session, "AAPL")) == 2
+
+
+class TestValueSeries:
+    def _seed(self, db):
+        portfolio = _create_portfolio(db)
+        service = InvestmentService(db)
+        for symbol, quantity, cost, bought in [
+            ("AAPL", "10", "100.00", date(2025, 1, 1)),
+            ("AAPL", "5", "110.00", date(2025, 1, 3)),
+            ("XYZ", "2", "50.00", date(2025, 1, 2)),
+        ]:
+            service.create_asset(
+                portfolio_id=portfolio.id, symbol=symbol, name=symbol, asset_type="stock",
+                quantity=Decimal(quantity), purchase_price=Decimal(cost), purchase_date=bought,
+            )
+        service.bulk_update_prices([
+            {"symbol": "AAPL", "price": Decimal("105.00"), "as_of": date(2024, 12, 31)},
+            {"symbol": "AAPL", "price": Decimal("120.00"), "as_of": date(2025, 1, 3)},
+            {"symbol": "AAPL", "price": Decimal("130.00"), "as_of": date(2025, 1, 10)},
+        ])
+        return service, portfolio
+
+    def test_daily_series_uses_prices_as_of_each_day(self, db_session):
+        service, portfolio = self._seed(db_session)
+
+        series = service.portfolio_value_series(
+            portfolio.id, date(2025, 1, 1), date(2025, 1, 4), "day"
+        )
+
+        assert [(p["date"], p["total_value"], p["total_cost"]) for p in series] == [
+            (date(2025, 1, 1), Decimal("1050.00"), Decimal("1000.00")),
+            # XYZ has no price history and counts at cost
+            (date(2025, 1, 2), Decimal("1150.00"), Decimal("1100.00")),
+            (date(2025, 1, 3), Decimal("1900.00"), Decimal("1650.00")),
+            (date(2025, 1, 4), Decimal("1900.00"), Decimal("1650.00")),
+        ]
+
+    def test_series_starting_after_last_price(self, db_session):
+        service, portfolio = self._seed(db_session)
+
+        series = service.portfolio_value_series(
+            portfolio.id, date(2025, 2, 1), date(2025, 3, 15), "month"
+        )
+
+        assert [(p["date"], p["total_value"]) for p in series] == [
+            (date(2025, 2, 28), Decimal("2050.00")),
+            (date(2025, 3, 15), Decimal("2050.00")),
+        ]
+
+    def test_series_before_first_purchase_is_empty(self, db_session):
+        service, portfolio = self._seed(db_session)
+
+        series = service.portfolio_value_series(
+            portfolio.id, date(2024, 12, 1), date(2024, 12, 31), "week"
+        )
+
+        assert all(p["total_value"] == 0 and p["total_cost"] == 0 for p in series)
+        assert series[-1]["date"] == date(2024, 12, 31)
+
+    def test_currencies_are_converted_per_period(self, db_session):
+        service, portfolio = self._seed(db_session)
+        for symbol, currency in (("SAP", "EUR"), ("VOLV", "SEK")):
+            service.create_asset(
+                portfolio_id=portfolio.id, symbol=symbol, name=symbol, asset_type="stock",
+                quantity=Decimal("4"), purchase_price=Decimal("100.00"),
+                purchase_date=date(2025, 1, 2), currency=currency,
+            )
+        service.bulk_update_prices(
+            [{"symbol": "SAP", "price": Decimal("110.00"), "as_of": date(2025, 1, 2)}]
+        )
+        converter = CurrencyConverter("USD", {"EUR": Decimal("0.8")})
+
+        series = service.portfolio_value_series(
+            portfolio.id, date(2025, 1, 1), date(2025, 1, 2), "day", converter=converter
+        )
+
+        # EUR 440 / 0.8 on top of the USD lots; SEK has no rate and is left out
+        assert [(p["total_value"], p["total_cost"]) for p in series] == [
+            (Decimal("1050.00"), Decimal("1000.00")),
+            (Decimal("1700.00"), Decimal("1600.00")),
+        ]
+
+    def test_missing_portfolio(self, db_session):
+        service = InvestmentService(db_session)
+        assert service.portfolio_value_series(999, date(2025, 1, 1), date(2025, 1, 2)) is None
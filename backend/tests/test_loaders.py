@@ -0,0 +1,136 @@
+import asyncio
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.graphql.loaders import Loaders
+from app.models import Asset, Base, Category, Expense, Portfolio
+
+
+@pytest.fixture
+def async_engine(tmp_path):
+    db_path = tmp_path / "loaders.db"
+    sync_engine = create_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(bind=sync_engine)
+    with sessionmaker(bind=sync_engine)() as db:
+        food, travel, empty = Category(name="Food"), Category(name="Travel"), Category(name="Empty")
+        db.add_all([food, travel, empty])
+        db.flush()
+        for i, category in enumerate([food, food, travel]):
+            db.add(Expense(amount=Decimal("10"), description=f"E{i}", date=date(2026, 1, i + 1),
+                           category_id=category.id))
+        for name in ("A", "B"):
+            portfolio = Portfolio(name=name)
+            db.add(portfolio)
+            db.flush()
+            db.add(Asset(portfolio_id=portfolio.id, symbol=f"{name}1", name=name, asset_type="stock",
+                         quantity=Decimal("2"), purchase_price=Decimal("10"),
+                         purchase_date=date(2025, 1, 1), current_price=Decimal("15")))
+        db.commit()
+    sync_engine.dispose()
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    yield engine
+    asyncio.run(engine.dispose())
+
+
+def _run_counting(engine, scenario):
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    async def run():
+        async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+            event.listen(engine.sync_engine, "before_cursor_execute", count)
+            try:
+                return await scenario(Loaders(db))
+            finally:
+                event.remove(engine.sync_engine, "before_cursor_execute", count)
+
+    return asyncio.run(run()), statements
+
+
+def test_category_loads_are_batched(async_engine):
+    async def scenario(loaders):
+        return await asyncio.gather(*(loaders.category_by_id.load(i) for i in (1, 2, 1, 99)))
+
+    categories, statements = _run_counting(async_engine, scenario)
+    assert [c.name if c else None for c in categories] == ["Food", "Travel", "Food", None]
+    assert len(statements) == 1
+    assert " IN " in statements[0]
+
+
+def test_expenses_by_category_are_grouped(async_engine):
+    async def scenario(loaders):
+        return await loaders.expenses_by_category_id.load_many(
+            [(1, 20, None), (2, 20, None), (3, 20, None)]
+        )
+
+    grouped, statements = _run_counting(async_engine, scenario)
+    assert [[e.description for e in expenses] for expenses in grouped] == [["E1", "E0"], ["E2"], []]
+    assert len(statements) == 1
+
+
+def test_category_expenses_are_limited_per_category(async_engine):
+    async def scenario(loaders):
+        return await loaders.expenses_by_category_id.load_many([(1, 1, None), (2, 1, None)])
+
+    grouped, statements = _run_counting(async_engine, scenario)
+    assert [[e.description for e in expenses] for expenses in grouped] == [["E1"], ["E2"]]
+    assert len(statements) == 1
+    assert "row_number()" in statements[0]
+
+
+def test_category_expenses_leave_out_upcoming_occurrences(async_engine):
+    today = date.today()
+
+    async def scenario(loaders):
+        loaders.db.add(
+            Expense(amount=Decimal("10"), description="Upcoming", date=today + timedelta(days=3),
+                    category_id=1, recurrence_parent_id=1)
+        )
+        await loaders.db.flush()
+        return await loaders.expenses_by_category_id.load_many([(1, 20, today), (1, 20, None)])
+
+    grouped, _ = _run_counting(async_engine, scenario)
+    assert [[e.description for e in expenses] for expenses in grouped] == [
+        ["E1", "E0"], ["Upcoming", "E1", "E0"]
+    ]
+
+
+def test_portfolio_assets_are_batched(async_engine):
+    async def scenario(loaders):
+        return await loaders.assets_by_portfolio_id.load_many([1, 2])
+
+    assets, statements = _run_counting(async_engine, scenario)
+    assert [[a.symbol for a in group] for group in assets] == [["A1"], ["B1"]]
+    assert len(statements) == 1
+
+
+def test_portfolio_totals_do_not_load_assets(async_engine):
+    async def scenario(loaders):
+        return await loaders.portfolio_totals_by_id.load_many([1, 2])
+
+    totals, statements = _run_counting(async_engine, scenario)
+    assert [t["total_value"] for t in totals] == [Decimal("30"), Decimal("30")]
+    # Besides reading the main currency and rates, one aggregate over assets
+    asset_reads = [s for s in statements if "FROM assets" in s]
+    assert len(asset_reads) == 1
+    assert "sum(" in asset_reads[0].lower()
+
+
+def test_converter_is_loaded_once_per_request(async_engine):
+    async def scenario(loaders):
+        return await asyncio.gather(loaders.converter(), loaders.converter())
+
+    (first, second), statements = _run_counting(async_engine, scenario)
+    assert first is second
+    assert first.target == "USD"
+    assert first.rates["EUR"] > 0
+    rate_reads = [s for s in statements if s.startswith("SELECT") and "FROM exchange_rates" in s]
+    assert len(rate_reads) == 1
@@ -0,0 +1,39 @@
+from datetime import date
+
+import pytest
+
+from app.services.periods import month_bounds, period_ends, shift_month
+
+
+class TestPeriods:
+    def test_month_bounds(self):
+        assert month_bounds(2026, 2) == (date(2026, 2, 1), date(2026, 3, 1))
+
+    def test_month_bounds_december(self):
+        assert month_bounds(2025, 12) == (date(2025, 12, 1), date(2026, 1, 1))
+
+    def test_shift_month_across_years(self):
+        assert shift_month(2026, 1, -1) == (2025, 12)
+        assert shift_month(2025, 11, 3) == (2026, 2)
+        assert shift_month(2026, 3, -15) == (2024, 12)
+
+
+    def test_period_ends_daily(self):
+        assert period_ends(date(2026, 1, 30), date(2026, 2, 1), "day") == [
+            date(2026, 1, 30), date(2026, 1, 31), date(2026, 2, 1),
+        ]
+
+    def test_period_ends_weekly_closes_on_sunday(self):
+        # 2026-01-01 is a Thursday
+        assert period_ends(date(2026, 1, 1), date(2026, 1, 14), "week") == [
+            date(2026, 1, 4), date(2026, 1, 11), date(2026, 1, 14),
+        ]
+
+    def test_period_ends_monthly(self):
+        assert period_ends(date(2025, 12, 15), date(2026, 2, 10), "month") == [
+            date(2025, 12, 31), date(2026, 1, 31), date(2026, 2, 10),
+        ]
+
+    def test_period_ends_unknown_interval(self):
+        with pytest.raises(ValueError):
+            period_ends(date(2026, 1, 1), date(2026, 2, 1), "year")
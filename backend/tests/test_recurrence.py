@@ -0,0 +1,235 @@
+import asyncio
+import importlib.util
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+from sqlalchemy import create_engine, func, select, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.config import settings
+from app.models import Base
+from app.models.category import Category
+from app.models.expense import Expense
+from app.models.rollup import MonthlyCategoryRollup
+from app.services.dashboard_service import DashboardService
+from app.services.expense_service import ExpenseService
+from app.services.recurrence_service import RecurrenceService, occurrence_dates, run_scheduler
+from app.services.rollup_service import RollupService
+
+
+def _series(db, rule="monthly", start=date(2026, 1, 31), amount="100.00"):
+    category = Category(name="Bills")
+    db.add(category)
+    db.flush()
+    series = ExpenseService(db).create_expense(
+        amount=Decimal(amount), description="Rent", date=start, category_id=category.id,
+        is_recurring=True, recurrence_rule=rule,
+    )
+    # As if the series had been created on its first date
+    series.materialized_until = start
+    db.commit()
+    return series
+
+
+def _occurrences(db, series):
+    rows = db.query(Expense).filter(Expense.recurrence_parent_id == series.id)
+    return [e.date for e in rows.order_by(Expense.date)]
+
+
+class TestOccurrenceDates:
+    def test_monthly_keeps_day_clamped_to_month_end(self):
+        dates = occurrence_dates(date(2026, 1, 31), "monthly", date(2026, 1, 31), date(2026, 5, 31))
+        assert dates == [date(2026, 2, 28), date(2026, 3, 31), date(2026, 4, 30), date(2026, 5, 31)]
+
+    def test_window_excludes_after_and_includes_until(self):
+        start = date(2026, 1, 1)
+        assert occurrence_dates(start, "weekly", date(2026, 1, 8), date(2026, 1, 22)) == [
+            date(2026, 1, 15), date(2026, 1, 22)
+        ]
+        assert occurrence_dates(start, "quarterly", date(2026, 4, 1), date(2027, 1, 1)) == [
+            date(2026, 7, 1), date(2026, 10, 1), date(2027, 1, 1)
+        ]
+        assert occurrence_dates(start, "yearly", start, date(2026, 12, 31)) == []
+
+
+class TestMaterialize:
+    def test_generates_unpaid_occurrences_and_updates_rollup(self, db_session):
+        series = _series(db_session)
+
+        created = RecurrenceService(db_session).materialize(date(2026, 4, 30))
+
+        assert created == 3
+        assert _occurrences(db_session, series) == [
+            date(2026, 2, 28), date(2026, 3, 31), date(2026, 4, 30)
+        ]
+        assert series.materialized_until == date(2026, 4, 30)
+        summary = RollupService(db_session).month_summary("2026-03")
+        assert summary["total_amount"] == Decimal("100")
+        assert summary["unpaid_count"] == 1
+
+    def test_runs_are_incremental_and_idempotent(self, db_session):
+        series = _series(db_session, rule="weekly", start=date(2026, 1, 1))
+        service = RecurrenceService(db_session)
+
+        assert service.materialize(date(2026, 1, 15)) == 2
+        assert service.materialize(date(2026, 1, 15)) == 0
+        assert service.materialize(date(2026, 1, 29)) == 2
+        # A lost watermark does not duplicate occurrences
+        series.materialized_until = None
+        db_session.commit()
+        assert service.materialize(date(2026, 1, 29)) == 0
+
+        assert len(_occurrences(db_session, series)) == 4
+        assert RollupService(db_session).month_summary("2026-01")["total_count"] == 5
+
+    def test_editing_series_regenerates_future_occurrences(self, db_session):
+        today = date.today()
+        series = _series(db_session, rule="daily", start=today - timedelta(days=2))
+        service = RecurrenceService(db_session)
+        service.materialize(today + timedelta(days=3))
+
+        ExpenseService(db_session).update_expense(series.id, amount=Decimal("80.00"))
+        service.materialize(today + timedelta(days=3))
+
+        amounts = {
+            e.date: e.amount
+            for e in db_session.query(Expense).filter(Expense.recurrence_parent_id == series.id)
+        }
+        assert len(amounts) == 5
+        assert amounts[today] == Decimal("100.00")
+        assert amounts[today + timedelta(days=1)] == Decimal("80.00")
+
+    def test_deleting_series_keeps_past_occurrences(self, db_session):
+        today = date.today()
+        series = _series(db_session, rule="daily", start=today - timedelta(days=2))
+        RecurrenceService(db_session).materialize(today + timedelta(days=3))
+
+        ExpenseService(db_session).delete_expense(series.id)
+
+        remaining = db_session.query(Expense).order_by(Expense.date).all()
+        assert [e.date for e in remaining] == [today - timedelta(days=1), today]
+        assert all(e.recurrence_parent_id is None for e in remaining)
+        rollup_count = db_session.execute(select(func.sum(MonthlyCategoryRollup.count))).scalar()
+        assert rollup_count == 2
+
+    def test_new_series_starts_from_today(self, db_session):
+        category = Category(name="Bills")
+        db_session.add(category)
+        db_session.flush()
+        series = ExpenseService(db_session).create_expense(
+            amount=Decimal("100.00"), description="Rent", date=date(2025, 1, 1),
+            category_id=category.id, is_recurring=True, recurrence_rule="monthly",
+        )
+        today = date.today()
+
+        RecurrenceService(db_session).materialize(today + timedelta(days=62))
+
+        # Only the periods after today; none of 2025's
+        assert _occurrences(db_session, series) == occurrence_dates(
+            series.date, "monthly", today, today + timedelta(days=62)
+        )
+
+    def test_same_named_bills_are_separate_series(self, db_session):
+        category = Category(name="Bills")
+        db_session.add(category)
+        db_session.flush()
+        year = date.today().year + 1
+        bills = [
+            ExpenseService(db_session).create_expense(
+                amount=Decimal(amount), description="Insurance", date=date(year, 1, day),
+                category_id=category.id, is_recurring=True, recurrence_rule="monthly",
+            )
+            for amount, day in (("80.00", 5), ("40.00", 20))
+        ]
+
+        RecurrenceService(db_session).materialize(date(year, 3, 31))
+
+        assert [_occurrences(db_session, bill) for bill in bills] == [
+            [date(year, 2, 5), date(year, 3, 5)], [date(year, 2, 20), date(year, 3, 20)]
+        ]
+        summary = RollupService(db_session).month_summary(f"{year}-03")
+        assert summary["total_amount"] == Decimal("120")
+
+    def test_upcoming_occurrences_are_not_listed_by_default(self, db_session):
+        today = date.today()
+        series = _series(db_session, rule="daily", start=today - timedelta(days=1))
+        RecurrenceService(db_session).materialize(today + timedelta(days=3))
+        service = ExpenseService(db_session)
+
+        items, total, _ = service.list_expenses(occurrences_until=today)
+        assert (total, [e.date for e in items]) == (2, [today, series.date])
+        assert service.list_expenses()[1] == 5
+
+        recent = DashboardService(db_session).get_summary()["recent_expenses"]
+        assert [e.date for e in recent] == [today, series.date]
+
+    def test_migration_links_hand_entered_entries(self, db_session):
+        category = Category(name="Bills")
+        db_session.add(category)
+        db_session.flush()
+
+        def entry(description, day, amount="10.00"):
+            expense = Expense(
+                amount=Decimal(amount), description=description, date=day,
+                category_id=category.id, is_recurring=True, recurrence_rule="monthly",
+            )
+            db_session.add(expense)
+            return expense
+
+        # Rent entered again each month; two insurance bills on different
+        # days; two gym bills entered on the same date
+        rent = [entry("Rent", date(2026, month, 1)) for month in (1, 2, 3)]
+        insurance = [entry("Insurance", date(2026, 1, 5)), entry("Insurance", date(2026, 2, 20))]
+        gym = [entry("Gym", date(2026, 1, 10)), entry("Gym", date(2026, 1, 10)),
+               entry("Gym", date(2026, 2, 10))]
+        db_session.commit()
+
+        db_session.execute(text(_recurrence_migration().LINK_HAND_ENTERED_SERIES))
+        db_session.commit()
+        for expense in rent + insurance + gym:
+            db_session.refresh(expense)
+
+        assert [e.recurrence_parent_id for e in rent] == [rent[2].id, rent[2].id, None]
+        assert [e.recurrence_parent_id for e in insurance + gym] == [None] * 5
+
+
+def _recurrence_migration():
+    versions = Path(__file__).parents[1] / "alembic" / "versions"
+    path = versions / "f3a9c1d27e85_add_expense_recurrence_fields.py"
+    spec = importlib.util.spec_from_file_location("f3a9c1d27e85", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_scheduler_materializes_until_cancelled(tmp_path):
+    db_path = tmp_path / "recurrence.db"
+    sync_engine = create_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(bind=sync_engine)
+    with sessionmaker(bind=sync_engine)() as db:
+        series = _series(db, rule="daily", start=date.today())
+        series_id = series.id
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+
+    def occurrence_count():
+        with sessionmaker(bind=sync_engine)() as db:
+            return db.query(Expense).filter(Expense.recurrence_parent_id == series_id).count()
+
+    async def scenario():
+        task = asyncio.create_task(
+            run_scheduler(async_sessionmaker(engine, expire_on_commit=False), interval=3600)
+        )
+        for _ in range(100):
+            await asyncio.sleep(0.05)
+            if occurrence_count():
+                break
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        await engine.dispose()
+        return task.cancelled()
+
+    assert asyncio.run(scenario())
+    assert occurrence_count() == settings.recurrence_horizon_days
+    sync_engine.dispose()
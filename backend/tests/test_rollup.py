@@ -0,0 +1,88 @@
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import select
+
+from app.models.category import Category
+from app.models.expense import Expense
+from app.models.rollup import MonthlyCategoryRollup
+from app.services.expense_service import ExpenseService
+from app.services.rollup_service import RollupService
+
+
+def _seed_categories(db):
+    food = Category(name="Food")
+    transport = Category(name="Transport")
+    db.add_all([food, transport])
+    db.commit()
+    return food, transport
+
+
+def _rollup(db) -> dict:
+    rows = db.execute(select(MonthlyCategoryRollup)).scalars()
+    return {
+        (r.year_month, r.category_id): (r.total, r.count, r.paid_total, r.paid_count)
+        for r in rows
+    }
+
+
+class TestRollupMaintenance:
+    def test_create_adds_to_month_and_category(self, db_session):
+        food, _ = _seed_categories(db_session)
+        service = ExpenseService(db_session)
+        service.create_expense(
+            amount=Decimal("10.10"), description="A", date=date(2026, 1, 5), category_id=food.id
+        )
+        service.create_expense(
+            amount=Decimal("5.20"), description="B", date=date(2026, 1, 9), category_id=food.id
+        )
+        assert _rollup(db_session) == {("2026-01", food.id): (Decimal("15.30"), 2, 0, 0)}
+
+    def test_update_moves_between_months_and_categories(self, db_session):
+        food, transport = _seed_categories(db_session)
+        service = ExpenseService(db_session)
+        expense = service.create_expense(
+            amount=Decimal("10"), description="A", date=date(2026, 1, 5), category_id=food.id
+        )
+        service.update_expense(
+            expense.id, date=date(2026, 2, 1), category_id=transport.id, amount=Decimal("12")
+        )
+        assert _rollup(db_session) == {("2026-02", transport.id): (Decimal("12"), 1, 0, 0)}
+
+    def test_mark_paid_and_delete(self, db_session):
+        food, _ = _seed_categories(db_session)
+        service = ExpenseService(db_session)
+        expense = service.create_expense(
+            amount=Decimal("10"), description="A", date=date(2026, 1, 5), category_id=food.id
+        )
+        service.mark_expense_paid(expense.id, True)
+        assert _rollup(db_session) == {("2026-01", food.id): (Decimal("10"), 1, Decimal("10"), 1)}
+
+        service.delete_expense(expense.id)
+        assert _rollup(db_session) == {}
+
+    def test_relationship_assignment_and_rollback(self, db_session):
+        food, _ = _seed_categories(db_session)
+        db_session.add(Expense(amount=Decimal("7"), description="A", date=date(2026, 3, 1), category=food))
+        db_session.commit()
+        db_session.add(Expense(amount=Decimal("9"), description="B", date=date(2026, 3, 2), category=food))
+        db_session.flush()
+        db_session.rollback()
+        assert _rollup(db_session) == {("2026-03", food.id): (Decimal("7"), 1, 0, 0)}
+
+    def test_rebuild_matches_incremental(self, db_session):
+        food, transport = _seed_categories(db_session)
+        service = ExpenseService(db_session)
+        for i in range(6):
+            expense = service.create_expense(
+                amount=Decimal("3.33"),
+                description=str(i),
+                date=date(2026, 1 + i % 3, 10),
+                category_id=(food if i % 2 else transport).id,
+            )
+            if i % 3 == 0:
+                service.mark_expense_paid(expense.id, True)
+        incremental = _rollup(db_session)
+
+        assert RollupService(db_session).rebuild() == len(incremental)
+        assert _rollup(db_session) == incremental